@@ -151,9 +151,33 @@ class RunProcessorCommand(Command):
                             help='Alternative output directory.')
         parser.add_argument('-a', '--all-configs', dest='all_configs', action='store_true',
                             help='Run all DDP configurations in workspace. Cannot be used with option -c')
+        parser.add_argument('-p', '--profile', action='store_true',
+                            help='Record the time used by each processing stage, '
+                                 'and write it to a JSON file next to the L1B output.')
+        parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+                            help='Process N pairs of L1A file and DDP configuration in parallel, '
+                                 'each in its own process. Use 0 for the number of CPUs. Defaults to 1.')
+        parser.add_argument('--profile-memory', dest='profile_memory', action='store_true',
+                            help='Like option -p, but also record the memory allocated by each processing stage. '
+                                 'This slows down the processing considerably.')
+        parser.add_argument('--segment-jobs', dest='segment_jobs', type=int, default=1, metavar='N',
+                            help='Split each L1A file into segments, and process them in N processes. '
+                                 'Use 0 for the number of CPUs. Defaults to 1.')
+        parser.add_argument('--storage', choices=['none', 'fast', 'compact'], metavar='PROFILE',
+                            help='Compression of the output files: "none", "fast" or "compact". '
+                                 'Defaults to the l1b_storage_cnf and l1bs_storage_cnf parameters of the CNF.')
+        parser.add_argument('--async-output', dest='async_output', action='store_true',
+                            help='Write the output files on background threads, while the processing goes on.')
+        parser.add_argument('--checkpoint-interval', dest='checkpoint_interval', type=int, default=0, metavar='N',
+                            help='Write a checkpoint next to the L1B output every N L1B records, '
+                                 'from which an interrupted run can be resumed. Defaults to 0 (no checkpoints).')
+        parser.add_argument('--resume', action='store_true',
+                            help='Resume the interrupted runs from their checkpoints, appending to their outputs. '
+                                 'The L1A files without a checkpoint are processed from the start.')
 
     def execute(self, command_args):
         from dedop.model.exception import ProcessorException
+        from dedop.proc.fft import get_job_fft_threads
 
         try:
             if command_args.all_configs and command_args.config_name:
@@ -179,6 +203,14 @@ class RunProcessorCommand(Command):
                     'workspace "%s" doesn\'t have any inputs yet, use "dedop input add *.nc" to add some'
                     % workspace_name)
 
+            if command_args.jobs < 0:
+                raise CommandError('the number of jobs must not be negative')
+            if command_args.segment_jobs < 0:
+                raise CommandError('the number of segment jobs must not be negative')
+            if command_args.checkpoint_interval < 0:
+                raise CommandError('the checkpoint interval must not be negative')
+
+            processor_kwargs_list = []
             for config_name in config_names:
                 chd_file = _WORKSPACE_MANAGER.get_config_file(workspace_name, config_name, 'CHD')
                 cnf_file = _WORKSPACE_MANAGER.get_config_file(workspace_name, config_name, 'CNF')
@@ -186,17 +218,46 @@ class RunProcessorCommand(Command):
                 output_dir = command_args.output_dir if command_args.output_dir else \
                     _WORKSPACE_MANAGER.get_outputs_path(workspace_name, config_name)
                 skip_l1bs = command_args.skip_l1bs
+                processor_kwargs = dict(chd_file=chd_file,
+                                        cnf_file=cnf_file,
+                                        cst_file=cst_file,
+                                        output_dir=output_dir,
+                                        skip_l1bs=skip_l1bs)
+                # only passed if wanted, so that other processor factories need not support it
+                if command_args.profile:
+                    processor_kwargs['profile'] = True
+                if command_args.profile_memory:
+                    processor_kwargs['profile_memory'] = True
+                if command_args.segment_jobs != 1:
+                    processor_kwargs['segment_jobs'] = command_args.segment_jobs or os.cpu_count()
+                if command_args.storage:
+                    processor_kwargs['storage'] = command_args.storage
+                if command_args.async_output:
+                    processor_kwargs['async_output'] = True
+                if command_args.checkpoint_interval:
+                    processor_kwargs['checkpoint_interval'] = command_args.checkpoint_interval
+                if command_args.resume:
+                    processor_kwargs['resume'] = True
+                if command_args.jobs != 1:
+                    # the processes of the jobs share the CPUs
+                    processor_kwargs['fft_threads'] = get_job_fft_threads(command_args.jobs)
+                processor_kwargs_list.append((config_name, processor_kwargs))
+
+            if command_args.jobs == 1:
+                for config_name, processor_kwargs in processor_kwargs_list:
+                    # noinspection PyCallingNonCallable
+                    processor = _PROCESSOR_FACTORY(config_name, **processor_kwargs)
+                    for input_file in inputs:
+                        monitor = Monitor.NULL if command_args.quiet else self.new_monitor()
+                        processor.process(input_file, monitor=monitor)
+            else:
+                from dedop.proc.batch import ProcessorJob, process_batch
 
-                # noinspection PyCallingNonCallable
-                processor = _PROCESSOR_FACTORY(config_name,
-                                               chd_file=chd_file,
-                                               cnf_file=cnf_file,
-                                               cst_file=cst_file,
-                                               output_dir=output_dir,
-                                               skip_l1bs=skip_l1bs)
-                for input_file in inputs:
-                    monitor = Monitor.NULL if command_args.quiet else self.new_monitor()
-                    processor.process(input_file, monitor=monitor)
+                jobs = [ProcessorJob(config_name, processor_kwargs, input_file)
+                        for config_name, processor_kwargs in processor_kwargs_list
+                        for input_file in inputs]
+                monitor = Monitor.NULL if command_args.quiet else self.new_monitor()
+                process_batch(jobs, _PROCESSOR_FACTORY, max_workers=command_args.jobs or None, monitor=monitor)
 
         except (WorkspaceError, ProcessorException) as error:
             raise CommandError(error)
@@ -1171,7 +1232,7 @@ class NoExitArgumentParser(argparse.ArgumentParser):
 #         processor_factory = get_config_value('processor_factory')
 #
 #     global _PROCESSOR_FACTORY
-#     _PROCESSOR_FACTORY = processor_factory if processor_factory else new_l1b_processor
+#     _PROCESSOR_FACTORY = processor_factory if processor_factory else _new_l1b_processor
 #
 #     workspaces_dir = get_config_path('workspaces_dir')
 #
@@ -1254,35 +1315,57 @@ def _make_dedop_parser():
                         docs_url=_DOCS_URL)
 
 
-def main(args=None, workspace_manager=None, processor_factory=None) -> int:
-    from dedop.model.processor import BaseProcessor
+def _new_l1b_processor(name: str,
+                       cnf_file: str = None,
+                       cst_file: str = None,
+                       chd_file: str = None,
+                       output_dir: str = '.',
+                       skip_l1bs: bool = True,
+                       profile: bool = False,
+                       profile_memory: bool = False,
+                       segment_jobs: int = 1,
+                       storage: str = None,
+                       async_output: bool = False,
+                       checkpoint_interval: int = 0,
+                       resume: bool = False,
+                       fft_threads: int = None):
+    """
+    Create a new L1B processor instance.
+
+    This is a module-level function, so that it can be passed to the worker processes of ``dedop run --jobs``.
+
+    :param name: the processor "run" name
+    :param cnf_file: configuration definition file
+    :param cst_file: constants definition file
+    :param chd_file: characterisation definition file
+    :param output_dir: the output directory for L1B, L1B-S, and log-files, etc.
+    :param skip_l1bs: whether to skip L1B-S output
+    :param profile: whether to write a profiling report of the processing stages
+    :param profile_memory: whether the profiling report includes the memory allocations
+    :param segment_jobs: the number of processes processing the segments of an L1A file
+    :param storage: the storage profile of the output files, or None for the one of the CNF
+    :param async_output: whether the output files are written on background threads
+    :param checkpoint_interval: the number of L1B records between two checkpoints, 0 for no checkpoints
+    :param resume: whether the interrupted runs are resumed from their checkpoints
+    :param fft_threads: the number of threads of the FFTs, or None for the number of CPUs
+    :return: an object of type :py_class:`BaseProcessor`
+    """
     from dedop.proc.sar import L1BProcessor
-    from dedop.ui.workspace_manager import WorkspaceManager
 
-    def new_l1b_processor(name: str,
-                          cnf_file: str = None,
-                          cst_file: str = None,
-                          chd_file: str = None,
-                          output_dir: str = '.',
-                          skip_l1bs: bool = True) -> BaseProcessor:
-        """
-        Create a new L1B processor instance.
-
-        :param name: the processor "run" name
-        :param cnf_file: configuration definition file
-        :param cst_file: constants definition file
-        :param chd_file: characterisation definition file
-        :param output_dir: the output directory for L1B, L1B-S, and log-files, etc.
-        :param skip_l1bs: whether to skip L1B-S output
-        :return: an object of type :py_class:`BaseProcessor`
-        """
-        return L1BProcessor(name, cnf_file, cst_file, chd_file, output_dir, skip_l1bs)
+    return L1BProcessor(name, cnf_file, cst_file, chd_file, output_dir, skip_l1bs,
+                        profile=profile, profile_memory=profile_memory, segment_jobs=segment_jobs,
+                        storage=storage, async_output=async_output, checkpoint_interval=checkpoint_interval,
+                        resume=resume, fft_threads=fft_threads)
+
+
+def main(args=None, workspace_manager=None, processor_factory=None) -> int:
+    from dedop.ui.workspace_manager import WorkspaceManager
 
     if not processor_factory:
         processor_factory = get_config_value('processor_factory')
 
     global _PROCESSOR_FACTORY
-    _PROCESSOR_FACTORY = processor_factory if processor_factory else new_l1b_processor
+    _PROCESSOR_FACTORY = processor_factory if processor_factory else _new_l1b_processor
 
     workspaces_dir = get_config_path('workspaces_dir')
 
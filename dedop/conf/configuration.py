@@ -1,4 +1,5 @@
-from dedop.conf.enums import AzimuthWindowingMethod, AzimuthProcessingMethod, OutputFormat
+from dedop.conf.enums import AzimuthWindowingMethod, AzimuthProcessingMethod, OutputFormat, FFTBackend, \
+    OutputStorage
 from math import radians
 
 from .auxiliary_file_reader import *
@@ -90,3 +91,22 @@ class ConfigurationFile(AuxiliaryFileReader):
         AuxiliaryParameter("output_format_flag_cnf",
                            param_type=OutputFormat,
                            default_value=OutputFormat.extended)
+
+    # FFT library
+    fft_backend = \
+        AuxiliaryParameter("fft_backend_cnf",
+                           param_type=FFTBackend,
+                           default_value=FFTBackend.numpy)
+
+    # output storage
+    l1b_storage = \
+        AuxiliaryParameter("l1b_storage_cnf",
+                           param_type=OutputStorage,
+                           default_value=OutputStorage.none)
+    l1bs_storage = \
+        AuxiliaryParameter("l1bs_storage_cnf",
+                           param_type=OutputStorage,
+                           default_value=OutputStorage.none)
+    least_significant_digit = \
+        AuxiliaryParameter("least_significant_digit_cnf",
+                           cast_type=int, optional=True)
@@ -31,3 +31,23 @@ class OutputFormat(Enum):
 
     s3 = 'sentinel-3'
     extended = 'extended'
+
+
+class FFTBackend(Enum):
+    """
+    Enum for the FFT library option
+    """
+
+    numpy = 'numpy'
+    scipy = 'scipy'
+    pyfftw = 'pyfftw'
+
+
+class OutputStorage(Enum):
+    """
+    Enum for the storage option of the output files
+    """
+
+    none = 'none'
+    fast = 'fast'
+    compact = 'compact'
@@ -1,8 +1,10 @@
 __author__ = 'DeDop Development Team'
 
 __all__ = [
-    'L1ADataset'
+    'L1ADataset',
+    'L1ABlock'
 ]
 
 from .l1a_dataset import L1ADataset
-from .enums import L1ADimensions, L1AVariables
\ No newline at end of file
+from .l1a_block import L1ABlock
+from .enums import L1ADimensions, L1AVariables
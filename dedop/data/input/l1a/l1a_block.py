@@ -0,0 +1,224 @@
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+from dedop.conf import ConfigurationFile, CharacterisationFile, ConstantsFile
+from dedop.model.l1a_processing_data import L1AProcessingData, PacketPid
+from .enums import L1AVariables
+
+
+class L1ABlock:
+    """
+    a contiguous range of L1A records, decoded into one array
+    per variable (structure-of-arrays).
+
+    the values which are derived from several variables (e.g.
+    the complex waveform, scaled by the AGC) are computed once
+    for the whole block. Individual bursts are accessed by
+    indexing the block with the record index, which creates an
+    L1AProcessingData instance from the block's arrays.
+    """
+
+    #: the packet values that are copied directly from an L1A variable
+    packet_variables = (
+        ("time_sar_ku", L1AVariables.time_l1a_echo_sar_ku),
+        ("isp_coarse_time", L1AVariables.isp_coarse_time_l1a_echo_sar_ku),
+        ("isp_fine_time", L1AVariables.isp_fine_time_l1a_echo_sar_ku),
+        ("sral_fine_time", L1AVariables.sral_fine_time_l1a_echo_sar_ku),
+        ("days", L1AVariables.UTC_day_l1a_echo_sar_ku),
+        ("seconds", L1AVariables.UTC_sec_l1a_echo_sar_ku),
+        ("burst_sar_ku", L1AVariables.burst_count_prod_l1a_echo_sar_ku),
+        ("alt_sar_sat", L1AVariables.alt_l1a_echo_sar_ku),
+        ("alt_rate_sat_sar", L1AVariables.orb_alt_rate_l1a_echo_sar_ku),
+        ("x_vel_sat_sar", L1AVariables.x_vel_l1a_echo_sar_ku),
+        ("y_vel_sat_sar", L1AVariables.y_vel_l1a_echo_sar_ku),
+        ("z_vel_sat_sar", L1AVariables.z_vel_l1a_echo_sar_ku),
+        ("roll_sral_mispointing", L1AVariables.roll_sral_mispointing_l1a_echo_sar_ku),
+        ("pitch_sral_mispointing", L1AVariables.pitch_sral_mispointing_l1a_echo_sar_ku),
+        ("yaw_sral_mispointing", L1AVariables.yaw_sral_mispointing_l1a_echo_sar_ku),
+        ("cog_cor", L1AVariables.cog_cor_l1a_echo_sar_ku),
+        ("h0_sar", L1AVariables.h0_applied_l1a_echo_sar_ku),
+        ("uso_cor", L1AVariables.uso_cor_l1a_echo_sar_ku),
+        ("cor2_sar", L1AVariables.cor2_applied_l1a_echo_sar_ku),
+        ("x_sar_sat", L1AVariables.x_pos_l1a_echo_sar_ku),
+        ("y_sar_sat", L1AVariables.y_pos_l1a_echo_sar_ku),
+        ("z_sar_sat", L1AVariables.z_pos_l1a_echo_sar_ku),
+        ("flag_time_status", L1AVariables.flag_time_status_l1a_echo_sar_ku),
+        ("nav_bul_status", L1AVariables.nav_bul_status_l1a_echo_sar_ku),
+        ("nav_bul_source", L1AVariables.nav_bul_source_l1a_echo_sar_ku),
+        ("source_seq_count", L1AVariables.seq_count_l1a_echo_sar_ku),
+        ("oper_instr", L1AVariables.oper_instr_l1a_echo_sar_ku),
+        ("SAR_mode", L1AVariables.SAR_mode_l1a_echo_sar_ku),
+        ("cl_gain", L1AVariables.cl_gain_l1a_echo_sar_ku),
+        ("acq_stat", L1AVariables.acq_stat_l1a_echo_sar_ku),
+        ("dem_eeprom", L1AVariables.dem_eeprom_l1a_echo_sar_ku),
+        ("loss_track", L1AVariables.loss_track_l1a_echo_sar_ku),
+        ("h0_nav_dem", L1AVariables.h0_nav_dem_l1a_echo_sar_ku),
+        ("h0_applied", L1AVariables.h0_applied_l1a_echo_sar_ku),
+        ("cor2_nav_dem", L1AVariables.cor2_nav_dem_l1a_echo_sar_ku),
+        ("cor2_applied", L1AVariables.cor2_applied_l1a_echo_sar_ku),
+        ("dh0", L1AVariables.dh0_l1a_echo_sar_ku),
+        ("agccode_ku", L1AVariables.agccode_ku_l1a_echo_sar_ku),
+        ("range_ku", L1AVariables.range_ku_l1a_echo_sar_ku),
+        ("int_path_cor_ku", L1AVariables.int_path_cor_ku_l1a_echo_sar_ku),
+        ("agc_ku", L1AVariables.agc_ku_l1a_echo_sar_ku),
+        ("sig0_cal_ku", L1AVariables.sig0_cal_ku_l1a_echo_sar_ku),
+        ("surf_type", L1AVariables.surf_type_l1a_echo_sar_ku),
+        # CAL 1
+        ("cal1_power", L1AVariables.burst_power_cor_ku_l1a_echo_sar_ku),
+        ("cal1_phase", L1AVariables.burst_phase_cor_ku_l1a_echo_sar_ku),
+    )
+
+    #: all the L1A variables that can be read into a block
+    variables = tuple(
+        sorted({var for _, var in packet_variables} | {
+            L1AVariables.lat_l1a_echo_sar_ku,
+            L1AVariables.lon_l1a_echo_sar_ku,
+            L1AVariables.pitch_sat_pointing_l1a_echo_sar_ku,
+            L1AVariables.i_meas_ku_l1a_echo_sar_ku,
+            L1AVariables.q_meas_ku_l1a_echo_sar_ku,
+            L1AVariables.gprw_meas_ku_l1a_echo_sar_ku,
+        }, key=lambda var: var.value)
+    )
+
+    #: the L1A variables needed to locate the bursts & their surfaces
+    #: (i.e. all but the waveforms and the calibrations)
+    location_variables = (
+        L1AVariables.time_l1a_echo_sar_ku,
+        L1AVariables.UTC_day_l1a_echo_sar_ku,
+        L1AVariables.UTC_sec_l1a_echo_sar_ku,
+        L1AVariables.lat_l1a_echo_sar_ku,
+        L1AVariables.lon_l1a_echo_sar_ku,
+        L1AVariables.alt_l1a_echo_sar_ku,
+        L1AVariables.orb_alt_rate_l1a_echo_sar_ku,
+        L1AVariables.x_vel_l1a_echo_sar_ku,
+        L1AVariables.y_vel_l1a_echo_sar_ku,
+        L1AVariables.z_vel_l1a_echo_sar_ku,
+        L1AVariables.roll_sral_mispointing_l1a_echo_sar_ku,
+        L1AVariables.pitch_sral_mispointing_l1a_echo_sar_ku,
+        L1AVariables.yaw_sral_mispointing_l1a_echo_sar_ku,
+        L1AVariables.pitch_sat_pointing_l1a_echo_sar_ku,
+        L1AVariables.cog_cor_l1a_echo_sar_ku,
+        L1AVariables.range_ku_l1a_echo_sar_ku,
+    )
+
+    @classmethod
+    def get_variables(cls, cnf: ConfigurationFile) -> Tuple[L1AVariables, ...]:
+        """
+        get the L1A variables needed for the given configuration. The
+        CAL2 tables are only read if the CAL2 correction is enabled.
+
+        :param cnf: the CNF data object
+        """
+        if cnf.flag_cal2_correction:
+            return cls.variables
+        return tuple(
+            var for var in cls.variables if var != L1AVariables.gprw_meas_ku_l1a_echo_sar_ku
+        )
+
+    def __init__(self, start: int, stop: int, columns: Dict[L1AVariables, np.ndarray],
+                 cst: ConstantsFile, chd: CharacterisationFile, cnf: ConfigurationFile):
+        """
+        create the block from the arrays read from the L1A file
+
+        :param start: index of the first record of the block
+        :param stop: index after the last record of the block
+        :param columns: the array of each L1A variable, for records start to stop. Without
+                        the I & Q samples, the packets of the block have no waveform.
+        :param cst: the CST data object
+        :param chd: the CHD data object
+        :param cnf: the CNF data object
+        """
+        self.start = start
+        self.stop = stop
+        self.cst = cst
+        self.chd = chd
+        self.cnf = cnf
+
+        self._columns = columns
+
+        if L1AVariables.i_meas_ku_l1a_echo_sar_ku in columns:
+            # convert scale factor to linear value
+            self.scale_factor = np.power(
+                10., -columns[L1AVariables.agc_ku_l1a_echo_sar_ku] / 20.
+            )
+            # construct waveforms
+            self.waveform = (columns[L1AVariables.i_meas_ku_l1a_echo_sar_ku] +
+                             1j * columns[L1AVariables.q_meas_ku_l1a_echo_sar_ku]) /\
+                self.scale_factor[:, np.newaxis, np.newaxis]
+        else:
+            self.scale_factor = None
+            self.waveform = None
+
+        zcog = np.cos(columns[L1AVariables.pitch_sat_pointing_l1a_echo_sar_ku]) *\
+            columns[L1AVariables.cog_cor_l1a_echo_sar_ku]
+        self.win_delay = (columns[L1AVariables.range_ku_l1a_echo_sar_ku] + zcog) * 2 / self.cst.c
+
+        self.lat = np.radians(columns[L1AVariables.lat_l1a_echo_sar_ku])
+        self.lon = np.radians(columns[L1AVariables.lon_l1a_echo_sar_ku])
+        self.roll = np.radians(columns[L1AVariables.roll_sral_mispointing_l1a_echo_sar_ku])
+        self.pitch = np.radians(columns[L1AVariables.pitch_sral_mispointing_l1a_echo_sar_ku])
+        self.yaw = np.radians(columns[L1AVariables.yaw_sral_mispointing_l1a_echo_sar_ku])
+
+        if L1AVariables.gprw_meas_ku_l1a_echo_sar_ku in columns:
+            self.cal2_array = columns[L1AVariables.gprw_meas_ku_l1a_echo_sar_ku][:, self.cnf.flag_cal2_table_index, :]
+        else:
+            self.cal2_array = None
+
+        self._packet_columns = [
+            (name, columns[var]) for name, var in self.packet_variables if var in columns
+        ]
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __contains__(self, index: int) -> bool:
+        return self.start <= index < self.stop
+
+    def __iter__(self) -> Iterator[L1AProcessingData]:
+        for index in range(self.start, self.stop):
+            yield self[index]
+
+    def get_column(self, varname: L1AVariables) -> np.ndarray:
+        """
+        get the values of a variable for all records of the block
+        """
+        return self._columns[varname]
+
+    def __getitem__(self, index: int) -> L1AProcessingData:
+        """
+        create the packet of the record at the given index
+
+        :param index: the index of the record in the L1A file
+        """
+        if index not in self:
+            raise IndexError("record {} is not in block [{}, {})".format(index, self.start, self.stop))
+        row = index - self.start
+
+        values = {name: column[row] for name, column in self._packet_columns}
+
+        packet = L1AProcessingData(
+            self.cst, self.chd, index,
+            isp_pid=PacketPid.echo_sar,
+            inst_id_sar_isp=0,
+            pri_sar_pre_dat=self.chd.pri_sar,
+            ambiguity_order_sar=0,
+            lat_sar_sat=self.lat[row],
+            lon_sar_sat=self.lon[row],
+            roll_sar=self.roll[row],
+            pitch_sar=self.pitch[row],
+            yaw_sar=self.yaw[row],
+            t0_sar=self.chd.t0_nom,  # * (1. + 2. * self.uso_cor_l1a_echo_sar_ku[index] / self.cst.c),
+            win_delay_sar_ku=self.win_delay[row],
+            # the waveform is corrected in-place by the calibrations,
+            # so each packet needs its own copy
+            waveform_cor_sar=None if self.waveform is None else self.waveform[row].copy(),
+            beams_focused=None,
+            # CAL 2
+            cal2_array=None if self.cal2_array is None else self.cal2_array[row],
+            **values
+        )
+
+        packet.compute_location_sar_surf()
+        packet.compute_doppler_angle()
+        return packet
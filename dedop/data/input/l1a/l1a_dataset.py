@@ -1,14 +1,13 @@
-from enum import Enum
-from math import log10, radians
 from typing import Iterator
 
 import netCDF4 as nc
 import numpy as np
 
 from dedop.conf import ConfigurationFile, CharacterisationFile, ConstantsFile
-from dedop.model.l1a_processing_data import L1AProcessingData, PacketPid
+from dedop.model.l1a_processing_data import L1AProcessingData
 from ..input_dataset import InputDataset
-from .enums import L1AVariables, L1ADimensions
+from .enums import L1AVariables
+from .l1a_block import L1ABlock
 
 from ..netcdf_reader import NetCDFReader
 
@@ -83,19 +82,35 @@ class L1AGlobals:
 
 
 class L1ADataset(InputDataset):
-    def __init__(self, filename: str, cst: ConstantsFile, chd: CharacterisationFile, cnf: ConfigurationFile):
+    #: the number of chunks of records read at once by iter_locations
+    LOCATION_CHUNKS = 50
+
+    def __init__(self, filename: str, cst: ConstantsFile, chd: CharacterisationFile, cnf: ConfigurationFile,
+                 chunk_size: int=None, prefetch: bool=False):
         """
         The L1ADataset class reads L1A NetCDF data files.
+
+        Only the variables needed by the configuration are cached by
+        the reader. The chunk size and the background prefetching of
+        the next chunk are passed to the NetCDFReader.
         """
-        dset = NetCDFReader(filename)
+        dset = NetCDFReader(
+            filename, chunk_size=chunk_size, variables=L1ABlock.get_variables(cnf), prefetch=prefetch
+        )
         super().__init__(dset, cst=cst, chd=chd, cnf=cnf)
 
         self._file_path = filename
 
-        if self._roi_enabled():
-            lats = dset.get_variable(L1AVariables.lat_l1a_echo_sar_ku)[:]
-            lons = dset.get_variable(L1AVariables.lon_l1a_echo_sar_ku)[:]
+        lats = dset.get_variable(L1AVariables.lat_l1a_echo_sar_ku)[:]
+        lons = dset.get_variable(L1AVariables.lon_l1a_echo_sar_ku)[:]
+
+        # records without a location do not contain valid data
+        # (this is the vectorized form of InputDataset.is_valid)
+        valid_filter = np.logical_not(
+            np.logical_and(np.radians(lats) == 0., np.radians(lons) == 0.)
+        )
 
+        if self._roi_enabled():
             roi_filter = np.ones(lats.shape, dtype=bool)
             if self.cnf.min_lat is not None:
                 roi_filter = np.logical_and(
@@ -117,13 +132,38 @@ class L1ADataset(InputDataset):
             indexes = np.argwhere(roi_filter)
             self._start_index = indexes.min()
             self._final_index = indexes.max()
+            self._record_filter = np.logical_and(roi_filter, valid_filter)
         else:
             self._roi_filter = None
             self._start_index = 0
             self._final_index = self._get_data_size()
+            self._record_filter = valid_filter
+
+        self._last_index = self._start_index
+        self._block = None
 
+    def select(self, start: int, stop: int) -> None:
+        """
+        restrict the records read by next() to a range of indices
+        (within the ROI, if one is defined)
+
+        :param start: index of the first record to read
+        :param stop: index after the last record to read
+        """
+        self._start_index = max(self._start_index, start)
+        self._final_index = min(self._final_index, stop)
         self._last_index = self._start_index
 
+    def seek(self, index: int) -> None:
+        """
+        continue reading the records by next() from the given index.
+        Unlike select, the range of the records of the file (and so
+        its first & last times) is unchanged.
+
+        :param index: index of the next record to read
+        """
+        self._last_index = min(max(self._start_index, index), self._final_index)
+
     def _roi_enabled(self) -> bool:
         return self.cnf.min_lat is not None or\
                self.cnf.min_lon is not None or\
@@ -135,11 +175,15 @@ class L1ADataset(InputDataset):
             return True
         return self._roi_filter[index]
 
+    def _check_record(self, index) -> bool:
+        """
+        check if the record is both valid and within the ROI, without
+        decoding it
+        """
+        return bool(self._record_filter[index])
+
     def _get_data_size(self) -> int:
-        dim = self._dset.dimensions[
-            L1ADimensions.time_l1a_echo_sar_ku.value
-        ]
-        return dim.size
+        return self._dset.record_count
 
     @property
     def file_path(self) -> str:
@@ -159,91 +203,85 @@ class L1ADataset(InputDataset):
     def __len__(self):
         return self._final_index - self._start_index
 
-    def __getitem__(self, index: int) -> L1AProcessingData:
-        # convert scale factor to linear value
-        agc = self.get_value(L1AVariables.agc_ku_l1a_echo_sar_ku, index)
-        scale_factor = pow(10., -agc / 20.)
-        # construct waveform
-        waveform = (self.get_value(L1AVariables.i_meas_ku_l1a_echo_sar_ku, index) +
-                    1j * self.get_value(L1AVariables.q_meas_ku_l1a_echo_sar_ku, index)) / scale_factor
-        zcog = np.cos(self.get_value(L1AVariables.pitch_sat_pointing_l1a_echo_sar_ku, index)) *\
-               self.get_value(L1AVariables.cog_cor_l1a_echo_sar_ku, index)
-        range = self.get_value(L1AVariables.range_ku_l1a_echo_sar_ku, index) + zcog
-
-        packet = L1AProcessingData(
-            self.cst, self.chd, index,
-            isp_pid=PacketPid.echo_sar,
-            time_sar_ku=self.get_value(L1AVariables.time_l1a_echo_sar_ku, index),
-            isp_coarse_time=self.get_value(L1AVariables.isp_coarse_time_l1a_echo_sar_ku, index),
-            isp_fine_time=self.get_value(L1AVariables.isp_fine_time_l1a_echo_sar_ku, index),
-            sral_fine_time=self.get_value(L1AVariables.sral_fine_time_l1a_echo_sar_ku, index),
-            days=self.get_value(L1AVariables.UTC_day_l1a_echo_sar_ku, index),
-            seconds=self.get_value(L1AVariables.UTC_sec_l1a_echo_sar_ku, index),
-            inst_id_sar_isp=0,
-            pri_sar_pre_dat=self.chd.pri_sar,
-            ambiguity_order_sar=0,
-            burst_sar_ku=self.get_value(L1AVariables.burst_count_prod_l1a_echo_sar_ku, index),
-            lat_sar_sat=radians(self.get_value(L1AVariables.lat_l1a_echo_sar_ku, index)),
-            lon_sar_sat=radians(self.get_value(L1AVariables.lon_l1a_echo_sar_ku, index)),
-            alt_sar_sat=self.get_value(L1AVariables.alt_l1a_echo_sar_ku, index),
-            alt_rate_sat_sar=self.get_value(L1AVariables.orb_alt_rate_l1a_echo_sar_ku, index),
-            x_vel_sat_sar=self.get_value(L1AVariables.x_vel_l1a_echo_sar_ku, index),
-            y_vel_sat_sar=self.get_value(L1AVariables.y_vel_l1a_echo_sar_ku, index),
-            z_vel_sat_sar=self.get_value(L1AVariables.z_vel_l1a_echo_sar_ku, index),
-            roll_sar=radians(self.get_value(L1AVariables.roll_sral_mispointing_l1a_echo_sar_ku, index)),
-            pitch_sar=radians(self.get_value(L1AVariables.pitch_sral_mispointing_l1a_echo_sar_ku, index)),
-            yaw_sar=radians(self.get_value(L1AVariables.yaw_sral_mispointing_l1a_echo_sar_ku, index)),
-            roll_sral_mispointing=self.get_value(L1AVariables.roll_sral_mispointing_l1a_echo_sar_ku, index),
-            pitch_sral_mispointing=self.get_value(L1AVariables.pitch_sral_mispointing_l1a_echo_sar_ku, index),
-            yaw_sral_mispointing=self.get_value(L1AVariables.yaw_sral_mispointing_l1a_echo_sar_ku, index),
-            cog_cor=self.get_value(L1AVariables.cog_cor_l1a_echo_sar_ku, index),
-            h0_sar=self.get_value(L1AVariables.h0_applied_l1a_echo_sar_ku, index),
-            t0_sar=self.chd.t0_nom,  # * (1. + 2. * self.uso_cor_l1a_echo_sar_ku[index] / self.cst.c),
-            uso_cor=self.get_value(L1AVariables.uso_cor_l1a_echo_sar_ku, index),
-            cor2_sar=self.get_value(L1AVariables.cor2_applied_l1a_echo_sar_ku, index),
-            win_delay_sar_ku=range * 2 / self.cst.c,
-            x_sar_sat=self.get_value(L1AVariables.x_pos_l1a_echo_sar_ku, index),
-            y_sar_sat=self.get_value(L1AVariables.y_pos_l1a_echo_sar_ku, index),
-            z_sar_sat=self.get_value(L1AVariables.z_pos_l1a_echo_sar_ku, index),
-            waveform_cor_sar=waveform,
-            beams_focused=None,
-            flag_time_status=self.get_value(L1AVariables.flag_time_status_l1a_echo_sar_ku, index),
-            nav_bul_status=self.get_value(L1AVariables.nav_bul_status_l1a_echo_sar_ku, index),
-            nav_bul_source=self.get_value(L1AVariables.nav_bul_source_l1a_echo_sar_ku, index),
-            source_seq_count=self.get_value(L1AVariables.seq_count_l1a_echo_sar_ku, index),
-            oper_instr=self.get_value(L1AVariables.oper_instr_l1a_echo_sar_ku, index),
-            SAR_mode=self.get_value(L1AVariables.SAR_mode_l1a_echo_sar_ku, index),
-            cl_gain=self.get_value(L1AVariables.cl_gain_l1a_echo_sar_ku, index),
-            acq_stat=self.get_value(L1AVariables.acq_stat_l1a_echo_sar_ku, index),
-            dem_eeprom=self.get_value(L1AVariables.dem_eeprom_l1a_echo_sar_ku, index),
-            loss_track=self.get_value(L1AVariables.loss_track_l1a_echo_sar_ku, index),
-            h0_nav_dem=self.get_value(L1AVariables.h0_nav_dem_l1a_echo_sar_ku, index),
-            h0_applied=self.get_value(L1AVariables.h0_applied_l1a_echo_sar_ku, index),
-            cor2_nav_dem=self.get_value(L1AVariables.cor2_nav_dem_l1a_echo_sar_ku, index),
-            cor2_applied=self.get_value(L1AVariables.cor2_applied_l1a_echo_sar_ku, index),
-            dh0=self.get_value(L1AVariables.dh0_l1a_echo_sar_ku, index),
-            agccode_ku=self.get_value(L1AVariables.agccode_ku_l1a_echo_sar_ku, index),
-            range_ku=self.get_value(L1AVariables.range_ku_l1a_echo_sar_ku, index),
-            int_path_cor_ku=self.get_value(L1AVariables.int_path_cor_ku_l1a_echo_sar_ku, index),
-            agc_ku=self.get_value(L1AVariables.agc_ku_l1a_echo_sar_ku, index),
-            sig0_cal_ku=self.get_value(L1AVariables.sig0_cal_ku_l1a_echo_sar_ku, index),
-            surf_type=self.get_value(L1AVariables.surf_type_l1a_echo_sar_ku, index),
-            # CAL 1 & CAL 2
-            cal1_power=self.get_value(L1AVariables.burst_power_cor_ku_l1a_echo_sar_ku, index),
-            cal1_phase=self.get_value(L1AVariables.burst_phase_cor_ku_l1a_echo_sar_ku, index),
-            cal2_array=self.get_value(L1AVariables.gprw_meas_ku_l1a_echo_sar_ku, index)[self.cnf.flag_cal2_table_index, :]
-        )
+    def read_block(self, start: int, stop: int) -> L1ABlock:
+        """
+        read a contiguous range of records into an L1ABlock, with
+        one array per variable
 
-        packet.compute_location_sar_surf()
-        packet.compute_doppler_angle()
-        return packet
+        :param start: index of the first record to read
+        :param stop: index after the last record to read
+        """
+        start = max(start, 0)
+        stop = min(stop, self._get_data_size())
+
+        columns = {
+            varname: self._dset.get_values(varname, start, stop) for varname in self._dset.variables
+        }
+        return L1ABlock(start, stop, columns, cst=self.cst, chd=self.chd, cnf=self.cnf)
+
+    def read_locations(self, start: int, stop: int) -> L1ABlock:
+        """
+        read a contiguous range of records into an L1ABlock with only
+        the variables which locate the bursts, and so without their
+        waveforms
+
+        :param start: index of the first record to read
+        :param stop: index after the last record to read
+        """
+        start = max(start, 0)
+        stop = min(stop, self._get_data_size())
+
+        columns = {
+            varname: self._dset.read_values(varname, start, stop) for varname in L1ABlock.location_variables
+        }
+        return L1ABlock(start, stop, columns, cst=self.cst, chd=self.chd, cnf=self.cnf)
+
+    def iter_locations(self) -> Iterator[L1AProcessingData]:
+        """
+        iterate over the records like __iter__, but with packets
+        decoded from the location variables only (see read_locations)
+        """
+        block_size = self._dset.chunk_size * self.LOCATION_CHUNKS
+
+        for block_start in range(self._start_index, self._final_index, block_size):
+            block = self.read_locations(block_start, min(block_start + block_size, self._final_index))
+
+            for record in range(block.start, block.stop):
+                if self._record_filter[record]:
+                    yield block[record]
+                else:
+                    yield None
+
+    def _get_block(self, index: int) -> L1ABlock:
+        """
+        get the (chunk aligned) block containing the given record
+        """
+        if self._block is None or index not in self._block:
+            block_start = index - index % self._dset.chunk_size
+            self._block = self.read_block(block_start, block_start + self._dset.chunk_size)
+        return self._block
+
+    def __getitem__(self, index: int) -> L1AProcessingData:
+        return self._get_block(index)[index]
 
     def __iter__(self) -> Iterator[L1AProcessingData]:
-        for index in range(self._start_index, self._final_index):
-            if self._check_roi(index) and self.is_valid(self[index]):
-                yield self[index]
-            else:
-                yield None
+        """
+        iterate over the records, yielding None for the records which
+        are invalid or outside of the ROI. Each record is decoded
+        once, and only if it passes the filters.
+        """
+        index = self._start_index
+
+        while index < self._final_index:
+            block = self._get_block(index)
+            stop = min(block.stop, self._final_index)
+
+            for record in range(index, stop):
+                if self._record_filter[record]:
+                    yield block[record]
+                else:
+                    yield None
+            index = stop
 
     def __next__(self) -> L1AProcessingData:
         if self._last_index >= self._final_index:
@@ -252,14 +290,12 @@ class L1ADataset(InputDataset):
         #     self._last_index += 1
         #     if self._last_index == self.max_index:
         #         return None
-        if not self._check_roi(self._last_index):
+        if not self._check_record(self._last_index):
             self._last_index += 1
             return None
         packet = self[self._last_index]
         self._last_index += 1
 
-        if not self.is_valid(packet):
-            return None
         return packet
 
     def get_value(self, varname, index):
@@ -275,3 +311,6 @@ class L1ADataset(InputDataset):
 
     def read_globals(self) -> L1AGlobals:
         return L1AGlobals(**self._dset.read_globals())
+
+    def close(self):
+        self._dset.close()
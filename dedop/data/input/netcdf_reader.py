@@ -1,43 +1,92 @@
 import netCDF4 as nc
 import numpy as np
-from typing import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Iterable, Dict
 
-from .l1a.enums import L1AVariables
+from ..netcdf_lock import NETCDF_LOCK
+from .l1a.enums import L1AVariables, L1ADimensions
 
 
 class NetCDFReader:
     """
     retrieves data from a netCDF document in blocks
+
+    the values of the cached variables are read in chunks of
+    'chunk_size' records. Unless a chunk size is given, it is
+    aligned to the chunking of the variables in the file, so that
+    each chunk read covers whole HDF5 chunks. If 'prefetch' is
+    enabled, the next chunk is read on a background thread while
+    the current one is in use.
     """
 
+    #: minimum number of records read into the cache at once
+    DEFAULT_CHUNK_SIZE = 40
+    #: maximum number of records read into the cache at once, if the chunk size is aligned to the file
+    MAX_CHUNK_SIZE = 4 * DEFAULT_CHUNK_SIZE
+
     @property
     def variables(self) -> Iterator[L1AVariables]:
-        return iter(L1AVariables)
+        return iter(self._variables)
 
     @property
     def dimensions(self):
         return self._doc.dimensions
 
-    def __init__(self, filename, chunk_size=40):
+    def __init__(self, filename, chunk_size: int=None, variables: Iterable[L1AVariables]=None,
+                 prefetch: bool=False):
         """
         open document and set block size
+
+        :param filename: the path of the netCDF file
+        :param chunk_size: number of records per chunk, or None to align it to the file's chunking
+        :param variables: the variables to cache (defaults to all L1A variables)
+        :param prefetch: if True, read the next chunk in the background
         """
 
-        self._doc = nc.Dataset(filename, 'r')
+        with NETCDF_LOCK:
+            self._doc = nc.Dataset(filename, 'r')
+            self._variables = tuple(L1AVariables if variables is None else variables)
+            self._record_count = self._doc.dimensions[L1ADimensions.time_l1a_echo_sar_ku.value].size
+
+            for varname in self.variables:
+                name = varname.value
+
+                var = self._doc.variables[name]
+                var.set_auto_mask(False)
+
+            if chunk_size is None:
+                chunk_size = self._get_aligned_chunk_size()
+
         self.cache = {}
         self.chunk_index = None
         self.chunk_size = chunk_size
 
+        if prefetch:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._executor = None
+        self._prefetched = None
+
+    def _get_aligned_chunk_size(self) -> int:
+        """
+        get the smallest multiple of the on-disk chunk length (along
+        the record dimension) that is at least DEFAULT_CHUNK_SIZE. Files
+        with very long on-disk chunks are read in chunks of at most
+        MAX_CHUNK_SIZE records instead.
+        """
+        disk_chunk = 1
         for varname in self.variables:
-            name = varname.value
+            var = self._doc.variables[varname.value]
+            chunking = var.chunking()
 
-            var = self._doc.variables[name]
-            var.set_auto_mask(False)
+            if var.dimensions[:1] != (L1ADimensions.time_l1a_echo_sar_ku.value,):
+                continue
+            if chunking == 'contiguous' or not chunking:
+                continue
+            disk_chunk = max(disk_chunk, chunking[0])
 
-            # size = list(var.shape)
-            #
-            # if size[0] > self.chunk_size:
-            #     size[0] = self.chunk_size
+        n_disk_chunks = -(-self.DEFAULT_CHUNK_SIZE // disk_chunk)
+        return min(n_disk_chunks * disk_chunk, self.MAX_CHUNK_SIZE)
 
     def get_variable(self, varname: L1AVariables) -> nc.Variable:
         return self._doc.variables[varname.value]
@@ -46,6 +95,10 @@ class NetCDFReader:
         """
         get the value of a variable at a specific index
         """
+        if varname not in self._variables:
+            with NETCDF_LOCK:
+                return self._doc.variables[varname.value][index]
+
         chunk_index = index % self.chunk_size
         chunk_start = index - chunk_index
 
@@ -54,31 +107,98 @@ class NetCDFReader:
 
         return self.cache[varname][chunk_index]
 
+    def get_values(self, varname: L1AVariables, start: int, stop: int) -> np.ndarray:
+        """
+        get the values of a variable for a contiguous range of indices
+
+        ranges which fit within one chunk are served from the
+        cache, other ranges are read directly from the file
+        """
+        chunk_start = start - start % self.chunk_size
+
+        if varname in self._variables and stop <= chunk_start + self.chunk_size:
+            if chunk_start != self.chunk_index:
+                self._load_chunk(chunk_start)
+
+            return self.cache[varname][start - chunk_start:stop - chunk_start]
+
+        with NETCDF_LOCK:
+            return self._doc.variables[varname.value][start:stop]
+
+    def read_values(self, varname: L1AVariables, start: int, stop: int) -> np.ndarray:
+        """
+        read the values of a variable for a contiguous range of indices
+        from the file, without reading the chunk of the cached variables
+        """
+        with NETCDF_LOCK:
+            return self._doc.variables[varname.value][start:stop]
+
     def _load_chunk(self, chunk_start: int):
         """
         read a new chunk & replace the existing one
         """
+        prefetched = self._prefetched
+        self._prefetched = None
+
+        if prefetched is not None and prefetched[0] == chunk_start:
+            self.cache = prefetched[1].result()
+        else:
+            if prefetched is not None:
+                # wait for the unused read to finish before using the file
+                prefetched[1].result()
+            self.cache = self._read_chunk(chunk_start)
+
+        self.chunk_index = chunk_start
+
+        if self._executor is not None:
+            next_start = chunk_start + self.chunk_size
+
+            if next_start < self._record_count:
+                self._prefetched = (
+                    next_start, self._executor.submit(self._read_chunk, next_start)
+                )
+
+    def _read_chunk(self, chunk_start: int) -> Dict[L1AVariables, np.ndarray]:
+        """
+        read the cached variables for the chunk starting at the given index
+        """
         chunk_end = chunk_start + self.chunk_size
+        cache = {}
 
-        for varname in self.variables:
-            name = varname.value
-            var = self._doc.variables[name]
-            varlen = var.shape[0]
+        with NETCDF_LOCK:
+            for varname in self.variables:
+                name = varname.value
+                var = self._doc.variables[name]
+                varlen = var.shape[0]
 
-            if chunk_start >= varlen:
-                continue
+                if chunk_start >= varlen:
+                    continue
 
-            end = min(varlen, chunk_end)
+                end = min(varlen, chunk_end)
 
-            self.cache[varname] = var[chunk_start:end].copy()
+                cache[varname] = var[chunk_start:end].copy()
 
-        self.chunk_index = chunk_start
+        return cache
+
+    @property
+    def record_count(self) -> int:
+        """
+        the number of records in the file
+        """
+        return self._record_count
 
     def close(self):
-        self._doc.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._prefetched = None
+        with NETCDF_LOCK:
+            if self._doc.isopen():
+                self._doc.close()
 
     def read_globals(self):
         attrs = {}
-        for attr_name in self._doc.ncattrs():
-            attrs[attr_name] = self._doc.getncattr(attr_name)
+        with NETCDF_LOCK:
+            for attr_name in self._doc.ncattrs():
+                attrs[attr_name] = self._doc.getncattr(attr_name)
         return attrs
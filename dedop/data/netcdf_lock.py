@@ -0,0 +1,8 @@
+"""
+The HDF5 library used by netCDF4 is not thread-safe, not even for different files: while the next chunk
+of an L1A file is read in the background, the output files can't be written. All calls into the library
+which may run in parallel with another thread are therefore made while holding this lock.
+"""
+from threading import RLock
+
+NETCDF_LOCK = RLock()
@@ -1,10 +1,11 @@
 from enum import Enum
 
 import numpy as np
-from math import degrees
+from typing import Dict
 
 from dedop.model import SurfaceData
-from .netcdf_writer import NetCDFWriter
+from .netcdf_writer import NetCDFWriter, compute_utc_days_seconds
+from .storage import StorageProfile, get_storage_profile
 from ...conf import CharacterisationFile, ConfigurationFile, ConstantsFile
 
 
@@ -91,13 +92,22 @@ class L1BWriterExtended(NetCDFWriter):
     """
     class for writing L1B netCDF files
     """
-    def __init__(self, chd: CharacterisationFile, cnf: ConfigurationFile, cst: ConstantsFile, filename: str):
+    SURFACE_INTERMEDIATES = frozenset(('stack_mask_vector_start_stop',))
+
+    def __init__(self, chd: CharacterisationFile, cnf: ConfigurationFile, cst: ConstantsFile, filename: str,
+                 storage: StorageProfile = None, background: bool = False,
+                 append: bool = False):
         """
         Initialize the L1BWriter Instance
 
         :param filename: the path of the output file to write
+        :param storage: the storage profile of the variables, given by the CNF by default
+        :param background: if True, the records are written to the file on a background thread
+        :param append: if True, the records are appended to the existing output file
         """
-        super().__init__(filename)
+        if storage is None:
+            storage = get_storage_profile(cnf.l1b_storage, cnf.least_significant_digit)
+        super().__init__(filename, storage=storage, background=background, append=append)
         self.chd = chd
         self.cnf = cnf
         self.cst = cst
@@ -119,7 +129,8 @@ class L1BWriterExtended(NetCDFWriter):
             (L1BDimensions.time_l1b_echo_sar_ku,),
             long_name="UTC: l1b_echo_Sar_ku mode",
             calendar="gregorian",
-            units="seconds since 2000-01-01 00:00:00.0"
+            units="seconds since 2000-01-01 00:00:00.0",
+            properties=dict(least_significant_digit=None)
         )
         self.define_variable(
             L1BVariables.UTC_day_l1b_echo_sar_ku,
@@ -135,7 +146,8 @@ class L1BWriterExtended(NetCDFWriter):
             (L1BDimensions.time_l1b_echo_sar_ku,),
             long_name="seconds in the day UTC: l1b_echo_sar_ku mode",
             units="seconds in the day",
-            fill_value=18446744073709551616
+            fill_value=18446744073709551616,
+            properties=dict(least_significant_digit=None)
         )
         self.define_variable(
             L1BVariables.GPS_time_l1b_echo_sar_ku,
@@ -144,7 +156,8 @@ class L1BWriterExtended(NetCDFWriter):
             long_name="GPS time: l1b_echo_sar_ku mode",
             calendar="gregorian",
             units="seconds since 1980-01-06 00:00:00.0",
-            fill_value=18446744073709551616
+            fill_value=18446744073709551616,
+            properties=dict(least_significant_digit=None)
         )
         self.define_variable(
             L1BVariables.isp_coarse_time_l1b_echo_sar_ku,
@@ -844,15 +857,6 @@ class L1BWriterExtended(NetCDFWriter):
 
         closest_burst = surface_location_data.closest_burst
 
-        time_interval = surface_location_data.time_surf - surface_location_data.prev_tai
-        utc_secs = surface_location_data.prev_utc_secs + time_interval
-
-        if utc_secs > surface_location_data.curr_day_length:
-            utc_secs -= surface_location_data.curr_day_length
-            utc_days = surface_location_data.prev_utc_days + 1
-        else:
-            utc_days = surface_location_data.prev_utc_days
-
         # scale_factor = pow(10, -closest_burst.agc_ku / 10)
         scale_factor = surface_location_data.waveform_multilooked.max()
 
@@ -861,15 +865,22 @@ class L1BWriterExtended(NetCDFWriter):
         # plt.show()
 
         super().write_record(
+            # auxiliary values, from which derive_columns computes the
+            # UTC time & the angles in degrees
+            prev_tai=surface_location_data.prev_tai,
+            prev_utc_secs=surface_location_data.prev_utc_secs,
+            prev_utc_days=surface_location_data.prev_utc_days,
+            curr_day_length=surface_location_data.curr_day_length,
+            lat_surf=surface_location_data.lat_surf,
+            lon_surf=surface_location_data.lon_surf,
+            roll_sat=surface_location_data.roll_sat,
+            pitch_sat=surface_location_data.pitch_sat,
+            yaw_sat=surface_location_data.yaw_sat,
             time_l1b_echo_sar_ku=surface_location_data.time_surf,
-            UTC_day_l1b_echo_sar_ku=utc_days,
-            UTC_sec_l1b_echo_sar_ku=utc_secs,
             GPS_time_l1b_echo_sar_ku=surface_location_data.gps_time_surf,
             isp_coarse_time_l1b_echo_sar_ku=closest_burst.isp_coarse_time,
             isp_fine_time_l1b_echo_sar_ku=closest_burst.isp_fine_time,
             sral_fine_time_l1b_echo_sar_ku=closest_burst.sral_fine_time,
-            lat_l1b_echo_sar_ku=degrees(surface_location_data.lat_surf),
-            lon_l1b_echo_sar_ku=degrees(surface_location_data.lon_surf),
             alt_l1b_echo_sar_ku=surface_location_data.alt_sat,
             orb_alt_rate_l1b_echo_sar_ku=surface_location_data.alt_rate_sat,
             flag_time_status_l1b_echo_sar_ku=closest_burst.flag_time_status,
@@ -884,9 +895,6 @@ class L1BWriterExtended(NetCDFWriter):
             x_vel_l1b_echo_sar_ku=surface_location_data.x_vel_sat,
             y_vel_l1b_echo_sar_ku=surface_location_data.y_vel_sat,
             z_vel_l1b_echo_sar_ku=surface_location_data.z_vel_sat,
-            roll_sat_pointing_l1b_echo_sar_ku=degrees(surface_location_data.roll_sat),
-            pitch_sat_pointing_l1b_echo_sar_ku=degrees(surface_location_data.pitch_sat),
-            yaw_sat_pointing_l1b_echo_sar_ku=degrees(surface_location_data.yaw_sat),
             nav_bul_status_l1b_echo_sar_ku=closest_burst.nav_bul_status,
             nav_bul_source_l1b_echo_sar_ku=closest_burst.nav_bul_source,
             nav_bul_coarse_time_l1b_echo_sar_ku=None,
@@ -933,16 +941,42 @@ class L1BWriterExtended(NetCDFWriter):
             stack_scale_factor_ku_l1b_echo_sar_ku=surface_location_data.sigma0_scaling_factor_beam
         )
 
+    def derive_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        compute the UTC time & the angles in degrees of the buffered records
+        """
+        utc_days, utc_secs = compute_utc_days_seconds(
+            columns['time_l1b_echo_sar_ku'], columns['prev_tai'], columns['prev_utc_secs'],
+            columns['prev_utc_days'], columns['curr_day_length']
+        )
+        return {
+            'UTC_day_l1b_echo_sar_ku': utc_days,
+            'UTC_sec_l1b_echo_sar_ku': utc_secs,
+            'lat_l1b_echo_sar_ku': np.degrees(columns['lat_surf']),
+            'lon_l1b_echo_sar_ku': np.degrees(columns['lon_surf']),
+            'roll_sat_pointing_l1b_echo_sar_ku': np.degrees(columns['roll_sat']),
+            'pitch_sat_pointing_l1b_echo_sar_ku': np.degrees(columns['pitch_sat']),
+            'yaw_sat_pointing_l1b_echo_sar_ku': np.degrees(columns['yaw_sat']),
+        }
+
+
 class L1BWriter(NetCDFWriter):
     """
     class for writing L1B netCDF files
     """
-    def __init__(self, chd: CharacterisationFile, cnf: ConfigurationFile, cst: ConstantsFile, filename: str):
+    def __init__(self, chd: CharacterisationFile, cnf: ConfigurationFile, cst: ConstantsFile, filename: str,
+                 storage: StorageProfile = None, background: bool = False,
+                 append: bool = False):
         """
         Initialize the L1BWriter Instance
         :param filename: the path of the output file to write
+        :param storage: the storage profile of the variables, given by the CNF by default
+        :param background: if True, the records are written to the file on a background thread
+        :param append: if True, the records are appended to the existing output file
         """
-        super().__init__(filename)
+        if storage is None:
+            storage = get_storage_profile(cnf.l1b_storage, cnf.least_significant_digit)
+        super().__init__(filename, storage=storage, background=background, append=append)
         self.chd = chd
         self.cnf = cnf
         self.cst = cst
@@ -964,7 +998,8 @@ class L1BWriter(NetCDFWriter):
             (L1BDimensions.time_l1b_echo_sar_ku,),
             long_name="UTC: l1b_echo_Sar_ku mode",
             calendar="gregorian",
-            units="seconds since 2000-01-01 00:00:00.0"
+            units="seconds since 2000-01-01 00:00:00.0",
+            properties=dict(least_significant_digit=None)
         )
         self.define_variable(
             L1BVariables.UTC_day_l1b_echo_sar_ku,
@@ -980,7 +1015,8 @@ class L1BWriter(NetCDFWriter):
             (L1BDimensions.time_l1b_echo_sar_ku,),
             long_name="seconds in the day UTC: l1b_echo_sar_ku mode",
             units="seconds in the day",
-            fill_value=18446744073709551616
+            fill_value=18446744073709551616,
+            properties=dict(least_significant_digit=None)
         )
         self.define_variable(
             L1BVariables.GPS_time_l1b_echo_sar_ku,
@@ -989,7 +1025,8 @@ class L1BWriter(NetCDFWriter):
             long_name="GPS time: l1b_echo_sar_ku mode",
             calendar="gregorian",
             units="seconds since 1980-01-06 00:00:00.0",
-            fill_value=18446744073709551616
+            fill_value=18446744073709551616,
+            properties=dict(least_significant_digit=None)
         )
         self.define_variable(
             L1BVariables.isp_coarse_time_l1b_echo_sar_ku,
@@ -1566,27 +1603,22 @@ class L1BWriter(NetCDFWriter):
 
         closest_burst = surface_location_data.closest_burst
 
-        time_interval = surface_location_data.time_surf - surface_location_data.prev_tai
-        utc_secs = surface_location_data.prev_utc_secs + time_interval
-
-        if utc_secs > surface_location_data.curr_day_length:
-            utc_secs -= surface_location_data.curr_day_length
-            utc_days = surface_location_data.prev_utc_days + 1
-        else:
-            utc_days = surface_location_data.prev_utc_days
-
         scale_factor = pow(10, -closest_burst.agc_ku / 10)
 
         super().write_record(
+            # auxiliary values, from which derive_columns computes the
+            # UTC time & the latitude/longitude in degrees
+            prev_tai=surface_location_data.prev_tai,
+            prev_utc_secs=surface_location_data.prev_utc_secs,
+            prev_utc_days=surface_location_data.prev_utc_days,
+            curr_day_length=surface_location_data.curr_day_length,
+            lat_surf=surface_location_data.lat_surf,
+            lon_surf=surface_location_data.lon_surf,
             time_l1b_echo_sar_ku=surface_location_data.time_surf,
-            UTC_day_l1b_echo_sar_ku=utc_days,
-            UTC_sec_l1b_echo_sar_ku=utc_secs,
             GPS_time_l1b_echo_sar_ku=surface_location_data.gps_time_surf,
             isp_coarse_time_l1b_echo_sar_ku=closest_burst.isp_coarse_time,
             isp_fine_time_l1b_echo_sar_ku=closest_burst.isp_fine_time,
             sral_fine_time_l1b_echo_sar_ku=closest_burst.sral_fine_time,
-            lat_l1b_echo_sar_ku=degrees(surface_location_data.lat_surf),
-            lon_l1b_echo_sar_ku=degrees(surface_location_data.lon_surf),
             alt_l1b_echo_sar_ku=surface_location_data.alt_sat,
             orb_alt_rate_l1b_echo_sar_ku=surface_location_data.alt_rate_sat,
             flag_time_status_l1b_echo_sar_ku=closest_burst.flag_time_status,
@@ -1637,4 +1669,19 @@ class L1BWriter(NetCDFWriter):
             beam_ang_l1b_echo_sar_ku=-surface_location_data.look_angles_surf,
             beam_form_l1b_echo_sar_ku=None,
             i2q2_meas_ku_l1b_echo_sar_ku=surface_location_data.waveform_multilooked #*scale_factor
-        )
\ No newline at end of file
+        )
+
+    def derive_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        compute the UTC time & the latitude/longitude in degrees of the buffered records
+        """
+        utc_days, utc_secs = compute_utc_days_seconds(
+            columns['time_l1b_echo_sar_ku'], columns['prev_tai'], columns['prev_utc_secs'],
+            columns['prev_utc_days'], columns['curr_day_length']
+        )
+        return {
+            'UTC_day_l1b_echo_sar_ku': utc_days,
+            'UTC_sec_l1b_echo_sar_ku': utc_secs,
+            'lat_l1b_echo_sar_ku': np.degrees(columns['lat_surf']),
+            'lon_l1b_echo_sar_ku': np.degrees(columns['lon_surf']),
+        }
@@ -1,10 +1,11 @@
 from enum import Enum
 
 import numpy as np
-from math import degrees
+from typing import Dict
 
 from dedop.model import SurfaceData
-from .netcdf_writer import NetCDFWriter
+from .netcdf_writer import NetCDFWriter, compute_utc_days_seconds
+from .storage import StorageProfile, get_storage_profile
 from dedop.conf import CharacterisationFile, ConfigurationFile, ConstantsFile
 
 
@@ -73,13 +74,22 @@ class L1BSWriter(NetCDFWriter):
     """
     class for writing L1B netCDF files
     """
-    def __init__(self, chd: CharacterisationFile, cnf: ConfigurationFile, cst: ConstantsFile, filename: str):
+    SURFACE_INTERMEDIATES = frozenset(('beams_range_compr_iq', 'beam_angles_start_stop'))
+
+    def __init__(self, chd: CharacterisationFile, cnf: ConfigurationFile, cst: ConstantsFile, filename: str,
+                 storage: StorageProfile = None, background: bool = False,
+                 append: bool = False):
         """
         Initialize the L1BWriter Instance
 
         :param filename: the path of the output file to write
+        :param storage: the storage profile of the variables, given by the CNF by default
+        :param background: if True, the records are written to the file on a background thread
+        :param append: if True, the records are appended to the existing output file
         """
-        super().__init__(filename)
+        if storage is None:
+            storage = get_storage_profile(cnf.l1bs_storage, cnf.least_significant_digit)
+        super().__init__(filename, storage=storage, background=background, append=append)
         self.chd = chd
         self.cnf = cnf
         self.cst = cst
@@ -101,7 +111,8 @@ class L1BSWriter(NetCDFWriter):
             (L1BSDimensions.time_l1bs_echo_sar_ku,),
             long_name="UTC: l1bs_echo_Sar_ku mode",
             calendar="gregorian",
-            units="seconds since 2000-01-01 00:00:00.0"
+            units="seconds since 2000-01-01 00:00:00.0",
+            properties=dict(least_significant_digit=None)
         )
         self.define_variable(
             L1BSVariables.UTC_day_l1bs_echo_sar_ku,
@@ -117,7 +128,8 @@ class L1BSWriter(NetCDFWriter):
             (L1BSDimensions.time_l1bs_echo_sar_ku,),
             long_name="seconds in the day UTC: l1bs_echo_sar_ku mode",
             units="seconds in the day",
-            fill_value=1.84467440737096e19
+            fill_value=1.84467440737096e19,
+            properties=dict(least_significant_digit=None)
         )
         # lat/lon
         self.define_variable(
@@ -631,15 +643,6 @@ class L1BSWriter(NetCDFWriter):
 
         closest_burst = surface_location_data.closest_burst
         stack_end = surface_location_data.n_beams_start_stop-1
-        time_interval = surface_location_data.time_surf - surface_location_data.prev_tai
-        utc_secs = surface_location_data.prev_utc_secs + time_interval
-
-        if utc_secs > surface_location_data.curr_day_length:
-            utc_secs -= surface_location_data.curr_day_length
-            utc_days = surface_location_data.prev_utc_days + 1
-        else:
-            utc_days = surface_location_data.prev_utc_days
-
         scale_factor = pow(10, -closest_burst.agc_ku / 10)
 
         stack_i = np.real(surface_location_data.beams_range_compr_iq)
@@ -649,11 +652,15 @@ class L1BSWriter(NetCDFWriter):
         dynamic_scale = max_iq / 127.
 
         super().write_record(
+            # auxiliary values, from which derive_columns computes the
+            # UTC time & the latitude/longitude in degrees
+            prev_tai=surface_location_data.prev_tai,
+            prev_utc_secs=surface_location_data.prev_utc_secs,
+            prev_utc_days=surface_location_data.prev_utc_days,
+            curr_day_length=surface_location_data.curr_day_length,
+            lat_surf=surface_location_data.lat_surf,
+            lon_surf=surface_location_data.lon_surf,
             time_l1bs_echo_sar_ku=surface_location_data.time_surf,
-            UTC_day_l1bs_echo_sar_ku=utc_days,
-            UTC_sec_l1bs_echo_sar_ku=utc_secs,
-            lat_l1bs_echo_sar_ku=degrees(surface_location_data.lat_surf),
-            lon_l1bs_echo_sar_ku=degrees(surface_location_data.lon_surf),
             surf_type_l1bs_echo_sar_ku=surface_location_data.surface_type.value,
             records_count_l1bs_echo_sar_ku=surface_location_data.surface_counter,
             alt_l1bs_echo_sar_ku=surface_location_data.alt_sat,
@@ -701,3 +708,18 @@ class L1BSWriter(NetCDFWriter):
             start_beam_ang_stack_l1bs_echo_sar_ku=surface_location_data.start_beam_angle,
             stop_beam_ang_stack_l1bs_echo_sar_ku=surface_location_data.stop_beam_angle
         )
+
+    def derive_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        compute the UTC time & the latitude/longitude in degrees of the buffered records
+        """
+        utc_days, utc_secs = compute_utc_days_seconds(
+            columns['time_l1bs_echo_sar_ku'], columns['prev_tai'], columns['prev_utc_secs'],
+            columns['prev_utc_days'], columns['curr_day_length']
+        )
+        return {
+            'UTC_day_l1bs_echo_sar_ku': utc_days,
+            'UTC_sec_l1bs_echo_sar_ku': utc_secs,
+            'lat_l1bs_echo_sar_ku': np.degrees(columns['lat_surf']),
+            'lon_l1bs_echo_sar_ku': np.degrees(columns['lon_surf']),
+        }
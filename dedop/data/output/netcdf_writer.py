@@ -1,21 +1,65 @@
 import netCDF4 as nc
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, Future
 from enum import Enum
 import os
 import numpy as np
 
-from typing import Sequence, Tuple, Any, Union, Dict
+from typing import Sequence, Tuple, Any, Union, Dict, Deque, List
 from abc import ABCMeta, abstractmethod
+from ..netcdf_lock import NETCDF_LOCK
+from .storage import StorageProfile
 from ...version import __version__
 
 
 Name = Union[str, Enum]
 
 
+def compute_utc_days_seconds(time: np.ndarray, prev_tai: np.ndarray, prev_utc_secs: np.ndarray,
+                             prev_utc_days: np.ndarray, day_length: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    compute the UTC days & seconds in the day of a column of records
+
+    :param time: the time of each record
+    :param prev_tai: the TAI time of the previous day change of each record
+    :param prev_utc_secs: the UTC seconds at the previous day change of each record
+    :param prev_utc_days: the UTC day at the previous day change of each record
+    :param day_length: the length of the current day of each record
+    :return: the UTC days & the UTC seconds in the day of the records
+    """
+    utc_secs = prev_utc_secs + (time - prev_tai)
+    next_day = utc_secs > day_length
+
+    utc_days = np.where(next_day, prev_utc_days + 1, prev_utc_days)
+    utc_secs = np.where(next_day, utc_secs - day_length, utc_secs)
+    return utc_days, utc_secs
+
+
 class NetCDFWriter(metaclass=ABCMeta):
     """
     base class for writing output netCDF files
+
+    the records are buffered in columns of `buffer_size` records, which
+    are written to the file by one slice write per variable when they
+    are full, or when the writer is flushed or closed
+
+    if 'background' is enabled, the full buffers are written by a
+    background thread while the next records are buffered. At most
+    `MAX_PENDING_FLUSHES` buffers wait to be written, and the errors
+    of the background writes are raised by the next flush, or by close
+
+    if 'append' is enabled, an existing file written by the same kind
+    of writer is opened, and the records are written after its last one
     """
+    #: the default number of records buffered before they are written
+    DEFAULT_BUFFER_SIZE = 32
+    #: the maximum number of full buffers waiting to be written in the background
+    MAX_PENDING_FLUSHES = 2
+    #: the optional intermediate results of the processing chain (attributes
+    #: of SurfaceData) which are read by write_record, and so must be computed
+    SURFACE_INTERMEDIATES = frozenset()
+
+    Columns = Dict[str, Tuple[np.ndarray, np.ndarray]]
 
     class VariableDescriptor:
         """
@@ -85,19 +129,26 @@ class NetCDFWriter(metaclass=ABCMeta):
             """
             return self.attrs.copy()
 
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, buffer_size: int=DEFAULT_BUFFER_SIZE, storage: StorageProfile=None,
+                 background: bool=False, append: bool=False):
         """
         initialize the NetCDFWriter instance
 
         :param filename: the path of the file to write to
+        :param buffer_size: the number of records buffered before they are written
+        :param storage: the compression & chunking of the variables, none by default
+        :param background: if True, write the buffered records on a background thread
+        :param append: if True, open the existing file to append records to it
         """
 
         self._file_path = filename
+        self.append = append
 
         folder = os.path.dirname(filename)
         os.makedirs(folder, exist_ok=True)
 
-        self._root = nc.Dataset(filename, 'w', format="NETCDF4")
+        with NETCDF_LOCK:
+            self._root = nc.Dataset(filename, 'a' if append else 'w', format="NETCDF4")
 
         self._dimensions = OrderedDict()
         self._variables = OrderedDict()
@@ -106,19 +157,45 @@ class NetCDFWriter(metaclass=ABCMeta):
         self.variables = {}
         self.output_index = 0
 
+        # the buffered records: a (values, written) pair of arrays for
+        # each name, the first dimension of which is the record index
+        self.buffer_size = max(1, buffer_size)
+        self._columns = OrderedDict()  # type: NetCDFWriter.Columns
+        self._buffered_count = 0
+
+        # the buffers being written in the background, and those which
+        # have been written and can be re-used
+        if background:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._executor = None
+        self._pending_flushes = deque()  # type: Deque[Tuple[Future, NetCDFWriter.Columns]]
+        self._free_columns = []  # type: List[NetCDFWriter.Columns]
+
+        self.storage = storage if storage is not None else StorageProfile.DEFAULT
+
         # TODO (forman, 20160715): add standard metadata attributes here
         # see http://cfconventions.org/cf-conventions/v1.6.0/cf-conventions.html#_attributes
         # some of these attributes may be user-defined and put in a configuration file (CNF?):
         # e.g. 'title', 'institution', 'source', 'references', and 'comment'.
 
         # added by forman 20160715
-        self._root.software_name = 'dedop'
-        self._root.software_version = __version__
+        with NETCDF_LOCK:
+            self._root.software_name = 'dedop'
+            self._root.software_version = __version__
 
     @property
     def file_path(self):
         return self._file_path
 
+    @property
+    def is_open(self) -> bool:
+        """
+        whether the netCDF file is still open
+        """
+        with NETCDF_LOCK:
+            return self._root.isopen()
+
     def __enter__(self):
         """
         enables use of 'with' statements to ensure file
@@ -214,15 +291,26 @@ class NetCDFWriter(metaclass=ABCMeta):
 
     def open(self):
         """
-        create the dimensions & variables, and reset the record index
+        create the dimensions & variables, and reset the record index.
+        In the append mode, the dimensions & variables of the file are
+        used, and the record index is set to the number of its records.
         :return:
         """
-        self.create_all_dimensions()
-        self.create_all_variables()
-
-        self.output_index = 0
-
+        with NETCDF_LOCK:
+            if self.append:
+                self.open_all_dimensions()
+                self.open_all_variables()
+                record_count = max(
+                    (len(dim) for dim in self.dimensions.values() if dim.isunlimited()), default=0
+                )
+            else:
+                self.create_all_dimensions()
+                self.create_all_variables()
+                record_count = 0
 
+        self.output_index = record_count
+        self._columns.clear()
+        self._buffered_count = 0
 
     def create_all_dimensions(self, *only: Name) -> None:
         """
@@ -266,6 +354,33 @@ class NetCDFWriter(metaclass=ABCMeta):
                 # set attribute
                 setattr(self, var.name, var)
 
+    def open_all_dimensions(self) -> None:
+        """
+        gets all the dimensions specified in the class'
+        '_dimensions' field from the existing file
+        """
+        for dim_name in self._dimensions:
+            str_name = dim_name.value if isinstance(dim_name, Enum) else dim_name
+            if str_name not in self._root.dimensions:
+                raise ValueError('%s has no dimension "%s"' % (self.file_path, str_name))
+
+            dim = self._root.dimensions[str_name]
+            self.dimensions[dim_name] = dim
+            setattr(self, dim.name, dim)
+
+    def open_all_variables(self) -> None:
+        """
+        gets all the variables specified in the class'
+        '_variables' field from the existing file
+        """
+        for var_name in self._variables:
+            str_name = var_name.value if isinstance(var_name, Enum) else var_name
+            if str_name not in self._root.variables:
+                raise ValueError('%s has no variable "%s"' % (self.file_path, str_name))
+
+            var = self._root.variables[str_name]
+            setattr(self, var.name, var)
+
     def create_dimension(self, name: Name, size: int=None) -> nc.Dimension:
         """
         Add a new dimension to the netCDF file
@@ -304,11 +419,21 @@ class NetCDFWriter(metaclass=ABCMeta):
             self.dimensions[dim_name].name for
                 dim_name in variable_description.dimensions
         )
+        # the properties of the variable override those of the storage profile
+        dimension_sizes = tuple(
+            None if self.dimensions[dim_name].isunlimited() else len(self.dimensions[dim_name])
+            for dim_name in variable_description.dimensions
+        )
+        properties = self.storage.get_properties(
+            variable_description.data_type, dimension_sizes, self.buffer_size
+        )
+        properties.update(variable_description.get_properties())
+
         # create a new variable in the root document. The constructor
         # doesn't let us set attributes here, we have to do that below.
         var = self._root.createVariable(
             str_name, variable_description.data_type,
-            dimensions, **variable_description.get_properties()
+            dimensions, **properties
         )
         # get the dict of attributes
         attdict = variable_description.get_attributes()
@@ -334,9 +459,17 @@ class NetCDFWriter(metaclass=ABCMeta):
 
     def close(self) -> None:
         """
-        close the netCDF file
+        write the buffered records, and close the netCDF file
         """
-        self._root.close()
+        try:
+            self.flush()
+            self.wait_flushes()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            with NETCDF_LOCK:
+                self._root.close()
 
     def get_variable(self, varname: str) -> nc.Variable:
         return getattr(self, varname)
@@ -344,36 +477,199 @@ class NetCDFWriter(metaclass=ABCMeta):
     @abstractmethod
     def write_record(self, **record_values: Any) -> None:
         """
-        writes values to the output file
+        adds a record to the buffer, which is written to the file when
+        it is full. The names which are not variables of the file are
+        auxiliary columns, used by `derive_columns`; None values are
+        not written.
 
-        :param record_values:
+        :param record_values: the values of the record, by name
         """
-        for varname, value in record_values.items():
-            var = self.get_variable(varname)
-            ndims = len(var.shape)
+        index = self._buffered_count
 
+        for name, value in record_values.items():
             if value is None:
                 continue
+            values, written = self._get_column(name, value)
+            ndims = values.ndim
             try:
                 if ndims == 3:
                     dim_1, dim_2 = value.shape
-                    var[self.output_index, :dim_1, :dim_2] = value[:, :]
+                    values[index, :dim_1, :dim_2] = value[:, :]
+                    written[index, :dim_1, :dim_2] = True
                 elif ndims == 2:
-                    var[self.output_index, :len(value)] = value[:]
+                    values[index, :len(value)] = value[:]
+                    written[index, :len(value)] = True
                 elif ndims == 1:
-                    var[self.output_index] = value
+                    values[index] = value
+                    written[index] = True
                 else:
-                    raise WriteError("Number of dimensions not supported", value.shape)
+                    raise WriteError("Number of dimensions not supported", values.shape)
             except Exception as err:
                 raise WriteError(
                     "error while writing {} at index {}".format(
-                        varname, self.output_index
+                        name, self.output_index
                     ),
                     err
                 )
 
+        self._buffered_count += 1
         self.output_index += 1
 
+        if self._buffered_count >= self.buffer_size:
+            self.flush()
+
+    def derive_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        compute the values of variables from the buffered columns,
+        for all the buffered records at once. The default implementation
+        derives nothing.
+
+        :param columns: the buffered values, by name
+        :return: the values of the derived variables, by name
+        """
+        return {}
+
+    def flush(self) -> None:
+        """
+        write the buffered records to the file, with one slice write
+        per variable. In the background mode, the records are only
+        handed to the background thread.
+        """
+        # the errors of the background writes which have finished are raised first
+        while self._pending_flushes and self._pending_flushes[0][0].done():
+            self._wait_flush()
+
+        count = self._buffered_count
+        if not count:
+            return
+        start = self.output_index - count
+
+        columns = self._columns
+        self._buffered_count = 0
+
+        if self._executor is None:
+            self._write_columns(columns, start, count)
+            return
+
+        while len(self._pending_flushes) >= self.MAX_PENDING_FLUSHES:
+            self._wait_flush()
+
+        # the next records are buffered in other columns while these are written
+        self._columns = self._free_columns.pop() if self._free_columns else OrderedDict()
+        future = self._executor.submit(self._write_columns, columns, start, count)
+        self._pending_flushes.append((future, columns))
+
+    def sync(self) -> None:
+        """
+        write the buffered records, wait for the background writes,
+        and write the file to disk
+        """
+        self.flush()
+        self.wait_flushes()
+        with NETCDF_LOCK:
+            self._root.sync()
+
+    def wait_flushes(self) -> None:
+        """
+        wait for the background writes to finish, raising their errors
+        """
+        while self._pending_flushes:
+            self._wait_flush()
+
+    def _wait_flush(self) -> None:
+        future, columns = self._pending_flushes.popleft()
+        future.result()
+        self._free_columns.append(columns)
+
+    def _write_columns(self, columns: Columns, start: int, count: int) -> None:
+        derived = self.derive_columns(OrderedDict(
+            (name, values[:count]) for name, (values, _) in columns.items()
+        ))
+
+        with NETCDF_LOCK:
+            for name, (values, written) in columns.items():
+                if name in derived or name not in self._root.variables:
+                    continue
+                written = written[:count]
+                if not written.any():
+                    continue
+                values = values[:count]
+                if not written.all():
+                    # the values which were not written are left to the fill value
+                    values = np.ma.masked_array(values, mask=~written)
+                self._write_slice(name, start, values)
+
+            for name, values in derived.items():
+                self._write_slice(name, start, values)
+
+        for _, written in columns.values():
+            written[:count] = False
+
+    def _write_slice(self, name: str, start: int, values: np.ndarray) -> None:
+        try:
+            self.get_variable(name)[start:start + len(values), ...] = values
+        except Exception as err:
+            raise WriteError(
+                "error while writing {} at index {}".format(
+                    name, start
+                ),
+                err
+            )
+
+    def _get_column(self, name: str, value: Any) -> Tuple[np.ndarray, np.ndarray]:
+        column = self._columns.get(name)
+        if column is None:
+            # the variables are 64-bit floats or integers of at most 32 bits,
+            # the values of which are all exactly represented by 64-bit floats
+            if name in self._root.variables:
+                # the shape is read from the file, which may be written by the background thread
+                with NETCDF_LOCK:
+                    shape = self._root.variables[name].shape[1:]
+            else:
+                shape = np.shape(value)
+            shape = (self.buffer_size,) + tuple(shape)
+            column = np.empty(shape, dtype=np.float64), np.zeros(shape, dtype=np.bool_)
+            self._columns[name] = column
+        return column
+
+    def append_records(self, filename: str) -> int:
+        """
+        append the records of another file, written by the same type of
+        writer, to the output file. The values are copied without
+        being unpacked & packed again.
+
+        :param filename: the path of the file to copy the records from
+        :return: the number of records appended
+        """
+        self.flush()
+        self.wait_flushes()
+        count = 0
+
+        with NETCDF_LOCK, nc.Dataset(filename, 'r') as source:
+            for var_name, var in self._root.variables.items():
+                source_var = source.variables[var_name]
+                source_var.set_auto_maskandscale(False)
+
+                count = source_var.shape[0]
+                if not count:
+                    continue
+
+                var.set_auto_maskandscale(False)
+                try:
+                    var[self.output_index:self.output_index + count, ...] = source_var[...]
+                except Exception as err:
+                    raise WriteError(
+                        "error while appending {} at index {}".format(
+                            var_name, self.output_index
+                        ),
+                        err
+                    )
+                finally:
+                    var.set_auto_maskandscale(True)
+
+        self.output_index += count
+        return count
+
     def write_globals(self, **global_attrs) -> None:
         """
         write values of global attributes to the netCDF file
@@ -384,7 +680,8 @@ class NetCDFWriter(metaclass=ABCMeta):
     def write_global(self, global_name: str, value: str=None) -> None:
         if value is None:
             value = 'Not available'
-        self._root.setncattr(global_name, value)
+        with NETCDF_LOCK:
+            self._root.setncattr(global_name, value)
 
 
 class WriteError(Exception):
@@ -0,0 +1,101 @@
+"""
+
+This module defines how the variables of the output netCDF files are stored. The storage of each output file is
+selected by the ``l1b_storage_cnf`` and ``l1bs_storage_cnf`` parameters of the CNF, or by the ``--storage`` option of
+``dedop run`` (which overrides both):
+
+* ``none``: no compression, and the default chunks of netCDF (the default)
+* ``fast``: zlib level 1 & shuffle, with chunks of whole record flushes
+* ``compact``: zlib level 6 & shuffle, with chunks of whole record flushes
+
+The optional ``least_significant_digit_cnf`` parameter of the CNF also quantizes the floating point variables to that
+many decimal digits, which makes them compress much better, but is lossy. The variables which need all their digits
+(e.g. the times) are defined with ``least_significant_digit=None`` by the writers, which overrides the profile.
+
+"""
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from dedop.conf.enums import OutputStorage
+
+
+class StorageProfile:
+    """
+    the compression and the chunk shapes of the variables of an output file
+    """
+
+    #: the minimum size in bytes of a chunk, which is a whole number of record flushes
+    MIN_CHUNK_BYTES = 16 * 1024
+
+    def __init__(self, name: str, zlib: bool = False, complevel: int = 4, shuffle: bool = False,
+                 least_significant_digit: int = None, align_chunks: bool = False):
+        """
+        :param name: the name of the profile
+        :param zlib: whether the variables are compressed
+        :param complevel: the zlib compression level, from 1 (fastest) to 9 (smallest)
+        :param shuffle: whether the bytes of the values are shuffled before the compression
+        :param least_significant_digit: if not None, the floating point variables are quantized to this many digits
+        :param align_chunks: whether the chunks of the records dimension are whole record flushes
+        """
+        self.name = name
+        self.zlib = zlib
+        self.complevel = complevel
+        self.shuffle = shuffle
+        self.least_significant_digit = least_significant_digit
+        self.align_chunks = align_chunks
+
+    def get_properties(self, data_type: type, dimension_sizes: Sequence[Optional[int]],
+                       flush_records: int) -> Dict[str, Any]:
+        """
+        get the properties of a variable needed by the createVariable
+        method of a netCDF document
+
+        :param data_type: the data type of the variable
+        :param dimension_sizes: the sizes of the dimensions of the variable, None for the records dimension
+        :param flush_records: the number of records written at once
+        :return: dictionary of properties
+        """
+        props = {}
+        if self.zlib:
+            props.update(zlib=True, complevel=self.complevel, shuffle=self.shuffle)
+
+        if self.align_chunks and dimension_sizes:
+            record_bytes = np.dtype(data_type).itemsize
+            for size in dimension_sizes:
+                if size is not None:
+                    record_bytes *= size
+            flushes = max(1, self.MIN_CHUNK_BYTES // max(1, record_bytes * flush_records))
+            props['chunksizes'] = tuple(
+                flush_records * flushes if size is None else max(1, size) for size in dimension_sizes
+            )
+
+        if self.least_significant_digit is not None and np.dtype(data_type).kind == 'f':
+            props['least_significant_digit'] = self.least_significant_digit
+        return props
+
+    def __repr__(self):
+        return 'StorageProfile(%s)' % self.name
+
+
+StorageProfile.DEFAULT = StorageProfile(OutputStorage.none.value)
+
+
+def get_storage_profile(storage: OutputStorage = OutputStorage.none,
+                        least_significant_digit: int = None) -> StorageProfile:
+    """
+    get the storage profile of an output file
+
+    :param storage: the storage option
+    :param least_significant_digit: if not None, the floating point variables are quantized to this many digits
+    :return: the storage profile
+    """
+    if storage == OutputStorage.fast:
+        return StorageProfile(storage.value, zlib=True, complevel=1, shuffle=True,
+                              least_significant_digit=least_significant_digit, align_chunks=True)
+    if storage == OutputStorage.compact:
+        return StorageProfile(storage.value, zlib=True, complevel=6, shuffle=True,
+                              least_significant_digit=least_significant_digit, align_chunks=True)
+    if least_significant_digit is not None:
+        return StorageProfile(storage.value, least_significant_digit=least_significant_digit)
+    return StorageProfile.DEFAULT
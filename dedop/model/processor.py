@@ -2,6 +2,7 @@ import os.path
 import time
 from abc import ABCMeta, abstractmethod
 
+from dedop.model.exception import ProcessorException
 from dedop.util.monitor import Monitor
 
 
@@ -0,0 +1,196 @@
+"""
+
+This module runs a batch of processing jobs - each the processing of one L1A file with one DDP
+configuration - on a pool of processes.
+
+Example usage:::
+
+    jobs = [ProcessorJob(config_name, processor_kwargs, l1a_file) for l1a_file in l1a_files]
+    statuses = process_batch(jobs, processor_factory, max_workers=8, monitor=monitor)
+
+Each worker process creates its own processors with the *processor_factory*, which therefore must be picklable
+(e.g. a module-level function). The progress of the jobs is reported to child monitors of the given monitor, and
+cancelling the monitor cancels the jobs.
+
+"""
+import os.path
+import queue
+import signal
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import Manager
+from typing import Any, Callable, List, Sequence, Tuple
+
+from dedop.model.processor import BaseProcessor
+from dedop.util.monitor import Monitor
+
+#: A processing job: the processor is created by calling ``processor_factory(config_name, **processor_kwargs)``,
+#: and then processes the L1A file given by *input_file*.
+ProcessorJob = namedtuple('ProcessorJob', ['config_name', 'processor_kwargs', 'input_file'])
+
+# the last processor created by a worker process, re-used for the next job if it is for the same configuration
+_WORKER_PROCESSOR = None  # type: Tuple[Any, BaseProcessor]
+
+
+def process_batch(jobs: Sequence[ProcessorJob], processor_factory: Callable[..., BaseProcessor],
+                  max_workers: int = None, monitor: Monitor = Monitor.NULL, label: str = None) -> List[Any]:
+    """
+    Run the processing jobs on a pool of processes.
+
+    If a job fails, the jobs which have not started are cancelled, the running ones are
+    asked to stop, and the error is raised once they have.
+
+    :param jobs: the processing jobs
+    :param processor_factory: a picklable callable which creates a processor
+    :param max_workers: the number of processes, defaults to the number of CPUs
+    :param monitor: a progress monitor
+    :param label: the label of the progress monitor
+    :return: the values returned by the processors, in the order of the jobs
+    """
+    statuses = [None] * len(jobs)
+
+    with Manager() as manager:
+        messages = manager.Queue()
+        cancelled = manager.Event()
+
+        if label is None:
+            label = 'processing %s jobs' % len(jobs)
+
+        with monitor.starting(label, total_work=len(jobs)):
+            job_monitors = [monitor.child(1) for _ in jobs]
+            error = None
+
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(_run_job, processor_factory, job, index, messages, cancelled): index
+                    for index, job in enumerate(jobs)
+                }
+                pending = set(futures)
+
+                while pending:
+                    done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    _dispatch_messages(jobs, job_monitors, messages)
+
+                    if monitor.is_cancelled():
+                        cancelled.set()
+
+                    for future in done:
+                        if future.cancelled():
+                            continue
+                        if future.exception() is not None:
+                            if error is None:
+                                error = future.exception()
+                                cancelled.set()
+                                for other in pending:
+                                    other.cancel()
+                        else:
+                            statuses[futures[future]] = future.result()
+
+            _dispatch_messages(jobs, job_monitors, messages)
+
+    if error is not None:
+        raise error
+    return statuses
+
+
+def _dispatch_messages(jobs: Sequence[ProcessorJob], job_monitors: Sequence[Monitor], messages) -> None:
+    """
+    forward the progress messages of the workers to the monitors of their jobs
+    """
+    while True:
+        try:
+            index, kind, value, msg = messages.get_nowait()
+        except queue.Empty:
+            return
+
+        job_monitor = job_monitors[index]
+        if kind == 'start':
+            job = jobs[index]
+            label = '%s %s: %s' % (job.config_name, os.path.basename(job.input_file), msg)
+            job_monitor.start(label, total_work=value)
+        elif kind == 'progress':
+            job_monitor.progress(work=value, msg=msg)
+        else:
+            job_monitor.done()
+
+
+def _run_job(processor_factory: Callable[..., BaseProcessor], job: ProcessorJob, index: int,
+             messages, cancelled) -> Any:
+    """
+    run one job in a worker process
+    """
+    # a CTRL+C is handled by the monitor of the parent process
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    processor = _get_worker_processor(processor_factory, job)
+    return processor.process(job.input_file, monitor=_QueueMonitor(index, messages, cancelled))
+
+
+def _get_worker_processor(processor_factory: Callable[..., BaseProcessor], job: ProcessorJob) -> BaseProcessor:
+    """
+    get the processor of a worker process for a job. Only the last
+    processor is kept: it is re-used by the next job if that job is
+    for the same configuration, and replaced otherwise
+    """
+    global _WORKER_PROCESSOR
+
+    key = (processor_factory, job.config_name, tuple(sorted(job.processor_kwargs.items())))
+    if _WORKER_PROCESSOR is not None and _WORKER_PROCESSOR[0] == key:
+        return _WORKER_PROCESSOR[1]
+
+    # drop the previous processor first, it may hold on to large buffers
+    _WORKER_PROCESSOR = None
+    processor = processor_factory(job.config_name, **job.processor_kwargs)
+    _WORKER_PROCESSOR = (key, processor)
+    return processor
+
+
+class _QueueMonitor(Monitor):
+    """
+    A monitor which sends the progress of a job to the parent process.
+
+    To keep the number of messages low, the work is summed up and sent at
+    most every *interval* seconds, unless the message changes.
+    """
+
+    def __init__(self, index: int, messages, cancelled, interval: float = 0.25):
+        self._index = index
+        self._messages = messages
+        self._cancelled = cancelled
+        self._interval = interval
+        self._work = None
+        self._msg = None
+        self._last_time = 0.
+        self._is_cancelled = False
+        self._last_cancel_check = 0.
+
+    def start(self, label: str, total_work: float = None):
+        self._messages.put((self._index, 'start', total_work, label))
+        self._last_time = time.time()
+
+    def progress(self, work: float = None, msg: str = None):
+        if work is not None:
+            self._work = work if self._work is None else self._work + work
+
+        now = time.time()
+        if msg != self._msg or now - self._last_time >= self._interval:
+            self._send(msg)
+            self._last_time = now
+
+    def done(self):
+        if self._work is not None:
+            self._send(self._msg)
+        self._messages.put((self._index, 'done', None, None))
+
+    def is_cancelled(self) -> bool:
+        now = time.time()
+        if not self._is_cancelled and now - self._last_cancel_check >= self._interval:
+            self._is_cancelled = self._cancelled.is_set()
+            self._last_cancel_check = now
+        return self._is_cancelled
+
+    def _send(self, msg: str):
+        self._messages.put((self._index, 'progress', self._work, msg))
+        self._work = None
+        self._msg = msg
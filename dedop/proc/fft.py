@@ -0,0 +1,197 @@
+"""
+
+This module computes the FFTs of the processing chain with one of several libraries, selected by the
+``fft_backend_cnf`` parameter of the CNF, or by the ``DEDOP_FFT_BACKEND`` environment variable (which
+overrides the CNF):
+
+* ``numpy``: numpy.fft (the default)
+* ``scipy``: scipy.fft, on several threads (requires scipy >= 1.4)
+* ``pyfftw``: FFTW, through pyfftw, on several threads (requires pyfftw)
+
+The libraries other than numpy are only imported when they are selected. They use as many threads as there
+are CPUs, unless a number of threads is given: processes which run in parallel share the CPUs (see
+:func:`get_job_fft_threads`).
+
+The algorithms share one :class:`FFT` object per library, which keeps a plan for each kind, shape and
+dtype of transform it has computed. The shapes of the transforms are fixed for a whole run, so the plans
+are re-used for every burst & surface.
+
+"""
+import os
+from functools import partial
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from dedop.conf.enums import FFTBackend
+
+#: the environment variable which overrides the FFT library of the CNF
+FFT_BACKEND_ENV_VAR = 'DEDOP_FFT_BACKEND'
+
+
+class FFT:
+    """
+    The FFTs of one library. The default implementation uses numpy.fft.
+    """
+
+    def __init__(self, backend: FFTBackend = FFTBackend.numpy, threads: int = None):
+        """
+        :param backend: the library
+        :param threads: the number of threads of each transform, None for the number of CPUs
+                        (ignored by the libraries which only use one thread)
+        """
+        self.backend = backend
+        self.threads = threads or os.cpu_count()
+        self._plans = {}  # type: Dict[Tuple, Callable[[np.ndarray], np.ndarray]]
+
+    def fft(self, a: np.ndarray, n: int = None, axis: int = -1, norm: str = None) -> np.ndarray:
+        """
+        compute the one-dimensional discrete Fourier transform of an array
+
+        :param a: the input array
+        :param n: the length of the transformed axis (the input is zero-padded or cropped to it)
+        :param axis: the axis over which the FFT is computed
+        :param norm: the normalization mode, None or "ortho"
+        :return: the transformed array
+        """
+        a = np.asarray(a)
+        return self.get_plan('fft', a.shape, a.dtype, n, axis, norm)(a)
+
+    def ifft(self, a: np.ndarray, n: int = None, axis: int = -1, norm: str = None) -> np.ndarray:
+        """
+        compute the one-dimensional inverse discrete Fourier transform of an array
+
+        :param a: the input array
+        :param n: the length of the transformed axis (the input is zero-padded or cropped to it)
+        :param axis: the axis over which the inverse FFT is computed
+        :param norm: the normalization mode, None or "ortho"
+        :return: the transformed array
+        """
+        a = np.asarray(a)
+        return self.get_plan('ifft', a.shape, a.dtype, n, axis, norm)(a)
+
+    def get_plan(self, kind: str, shape: Tuple[int, ...], dtype: np.dtype, n: int, axis: int,
+                 norm: str) -> Callable[[np.ndarray], np.ndarray]:
+        """
+        get the plan of a transform, making it the first time it is needed
+
+        :param kind: the transform, 'fft' or 'ifft'
+        :param shape: the shape of the input arrays
+        :param dtype: the dtype of the input arrays
+        :param n: the length of the transformed axis
+        :param axis: the transformed axis
+        :param norm: the normalization mode
+        :return: a function which transforms an input array
+        """
+        key = (kind, shape, np.dtype(dtype), n, axis, norm)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._make_plan(kind, shape, np.dtype(dtype), n, axis, norm)
+            self._plans[key] = plan
+        return plan
+
+    @property
+    def plan_count(self) -> int:
+        """
+        the number of plans made
+        """
+        return len(self._plans)
+
+    def _make_plan(self, kind: str, shape: Tuple[int, ...], dtype: np.dtype, n: int, axis: int,
+                   norm: str) -> Callable[[np.ndarray], np.ndarray]:
+        # numpy keeps its own cache of the twiddle factors
+        return partial(getattr(np.fft, kind), n=n, axis=axis, norm=norm)
+
+    def __repr__(self):
+        return 'FFT(%s)' % self.backend.value
+
+
+class _ScipyFFT(FFT):
+    def __init__(self, threads: int = None):
+        super().__init__(FFTBackend.scipy, threads)
+        try:
+            import scipy.fft
+        except ImportError:
+            raise ValueError('the "scipy" FFT backend requires scipy 1.4 or newer')
+        self._fft = scipy.fft
+
+    def _make_plan(self, kind: str, shape: Tuple[int, ...], dtype: np.dtype, n: int, axis: int,
+                   norm: str) -> Callable[[np.ndarray], np.ndarray]:
+        # scipy keeps its own cache of the plans
+        return partial(getattr(self._fft, kind), n=n, axis=axis, norm=norm, workers=self.threads)
+
+
+class _PyFFTWFFT(FFT):
+    def __init__(self, threads: int = None):
+        super().__init__(FFTBackend.pyfftw, threads)
+        try:
+            import pyfftw
+            import pyfftw.builders
+        except ImportError:
+            raise ValueError('the "pyfftw" FFT backend requires pyfftw')
+        self._pyfftw = pyfftw
+
+    def _make_plan(self, kind: str, shape: Tuple[int, ...], dtype: np.dtype, n: int, axis: int,
+                   norm: str) -> Callable[[np.ndarray], np.ndarray]:
+        builder = getattr(self._pyfftw.builders, kind)
+        fftw = builder(self._pyfftw.empty_aligned(shape, dtype=dtype), n=n, axis=axis, norm=norm,
+                       threads=self.threads)
+
+        def plan(a: np.ndarray) -> np.ndarray:
+            # the output array of the plan is overwritten by its next
+            # call, so the result is copied
+            return fftw(a).copy()
+
+        return plan
+
+
+# the FFTs of each library & number of threads, shared by all the algorithms of a process
+_FFTS = {}  # type: Dict[Tuple[FFTBackend, int], FFT]
+
+
+def get_fft(backend: FFTBackend = FFTBackend.numpy, threads: int = None) -> FFT:
+    """
+    get the FFTs of a library. The library given in the DEDOP_FFT_BACKEND
+    environment variable is used instead, if it is set.
+
+    :param backend: the FFT library
+    :param threads: the number of threads of each transform, None for the number of CPUs
+    :return: the FFT object
+    """
+    env_backend = os.environ.get(FFT_BACKEND_ENV_VAR)
+    if env_backend:
+        try:
+            backend = FFTBackend(env_backend)
+        except ValueError:
+            raise ValueError('invalid value of %s: "%s", expected one of %s'
+                             % (FFT_BACKEND_ENV_VAR, env_backend, ', '.join(b.value for b in FFTBackend)))
+
+    if backend == FFTBackend.numpy:
+        # numpy.fft always uses a single thread
+        threads = None
+
+    key = (backend, threads)
+    fft = _FFTS.get(key)
+    if fft is None:
+        if backend == FFTBackend.scipy:
+            fft = _ScipyFFT(threads)
+        elif backend == FFTBackend.pyfftw:
+            fft = _PyFFTWFFT(threads)
+        else:
+            fft = FFT(backend, threads)
+        _FFTS[key] = fft
+    return fft
+
+
+def get_job_fft_threads(jobs: int, threads: int = None) -> int:
+    """
+    get the number of threads of the FFTs of each of several jobs
+    which run in parallel, so that together they use the CPUs (or
+    the given number of threads) without oversubscribing them
+
+    :param jobs: the number of jobs run in parallel, 0 for the number of CPUs
+    :param threads: the number of threads available, None for the number of CPUs
+    :return: the number of threads of each job, at least 1
+    """
+    jobs = jobs or os.cpu_count()
+    return max(1, (threads or os.cpu_count()) // jobs)
@@ -1,10 +1,8 @@
-from math import cos
 import numpy as np
 from dedop.conf import CharacterisationFile, ConstantsFile, ConfigurationFile
 from dedop.conf.enums import AzimuthWindowingMethod, AzimuthProcessingMethod
 from dedop.model import L1AProcessingData
 from dedop.util.parameter import Parameter
-from numpy.linalg import norm
 
 from ..base_algorithm import BaseAlgorithm
 
@@ -19,6 +17,14 @@ class AzimuthProcessingAlgorithm(BaseAlgorithm):
 
         self.beams_focused = None
 
+        # the pulse indices and the constant part of the beam angle
+        # phase are the same for every burst, so they are only
+        # computed once
+        self.pulse_indices = np.arange(self.chd.n_ku_pulses_burst)
+        self._phase_wavelength = None
+        self._phase_constant = None
+        self._azimuth_window = None
+
     def __call__(self, packet: L1AProcessingData, wavelength_ku: float) -> None:
         """
         Executes the azimuth processing algorithm
@@ -26,16 +32,21 @@ class AzimuthProcessingAlgorithm(BaseAlgorithm):
         :param packet: The L1AProcessingData instance
         :param wavelength_ku: The signal wavelength
         """
-        self.beams_focused = np.empty(
+        self.beams_focused = self.buffer_pool.empty(
             packet.waveform_cor_sar.shape,
             dtype=np.complex128
         )
 
-        window = self.construct_azimuth_window(
-            self.cnf.flag_azimuth_windowing_method,
-            width=self.cnf.azimuth_window_width
-        )
-        windowed_wfm = packet.waveform_cor_sar * window[:, np.newaxis]
+        if self.cnf.flag_azimuth_windowing_method == AzimuthWindowingMethod.disabled:
+            # the window would be all ones, so it does not need to be applied
+            windowed_wfm = packet.waveform_cor_sar
+        else:
+            if self._azimuth_window is None:
+                self._azimuth_window = self.construct_azimuth_window(
+                    self.cnf.flag_azimuth_windowing_method,
+                    width=self.cnf.azimuth_window_width
+                )
+            windowed_wfm = packet.waveform_cor_sar * self._azimuth_window[:, np.newaxis]
 
         # azimuth processing with approx. method
         if self.cnf.flag_azimuth_processing_method == AzimuthProcessingMethod.approximate:
@@ -121,25 +132,32 @@ class AzimuthProcessingAlgorithm(BaseAlgorithm):
         placed in the array position corresponding to the beam angle
         from which it was computed.
 
+        Only the central beam of each FFT is kept. After the shift,
+        that beam is the zero-frequency bin of the azimuth FFT, which is
+        the (orthonormally scaled) sum of the phase shifted pulses. All
+        beams are therefore computed in a single pass, as the product
+        of the (beams x pulses) phase matrix with the waveform.
+
         :param packet: L1AProcessingData
         :param windowed_wfm: the input waveform with windowing applied
         :param wavelength_ku: signal wavelength
         """
-        for beam_index, beam_angle_value in enumerate(packet.beam_angles_list):
-            # calculate the shape shift based upon the current
-            # beam angle
-            wfm_phase_shift = self.compute_phase_shift(
-                packet, windowed_wfm, beam_angle_value, wavelength_ku
-            )
-            # calculate the FFT of the current beam
-            wfm_fft_azimuth = self.compute_fft_azimuth_dimension(
-                wfm_phase_shift
-            )
-            # insert the central beam of the result into the same
-            # position as the beam angle in the beam angle/surface seen
-            # lists (this way the beams can be easily matched to surfaces)
-            self.beams_focused[beam_index, :] =\
-                wfm_fft_azimuth[self.chd.n_ku_pulses_burst // 2, :]
+        beam_angles = np.asarray(packet.beam_angles_list, dtype=np.float64)
+        n_beams = len(beam_angles)
+
+        if not n_beams:
+            return
+
+        # compute the phase shift of every pulse, for every beam angle
+        beam_angles_phase = self.compute_beam_angle_phase(
+            packet, beam_angles, wavelength_ku
+        )
+        # the central beam of each shifted FFT, placed into the same
+        # position as the beam angle in the beam angle/surface seen
+        # lists (this way the beams can be easily matched to surfaces)
+        self.beams_focused[:n_beams, :] = np.dot(
+            beam_angles_phase, windowed_wfm
+        ) / np.sqrt(self.chd.n_ku_pulses_burst)
 
     def compute_phase_shift(self, packet: L1AProcessingData, windowed_wfm: np.ndarray, beam_angle: float,
                             wavelength_ku: float) -> np.ndarray:
@@ -154,20 +172,31 @@ class AzimuthProcessingAlgorithm(BaseAlgorithm):
 
         :return waveform_phase_shift: the phase shifted waveform
         """
-        # create empty output array
-        waveform_phase_shift = np.empty(
-            windowed_wfm.shape,
-            dtype=np.complex128
+        beam_angle_phase = self.compute_beam_angle_phase(
+            packet, beam_angle, wavelength_ku
         )
+        return windowed_wfm * beam_angle_phase[:, np.newaxis]
+
+    def compute_beam_angle_phase(self, packet: L1AProcessingData, beam_angles, wavelength_ku: float) -> np.ndarray:
+        """
+        Computes the phase ramp along the pulses of the burst for
+        one beam angle, or for an array of beam angles
+
+        :param packet: the current L1AProcessingData
+        :param beam_angles: the beam angle, or an array of beam angles
+        :param wavelength_ku: the signal wavelength
+
+        :return: the phase of each pulse, with shape (pulses,) for a
+                 single beam angle or (beams, pulses) for an array
+        """
+        if wavelength_ku != self._phase_wavelength:
+            self._phase_wavelength = wavelength_ku
+            self._phase_constant = -2j * 2. * self.cst.pi / wavelength_ku
 
-        for pulse_index in range(self.chd.n_ku_pulses_burst):
-            beam_angle_phase = np.exp(-2j * 2. * self.cst.pi / wavelength_ku *
-                                      norm(packet.vel_sat_sar) * cos(beam_angle) *
-                                      packet.pri_sar_pre_dat * pulse_index)
-            waveform_phase_shift[pulse_index, :] = \
-                beam_angle_phase * windowed_wfm[pulse_index, :]
+        cos_beam_angles = np.cos(beam_angles)[..., np.newaxis]
 
-        return waveform_phase_shift
+        return np.exp(self._phase_constant * packet.vel_sat_sar_norm * cos_beam_angles *
+                      packet.pri_sar_pre_dat * self.pulse_indices)
 
     def compute_fft_azimuth_dimension(self, waveform_phase_shift: np.ndarray) -> np.ndarray:
         """
@@ -177,7 +206,7 @@ class AzimuthProcessingAlgorithm(BaseAlgorithm):
         """
         # compute the FFT along the azimuth dimension,
         # and apply orthogonal normalization to the result
-        out_fft = np.fft.fft(
+        out_fft = self.fft.fft(
             waveform_phase_shift,
             axis=0, norm='ortho'
         )
@@ -1,3 +1,4 @@
+from itertools import islice
 from math import acos
 
 import numpy as np
@@ -8,25 +9,92 @@ from dedop.model import SurfaceData, L1AProcessingData
 from ..base_algorithm import BaseAlgorithm
 
 
+class SurfacePositions:
+    """
+    the ECEF positions of a queue of surfaces, kept as an (N, 3) array
+    which follows the surfaces appended to & removed from the queue
+    """
+
+    def __init__(self, capacity: int=256):
+        """
+        :param capacity: the initial number of positions which can be stored
+        """
+        self._positions = np.empty((capacity, 3), dtype=np.float64)
+        self._start = 0
+        self._stop = 0
+
+    def __len__(self):
+        return self._stop - self._start
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        the (N, 3) array of the positions, in the order of the queue
+        """
+        return self._positions[self._start:self._stop]
+
+    def append(self, surface: SurfaceData) -> None:
+        """
+        add the position of a surface at the end of the queue
+        """
+        if self._stop == len(self._positions):
+            count = len(self)
+            if 2 * count > len(self._positions):
+                positions = np.empty((2 * len(self._positions), 3), dtype=np.float64)
+            else:
+                positions = self._positions
+            positions[:count] = self._positions[self._start:self._stop]
+            self._positions = positions
+            self._start = 0
+            self._stop = count
+
+        self._positions[self._stop] = surface.ecef_surf
+        self._stop += 1
+
+    def popleft(self) -> None:
+        """
+        remove the position at the head of the queue
+        """
+        if self._start == self._stop:
+            raise IndexError('pop from an empty queue of positions')
+        self._start += 1
+
+    def update(self, index: int, surface: SurfaceData) -> None:
+        """
+        update the position of a queued surface which has moved
+        """
+        self.array[index] = surface.ecef_surf
+
+
 class BeamAnglesAlgorithm(BaseAlgorithm):
     """
     Class for finding beam angles
     """
 
     def __call__(self, surface_locations: Sequence[SurfaceData], isp_record: L1AProcessingData,
-                 work_location: SurfaceData):
+                 work_location: SurfaceData, surfaces_ecef: np.ndarray=None):
         """
         compute the beam angles between the provided list of surfaces and the given burst
 
+        the beam angles of all the surfaces are computed at once. The
+        surfaces seen by the burst are the first contiguous run of
+        visible surfaces, of which only the last 'n_ku_pulses_burst'
+        are kept.
+
         :param surface_locations: list of surface locations
         :param isp_record: current burst
         :param work_location: working surface location
+        :param surfaces_ecef: optional (N, 3) array of the ECEF positions of the surfaces
         """
         self.work_location_seen = False
         self.beam_angles = []
         self.surfaces_seen = []
 
-        curr_location_seen = False
+        if not len(surface_locations):
+            return
+
+        if surfaces_ecef is None:
+            surfaces_ecef = self.get_surfaces_ecef(surface_locations)
 
         # the q angles define the max. & min. view angle for satellite
         # at the position of the burst
@@ -34,24 +102,83 @@ class BeamAnglesAlgorithm(BaseAlgorithm):
                      self.chd.freq_ku / isp_record.vel_sat_sar_norm)
         q_max = self.cst.pi - q_min
 
-        for surface in surface_locations:
-            prev_location_seen = curr_location_seen
+        beam_angles, locations_seen = self.compute_beam_angles(
+            surfaces_ecef, isp_record, q_min, q_max
+        )
 
-            beam_angle, curr_location_seen =\
-                self.compute_beam_angle(surface, isp_record, q_min, q_max)
-            if curr_location_seen:
-                self.beam_angles.append(beam_angle)
-                self.surfaces_seen.append(surface.surface_counter)
+        seen_indices = np.flatnonzero(locations_seen)
+        if not len(seen_indices):
+            return
 
-                if len(self.beam_angles) > self.chd.n_ku_pulses_burst:
-                    self.beam_angles.pop(0)
-                    self.surfaces_seen.pop(0)
-                if work_location == surface:
-                    self.work_location_seen = True
+        # the run of seen surfaces ends at the first surface which
+        # is not seen after the first one which is
+        first_seen = seen_indices[0]
+        run_length = np.argmin(locations_seen[first_seen:])
+        if not locations_seen[first_seen + run_length]:
+            last_seen = first_seen + run_length
+        else:
+            last_seen = len(locations_seen)
 
-            elif prev_location_seen:
+        # the working location is seen if it is in the run, even
+        # if it isn't within the retained beams
+        for surface in islice(surface_locations, first_seen, last_seen):
+            if surface is work_location:
+                self.work_location_seen = True
                 break
 
+        first_kept = max(first_seen, last_seen - self.chd.n_ku_pulses_burst)
+
+        self.beam_angles = beam_angles[first_kept:last_seen].tolist()
+        self.surfaces_seen = [
+            surface.surface_counter for surface in islice(surface_locations, first_kept, last_seen)
+        ]
+
+    @staticmethod
+    def get_surfaces_ecef(surface_locations: Sequence[SurfaceData]) -> np.ndarray:
+        """
+        get the ECEF positions of the surfaces as an (N, 3) array
+        """
+        return np.array(
+            [surface.ecef_surf for surface in surface_locations], dtype=np.float64
+        )
+
+    @staticmethod
+    def compute_beam_angles(surfaces_ecef: np.ndarray, isp_record: L1AProcessingData,
+                            q_min: float, q_max: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        computes the beam angles of several surfaces, and whether
+        each surface can be seen by the burst
+
+        :param surfaces_ecef: (N, 3) array of the ECEF positions of the surfaces
+        :param isp_record: current burst
+        :param q_min: min. view angle
+        :param q_max: max. view angle
+        :return: the beam angles and the visibility flags, each of shape (N,)
+        """
+        sat_x, sat_y, sat_z = isp_record.x_sar_sat, isp_record.y_sar_sat, isp_record.z_sar_sat
+        vel_x, vel_y, vel_z = isp_record.vel_sat_sar.A1
+
+        # create vectors from satellite position to the surfaces
+        surf_x = surfaces_ecef[:, 0] - sat_x
+        surf_y = surfaces_ecef[:, 1] - sat_y
+        surf_z = surfaces_ecef[:, 2] - sat_z
+
+        # compute angles between surface vectors and satellite's velocity
+        # vector
+        surf_dot_vel = surf_x * vel_x + surf_y * vel_y + surf_z * vel_z
+        surf_norm = np.sqrt(surf_x * surf_x + surf_y * surf_y + surf_z * surf_z)
+
+        beam_angles = np.arccos(
+            surf_dot_vel / (surf_norm * isp_record.vel_sat_sar_norm)
+        )
+
+        beam_angles_tangent = beam_angles - isp_record.doppler_angle_sar_sat
+        # if the angle is within the q-range, it can be seen
+        locations_seen = np.logical_and(
+            q_min <= beam_angles_tangent, beam_angles_tangent <= q_max
+        )
+        return beam_angles, locations_seen
+
     @staticmethod
     def compute_beam_angle(surface: SurfaceData, isp_record: L1AProcessingData,
                            q_min: float, q_max: float) -> Tuple[float, bool]:
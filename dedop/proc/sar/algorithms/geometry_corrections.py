@@ -1,9 +1,7 @@
 import numpy as np
 import numexpr as ne
-from numpy.linalg import norm
-from math import sqrt
 
-from dedop.model import SurfaceData, L1AProcessingData
+from dedop.model import SurfaceData
 from ..base_algorithm import BaseAlgorithm
 from dedop.util.parameter import Parameter
 
@@ -24,7 +22,7 @@ class GeometryCorrectionsAlgorithm(BaseAlgorithm):
         :param working_surface_location: working surface location
         :param wv_length_ku: Ku-band wavelength
         """
-        self.beams_geo_corr = np.zeros(
+        self.beams_geo_corr = self.buffer_pool.zeros(
             (self.n_looks_stack, self.chd.n_samples_sar),
             dtype=complex
         )
@@ -44,101 +42,118 @@ class GeometryCorrectionsAlgorithm(BaseAlgorithm):
         win_delay_ref = working_surface_location.win_delay_surf
 
         max_stack = min(working_surface_location.data_stack_size, self.n_looks_stack)
-        for beam_index in range(0, max_stack):
-
-            stack_burst = working_surface_location.stack_bursts[beam_index]
-
-            self.compute_doppler_correction(
-                working_surface_location, stack_burst, beam_index, wv_length_ku
-            )
-            self.compute_slant_range_correction(
-                working_surface_location, stack_burst, beam_index
-            )
-            self.compute_win_delay_misalignments_correction(
-                working_surface_location, stack_burst, beam_index, win_delay_ref
-            )
-            self.apply_corrections(
-                working_surface_location, stack_burst, beam_index
-            )
-
-    def compute_doppler_correction(self, working_surface_location: SurfaceData,
-                                   stack_burst: L1AProcessingData, beam_index: int, wv_length_ku: float) -> None:
+        if max_stack <= 0:
+            return
+
+        # gather the values of the stack bursts which are needed
+        stack_bursts = working_surface_location.stack_bursts[:max_stack]
+        sat_positions = np.array(
+            [(burst.x_sar_sat, burst.y_sar_sat, burst.z_sar_sat) for burst in stack_bursts],
+            dtype=np.float64
+        )
+        sat_velocities = np.array(
+            [burst.vel_sat_sar_norm for burst in stack_bursts], dtype=np.float64
+        )
+        win_delays = np.array(
+            [burst.win_delay_sar_ku for burst in stack_bursts], dtype=np.float64
+        )
+        t0_surf = np.asarray(working_surface_location.t0_surf[:max_stack], dtype=np.float64)
+
+        self.compute_doppler_corrections(
+            working_surface_location, sat_velocities, t0_surf, wv_length_ku
+        )
+        self.compute_slant_range_corrections(
+            working_surface_location, sat_positions, t0_surf
+        )
+        self.compute_win_delay_misalignments_corrections(
+            win_delays, t0_surf, win_delay_ref
+        )
+        self.apply_corrections(
+            working_surface_location, max_stack
+        )
+
+    def compute_doppler_corrections(self, working_surface_location: SurfaceData, sat_velocities: np.ndarray,
+                                    t0_surf: np.ndarray, wv_length_ku: float) -> None:
         """
-        compute the doppler correction for the surface location
+        compute the doppler corrections of the stack beams
 
         :param working_surface_location: surface location
-        :param stack_burst: current burst
-        :param beam_index: beam index
+        :param sat_velocities: the norm of the satellite velocity of each stack burst
+        :param t0_surf: the sampling time of each stack beam
         :param wv_length_ku: ku-band wavelength
         """
         if not self.flag_doppler_range_correction:
             return
 
+        max_stack = len(t0_surf)
+        beam_angles = np.asarray(working_surface_location.beam_angles_surf[:max_stack], dtype=np.float64)
+
         doppler_range = \
             -self.cst.c / wv_length_ku *\
-            norm(stack_burst.vel_sat_sar) *\
-            np.cos(working_surface_location.beam_angles_surf[beam_index]) *\
+            sat_velocities *\
+            np.cos(beam_angles) *\
             self.chd.pulse_length / self.chd.bw_ku
 
-        self.doppler_corrections[beam_index] =\
-            2 / self.cst.c * doppler_range / working_surface_location.t0_surf[beam_index]
+        self.doppler_corrections[:max_stack] =\
+            2 / self.cst.c * doppler_range / t0_surf
 
-    def compute_slant_range_correction(self, working_surface_location: SurfaceData,
-                                       stack_burst: L1AProcessingData, beam_index: int) -> None:
+    def compute_slant_range_corrections(self, working_surface_location: SurfaceData, sat_positions: np.ndarray,
+                                        t0_surf: np.ndarray) -> None:
         """
-        compute the slant range correction for the current surface location
+        compute the slant range corrections of the stack beams
 
         :param working_surface_location: current surface
-        :param stack_burst: current bursts
-        :param beam_index: beam index
+        :param sat_positions: (N, 3) array of the satellite position of each stack burst
+        :param t0_surf: the sampling time of each stack beam
         """
-        self.range_sat_surf[beam_index] = sqrt(
-            (stack_burst.x_sar_sat - working_surface_location.x_surf) ** 2 +
-            (stack_burst.y_sar_sat - working_surface_location.y_surf) ** 2 +
-            (stack_burst.z_sar_sat - working_surface_location.z_surf) ** 2
+        max_stack = len(t0_surf)
+
+        self.range_sat_surf[:max_stack] = np.sqrt(
+            (sat_positions[:, 0] - working_surface_location.x_surf) ** 2 +
+            (sat_positions[:, 1] - working_surface_location.y_surf) ** 2 +
+            (sat_positions[:, 2] - working_surface_location.z_surf) ** 2
         )
         if not self.flag_slant_range_correction:
             return
 
         slant_range_correction_time =\
             working_surface_location.win_delay_surf -\
-            self.range_sat_surf[beam_index] * 2. / self.cst.c
+            self.range_sat_surf[:max_stack] * 2. / self.cst.c
 
-        self.slant_range_corrections[beam_index] =\
-            slant_range_correction_time / working_surface_location.t0_surf[beam_index]
+        self.slant_range_corrections[:max_stack] =\
+            slant_range_correction_time / t0_surf
 
-    def compute_win_delay_misalignments_correction(self, working_surface_location: SurfaceData,
-                                                   stack_burst: L1AProcessingData, beam_index: int,
-                                                   win_delay_ref: float) -> None:
+    def compute_win_delay_misalignments_corrections(self, win_delays: np.ndarray, t0_surf: np.ndarray,
+                                                    win_delay_ref: float) -> None:
         """
-        window delay misalignment corrections
+        window delay misalignment corrections of the stack beams
 
-        :param working_surface_location: surface location
-        :param stack_burst: stack burst
-        :param beam_index: beam index
+        :param win_delays: the window delay of each stack burst
+        :param t0_surf: the sampling time of each stack beam
         :param win_delay_ref: reference window delay
         """
-        self.win_delay_corrections[beam_index] =\
-            -(win_delay_ref - stack_burst.win_delay_sar_ku) /\
-            working_surface_location.t0_surf[beam_index]
+        max_stack = len(t0_surf)
+
+        self.win_delay_corrections[:max_stack] =\
+            -(win_delay_ref - win_delays) / t0_surf
 
-    def apply_corrections(self, working_surface_location: SurfaceData, stack_burst: L1AProcessingData,
-                          beam_index: int) -> None:
+    def apply_corrections(self, working_surface_location: SurfaceData, max_stack: int) -> None:
         """
-        apply the computed corrections to the surface location
+        apply the computed corrections to the stack beams, as one
+        (beams x samples) phase ramp
 
         :param working_surface_location: surface location
-        :param stack_burst: stack burst
-        :param beam_index: beam index
+        :param max_stack: the number of stack beams
         """
-        shift = self.doppler_corrections[beam_index] +\
-                self.slant_range_corrections[beam_index] +\
-                self.win_delay_corrections[beam_index]
+        shift = self.doppler_corrections[:max_stack] +\
+                self.slant_range_corrections[:max_stack] +\
+                self.win_delay_corrections[:max_stack]
 
-        sample_correction_phase_constant = 2j * self.cst.pi / self.chd.n_samples_sar * shift
+        sample_correction_phase_constant = (2j * self.cst.pi / self.chd.n_samples_sar * shift)[:, np.newaxis]
         indicies = np.arange(self.chd.n_samples_sar)
-        beam = working_surface_location.beams_surf[beam_index, :]
+        beams = working_surface_location.beams_surf[:max_stack, :]
 
-        self.beams_geo_corr[beam_index, :] = ne.evaluate(
-            "exp(sample_correction_phase_constant * indicies) * beam"
+        ne.evaluate(
+            "exp(sample_correction_phase_constant * indicies) * beams",
+            out=self.beams_geo_corr[:max_stack, :]
         )
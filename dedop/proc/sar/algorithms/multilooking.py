@@ -1,6 +1,6 @@
 import numpy as np
 from scipy.optimize import curve_fit, OptimizeWarning
-from typing import List
+from typing import List, Optional
 import warnings
 
 from dedop.model import SurfaceData
@@ -42,6 +42,12 @@ def gauss_fit(x: np.ndarray, y: np.ndarray) -> List[float]:
 @Parameter("flag_avoid_zeros_in_multilooking", default_value=False)
 class MultilookingAlgorithm(BaseAlgorithm):
 
+    #: the arrays of the values of the beams between the start & stop beams,
+    #: which are only computed if they are in 'start_stop_outputs'
+    START_STOP_OUTPUTS = frozenset(
+        ('stack_mask_vector_start_stop', 'beam_angles_start_stop', 'look_angles_start_stop')
+    )
+
     def __init__(self, chd: CharacterisationFile, cst: ConstantsFile, cnf: ConfigurationFile):
         super().__init__(chd, cst, cnf)
 
@@ -66,6 +72,12 @@ class MultilookingAlgorithm(BaseAlgorithm):
         self.n_beams_start_stop = 0
         self.n_beams_multilooking = 0
 
+        self.start_stop_outputs = self.START_STOP_OUTPUTS
+
+        # the antenna pattern, as the (angles, weights) table to
+        # interpolate (built the first time it is needed)
+        self._antenna_pattern = None
+
     def __call__(self, working_surface_location: SurfaceData) -> None:
         """
         compute multilooking for the current surface
@@ -86,10 +98,6 @@ class MultilookingAlgorithm(BaseAlgorithm):
 
         :param working_surface_location: current surface
         """
-        beam_power = np.zeros((working_surface_location.data_stack_size,), dtype=np.float64)
-
-        max_beam_power = 0
-
         beam_angles_complementary = np.abs(
             self.cst.pi / 2. - working_surface_location.beam_angles_surf
         )
@@ -101,13 +109,11 @@ class MultilookingAlgorithm(BaseAlgorithm):
         beam_length = (self.chd.n_samples_sar // 2) * self.zp_fact_range
 
         max_stack = min(self.n_looks_stack, working_surface_location.data_stack_size)
-        for beam_index in range(max_stack):
-            beam_power[beam_index] =\
-                np.sum(
-                    working_surface_location.beams_masked[beam_index, :beam_length]
-                )
-            if beam_power[beam_index] > max_beam_power:
-                max_beam_power = beam_power[beam_index]
+        beam_power = np.zeros((working_surface_location.data_stack_size,), dtype=np.float64)
+        beam_power[:max_stack] = np.sum(
+            working_surface_location.beams_masked[:max_stack, :beam_length], axis=1
+        )
+        max_beam_power = max(0, np.max(beam_power))
 
         # only the central 249 beams will be used in the gaussian fitting:
         # the doppler-central beam, 124 to the left and 124 to the right.
@@ -117,20 +123,15 @@ class MultilookingAlgorithm(BaseAlgorithm):
                               0)
         # the parameters and arrays for the gaussian fitting
         n_samples_fitting = last_right_beam - first_left_beam + 1
+        center = slice(first_left_beam, last_right_beam + 1)
 
-        beam_power_center = np.empty((n_samples_fitting,), dtype=np.float64)
-        look_angles_surf_center = np.empty((n_samples_fitting,), dtype=np.float64)
-        pointing_angles_surf_center = np.empty((n_samples_fitting,), dtype=np.float64)
-
-        for beam_index in range(first_left_beam, last_right_beam+1):
-            rel_beam_index = beam_index - first_left_beam
-
-            beam_power_center[rel_beam_index] =\
-                beam_power[beam_index] / max_beam_power
-            look_angles_surf_center[rel_beam_index] =\
-                working_surface_location.look_angles_surf[beam_index]
-            pointing_angles_surf_center[rel_beam_index] =\
-                working_surface_location.pointing_angles_surf[beam_index]
+        beam_power_center = beam_power[center] / max_beam_power
+        look_angles_surf_center = np.asarray(
+            working_surface_location.look_angles_surf[center], dtype=np.float64
+        )
+        pointing_angles_surf_center = np.asarray(
+            working_surface_location.pointing_angles_surf[center], dtype=np.float64
+        )
 
         x = np.arange(n_samples_fitting)
 
@@ -153,17 +154,10 @@ class MultilookingAlgorithm(BaseAlgorithm):
             power_fitted
         )
 
-        self.stack_skewness = 0
-        self.stack_kurtosis = 0
+        power_fitted_norm = (power_fitted - power_fitted_mean) / power_fitted_std
 
-        for sample_index in range(n_samples_fitting):
-            self.stack_skewness +=\
-                ((power_fitted[sample_index] - power_fitted_mean) / power_fitted_std) ** 3
-            self.stack_kurtosis += \
-                ((power_fitted[sample_index] - power_fitted_mean) / power_fitted_std) ** 4
-
-        self.stack_skewness /= n_samples_fitting
-        self.stack_kurtosis = self.stack_kurtosis / n_samples_fitting - 3
+        self.stack_skewness = np.mean(power_fitted_norm ** 3)
+        self.stack_kurtosis = np.mean(power_fitted_norm ** 4) - 3
 
     def apply_antenna_weighting(self, surface: SurfaceData, apply_weighting: bool = True) -> np.ndarray:
         """
@@ -176,47 +170,37 @@ class MultilookingAlgorithm(BaseAlgorithm):
         if apply_weighting:
             # create array for weighted beams
             beams_masked_aw = np.empty(surface.beams_masked.shape, dtype=np.float64)
-            for beam_index in range(min(surface.data_stack_size, self.cnf.n_looks_stack)):
-                # get the angle at the current index
-                pointing_angle = surface.pointing_angles_surf[beam_index]
-                # get the weighting for the current angle
-                antenna_weight = self._select_weight_from_angle(pointing_angle)
-                # apply the weighting to the current beam
-                beams_masked_aw[beam_index, :] = surface.beams_masked[beam_index, :] * antenna_weight
+            max_stack = min(surface.data_stack_size, self.n_looks_stack)
+
+            # get the weighting for the angle of each beam
+            antenna_weights = self.get_antenna_weights(surface.pointing_angles_surf[:max_stack])
+            # apply the weighting to the beams
+            np.multiply(
+                surface.beams_masked[:max_stack, :], antenna_weights[:, np.newaxis],
+                out=beams_masked_aw[:max_stack, :]
+            )
         else:
             # just return the un-weighted beams
             beams_masked_aw = surface.beams_masked
 
         return beams_masked_aw
 
-    def _select_weight_from_angle(self, angle: float) -> float:
+    def get_antenna_weights(self, angles: np.ndarray) -> np.ndarray:
         """
-        returns the weighting for the provided pointing angle
+        returns the weighting for the provided pointing angles, linearly
+        interpolated between the angles of the antenna pattern (and the
+        first or last weight outside of them)
 
-        :param angle: pointing angle
+        :param angles: pointing angles
         """
-        if angle <= self.chd.antenna_angles[0]:
-            # angle is at or below min. angle
-            selected_weight = self.chd.antenna_weights[0]
-        elif angle >= self.chd.antenna_angles[-1]:
-            # angle is at or above max. angle
-            selected_weight = self.chd.antenna_weights[-1]
-        else:
-            # angle is within range - interpolate value
-            weight_index = (angle - self.chd.antenna_angles[0]) / self.chd.antenna_angles_spacing
-
-            index_left = int(weight_index)
-            index_right = index_left + 1
-
-            weight_left = self.chd.antenna_weights[index_left]
-            weight_right = self.chd.antenna_weights[index_right]
-
-            # get proportion between the left & right weights
-            alpha = (angle - weight_left) / self.chd.antenna_angles_spacing
-            # interpolate value
-            selected_weight = weight_left + alpha * (weight_right - weight_left)
+        if self._antenna_pattern is None:
+            self._antenna_pattern = (
+                np.asarray(self.chd.antenna_angles, dtype=np.float64),
+                np.asarray(self.chd.antenna_weights, dtype=np.float64)
+            )
+        antenna_angles, antenna_weights = self._antenna_pattern
 
-        return selected_weight
+        return np.interp(angles, antenna_angles, antenna_weights)
 
     def compute_multilooking(self, surface: SurfaceData, weighted_beams: np.ndarray) -> None:
         """
@@ -238,17 +222,14 @@ class MultilookingAlgorithm(BaseAlgorithm):
         self.sample_counter = np.zeros(
             (n_samples_max,), dtype=np.float64
         )
-        self.stack_mask_vector_start_stop = np.zeros(
-            (self.n_looks_stack,),
-            dtype=surface.stack_mask_vector.dtype
+        self.stack_mask_vector_start_stop = self._new_start_stop_output(
+            'stack_mask_vector_start_stop', surface.stack_mask_vector.dtype
         )
-        self.beam_angles_start_stop = np.zeros(
-            (self.n_looks_stack,),
-            dtype=surface.beam_angles_surf.dtype
+        self.beam_angles_start_stop = self._new_start_stop_output(
+            'beam_angles_start_stop', surface.beam_angles_surf.dtype
         )
-        self.look_angles_start_stop = np.zeros(
-            (self.n_looks_stack,),
-            dtype=surface.look_angles_surf.dtype
+        self.look_angles_start_stop = self._new_start_stop_output(
+            'look_angles_start_stop', surface.look_angles_surf.dtype
         )
 
         max_stack = min(self.n_looks_stack, surface.data_stack_size)
@@ -315,9 +296,17 @@ class MultilookingAlgorithm(BaseAlgorithm):
         self.stop_burst_index = \
             surface.stack_bursts[max_stack-1].source_seq_count
 
-        self.stack_mask_vector_start_stop[:self.n_beams_start_stop] =\
-            surface.stack_mask_vector[start_beam_index:stop_beam_index+1]
-        self.beam_angles_start_stop[:self.n_beams_start_stop] = \
-            surface.beam_angles_surf[start_beam_index:stop_beam_index+1]
-        self.look_angles_start_stop[:self.n_beams_start_stop] = \
-            surface.look_angles_surf[start_beam_index:stop_beam_index+1]
+        if self.stack_mask_vector_start_stop is not None:
+            self.stack_mask_vector_start_stop[:self.n_beams_start_stop] =\
+                surface.stack_mask_vector[start_beam_index:stop_beam_index+1]
+        if self.beam_angles_start_stop is not None:
+            self.beam_angles_start_stop[:self.n_beams_start_stop] = \
+                surface.beam_angles_surf[start_beam_index:stop_beam_index+1]
+        if self.look_angles_start_stop is not None:
+            self.look_angles_start_stop[:self.n_beams_start_stop] = \
+                surface.look_angles_surf[start_beam_index:stop_beam_index+1]
+
+    def _new_start_stop_output(self, name: str, dtype: np.dtype) -> Optional[np.ndarray]:
+        if name not in self.start_stop_outputs:
+            return None
+        return np.zeros((self.n_looks_stack,), dtype=dtype)
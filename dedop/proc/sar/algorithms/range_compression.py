@@ -1,47 +1,67 @@
 import numpy as np
-from numpy.fft import fft, fftshift
 
+from dedop.conf import CharacterisationFile, ConstantsFile, ConfigurationFile
 from dedop.model import SurfaceData
 from ..base_algorithm import BaseAlgorithm
 
+
 class RangeCompressionAlgorithm(BaseAlgorithm):
+    def __init__(self, chd: CharacterisationFile, cst: ConstantsFile, cnf: ConfigurationFile):
+        super().__init__(chd, cst, cnf)
+
+        # the complex beams are only needed by the L1B-S output
+        self.compute_iq = True
+
     def __call__(self, working_surface_location: SurfaceData) -> None:
         """
         compute range compression for teh current surface
 
+        the beams of the whole stack are transformed by one FFT along
+        the range dimension. The complex beams are only kept if
+        'compute_iq' is True.
+
         :param working_surface_location: current surface
         """
         # calc. size after zero padding factor applied
         padded_size = self.zp_fact_range * self.chd.n_samples_sar
         stack_size = min(working_surface_location.data_stack_size, self.n_looks_stack)
 
-        # create empty output arrays
-        self.beam_range_compr = np.empty(
-            (stack_size, padded_size),
+        # create empty output arrays (taken from full-size buffers, so that
+        # they can be re-used whatever the size of the stack)
+        self.beam_range_compr = self.buffer_pool.empty(
+            (self.n_looks_stack, padded_size),
             dtype=np.float64
-        )
-        self.beam_range_compr_iq = np.empty(
-            (stack_size, padded_size),
-            dtype=np.complex128
-        )
+        )[:stack_size]
+        if self.compute_iq:
+            self.beam_range_compr_iq = self.buffer_pool.empty(
+                (self.n_looks_stack, padded_size),
+                dtype=np.complex128
+            )[:stack_size]
+        else:
+            self.beam_range_compr_iq = None
 
-        for beam_index in range(stack_size):
+        if stack_size <= 0:
+            return
 
-            # calc. FFT with zero-padding & orthogonal scaling
-            beam_fft = fft(
-                working_surface_location.beams_geo_corr[beam_index, :],
-                n=padded_size, norm="ortho"
-            )
-            # apply shift
-            # NB: in some early L1A data products, the waveforms had had one-too-many or one-too-few FFT shifts applied.
-            #     this meant that the L1B/L1B-S files produced by DeDop would also have incorrectly swapped waveforms.
-            #     to prevent this problem, we previously disabled the following FFT shift, (with the line `beam_shift =
-            #     beam_fft`), however, current L1As do not have this problem, so we apply the shift as expected.
-            beam_shift = fftshift(beam_fft) # / padded_size
-
-            # store complex result
-            self.beam_range_compr_iq[beam_index, :] = beam_shift
+        # calc. FFT with zero-padding & orthogonal scaling
+        beams_fft = self.fft.fft(
+            working_surface_location.beams_geo_corr[:stack_size, :],
+            n=padded_size, axis=1, norm="ortho"
+        )
+        # apply shift, storing the complex result
+        # NB: in some early L1A data products, the waveforms had had one-too-many or one-too-few FFT shifts applied.
+        #     this meant that the L1B/L1B-S files produced by DeDop would also have incorrectly swapped waveforms.
+        #     to prevent this problem, we previously disabled the following FFT shift, (with the line `beam_shift =
+        #     beam_fft`), however, current L1As do not have this problem, so we apply the shift as expected.
+        shift = padded_size // 2
+        if self.compute_iq:
+            self.beam_range_compr_iq[:, shift:] = beams_fft[:, :padded_size - shift]
+            self.beam_range_compr_iq[:, :shift] = beams_fft[:, padded_size - shift:]
 
             # compute square modulus
-            self.beam_range_compr[beam_index, :] =\
-                np.abs(beam_shift) ** 2
+            np.abs(self.beam_range_compr_iq, out=self.beam_range_compr)
+        else:
+            # compute the modulus of the shifted halves directly
+            np.abs(beams_fft[:, :padded_size - shift], out=self.beam_range_compr[:, shift:])
+            np.abs(beams_fft[:, padded_size - shift:], out=self.beam_range_compr[:, :shift])
+        np.square(self.beam_range_compr, out=self.beam_range_compr)
@@ -1,11 +1,19 @@
-from math import sqrt, log10
 import numpy as np
 
+from dedop.conf import CharacterisationFile, ConstantsFile, ConfigurationFile
 from dedop.model import SurfaceData
 from ..base_algorithm import BaseAlgorithm
 
 
 class Sigma0ScalingFactorAlgorithm(BaseAlgorithm):
+    def __init__(self, chd: CharacterisationFile, cst: ConstantsFile, cnf: ConfigurationFile):
+        super().__init__(chd, cst, cnf)
+
+        # the sigma0 offset only depends on the CHD values and the
+        # wavelength, so it is only computed when the wavelength changes
+        self._offset_wavelength = None
+        self._sigma0_offset = None
+
     def __call__(self, working_surface_location: SurfaceData, wavelength_ku: float,
                  chirp_slope_ku: float) -> float:
         """
@@ -21,40 +29,51 @@ class Sigma0ScalingFactorAlgorithm(BaseAlgorithm):
         )
         max_stack = min(working_surface_location.data_stack_size, self.cnf.n_looks_stack)
 
-        sigma0_offset =\
-            10 * log10(64) +\
-            30 * log10(self.cst.pi) -\
-            10 * log10(self.chd.power_tx_ant_ku) -\
-            2 * self.chd.antenna_gain_ku -\
-            20 * log10(wavelength_ku) +\
-            self.chd.ratio_trc_ku +\
-            10 * log10(self.chd.n_ku_pulses_burst) # Np_PTR_SAR_Ku
-
-            
-        for beam_index in range(max_stack):
-            range_sat_surf = working_surface_location.range_sat_surf[beam_index]
-            burst = working_surface_location.stack_bursts[beam_index]
-
-            vel_sat_sar_norm =\
-                burst.vel_sat_sar_norm
-
-            pri_sar_pre_dat =\
-                burst.pri_sar_pre_dat
-
-            with np.errstate(divide='ignore'):
-                azimuth_distance =\
-                    (1 + range_sat_surf / self.cst.earth_radius) *\
-                    wavelength_ku * range_sat_surf / pri_sar_pre_dat /\
-                    (2 * vel_sat_sar_norm * self.chd.n_ku_pulses_burst)
-            range_distance = 2 * sqrt(
-                self.cst.c * range_sat_surf * self.chd.ptr_width *
-                self.cst.earth_radius / (self.cst.earth_radius + range_sat_surf)
-            )
-            surface_area = azimuth_distance * range_distance * 0.886
-
-            self.sigma0_scaling_factor_beam[beam_index] = -1. * (sigma0_offset +
-                40 * log10(range_sat_surf) - 10 * log10(surface_area) - #burst.agc_ku)
-                working_surface_location.closest_burst.agc_ku)
+        sigma0_offset = self.get_sigma0_offset(wavelength_ku)
+
+        # gather the values of the stack bursts which are needed
+        stack_bursts = working_surface_location.stack_bursts[:max_stack]
+        vel_sat_sar_norm = np.array(
+            [burst.vel_sat_sar_norm for burst in stack_bursts], dtype=np.float64
+        )
+        pri_sar_pre_dat = np.array(
+            [burst.pri_sar_pre_dat for burst in stack_bursts], dtype=np.float64
+        )
+        range_sat_surf = np.asarray(working_surface_location.range_sat_surf[:max_stack], dtype=np.float64)
+
+        with np.errstate(divide='ignore'):
+            azimuth_distance =\
+                (1 + range_sat_surf / self.cst.earth_radius) *\
+                wavelength_ku * range_sat_surf / pri_sar_pre_dat /\
+                (2 * vel_sat_sar_norm * self.chd.n_ku_pulses_burst)
+        range_distance = 2 * np.sqrt(
+            self.cst.c * range_sat_surf * self.chd.ptr_width *
+            self.cst.earth_radius / (self.cst.earth_radius + range_sat_surf)
+        )
+        surface_area = azimuth_distance * range_distance * 0.886
+
+        self.sigma0_scaling_factor_beam[:max_stack] = -1. * (sigma0_offset +
+            40 * np.log10(range_sat_surf) - 10 * np.log10(surface_area) - #burst.agc_ku)
+            working_surface_location.closest_burst.agc_ku)
 
         self.sigma0_scaling_factor = np.mean(self.sigma0_scaling_factor_beam)
         return self.sigma0_scaling_factor
+
+    def get_sigma0_offset(self, wavelength_ku: float) -> float:
+        """
+        returns the constant part of the sigma0 scaling factor
+
+        :param wavelength_ku: ku band wavelength
+        """
+        if wavelength_ku != self._offset_wavelength:
+            self._offset_wavelength = wavelength_ku
+            self._sigma0_offset =\
+                10 * np.log10(64) +\
+                30 * np.log10(self.cst.pi) -\
+                10 * np.log10(self.chd.power_tx_ant_ku) -\
+                2 * self.chd.antenna_gain_ku -\
+                20 * np.log10(wavelength_ku) +\
+                self.chd.ratio_trc_ku +\
+                10 * np.log10(self.chd.n_ku_pulses_burst) # Np_PTR_SAR_Ku
+
+        return self._sigma0_offset
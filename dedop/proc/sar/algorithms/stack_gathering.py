@@ -75,7 +75,7 @@ class StackGatheringAlgorithm(BaseAlgorithm):
         self.stack_bursts = np.zeros(
             (self.n_looks_stack,), dtype=object
         )
-        self.beams_surf = np.zeros(
+        self.beams_surf = self.buffer_pool.zeros(
             (self.n_looks_stack, self.chd.n_samples_sar), dtype=np.complex128
         )
         self.beam_angles_surf = np.zeros(
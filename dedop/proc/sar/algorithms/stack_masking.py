@@ -1,6 +1,7 @@
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
 
+from dedop.conf import CharacterisationFile, ConstantsFile, ConfigurationFile
 from dedop.model import SurfaceData
 from ..base_algorithm import BaseAlgorithm
 from ....util.parameter import Parameter
@@ -9,9 +10,17 @@ from ....util.parameter import Parameter
 @Parameter("flag_stack_masking", data_type=bool)
 class StackMaskingAlgorithm(BaseAlgorithm):
 
+    def __init__(self, chd: CharacterisationFile, cst: ConstantsFile, cnf: ConfigurationFile):
+        super().__init__(chd, cst, cnf)
+
+        # the stack mask is only needed after the masking by the
+        # multilooking which avoids the zeros of the masked beams
+        self.keep_mask = True
+
     def __call__(self, working_surface_location: SurfaceData) -> None:
         """
-        apply stack masking algorithm
+        apply stack masking algorithm. The (beams x samples) stack mask
+        is only kept if 'keep_mask' is True, otherwise it is None.
 
         :param working_surface_location: current surface location
         :return:
@@ -23,11 +32,25 @@ class StackMaskingAlgorithm(BaseAlgorithm):
             angle_mask = self.compute_angle_mask(working_surface_location)
 
             stack_mask, stack_mask_vector = self.combine_masks(
-                geom_mask, ambig_mask, angle_mask
+                geom_mask, ambig_mask, angle_mask,
+                out=self.buffer_pool.empty(geom_mask.shape, dtype=np.bool_)
             )
-            self.beams_masked = self.apply_mask(working_surface_location, stack_mask)
+            self.buffer_pool.release(geom_mask, ambig_mask, angle_mask)
+
+            beams_range_compr = working_surface_location.beams_range_compr
+            beams_masked = self.buffer_pool.empty(
+                (self.n_looks_stack, beams_range_compr.shape[1]), dtype=np.float64
+            )[:len(beams_range_compr)]
+            self.beams_masked = self.apply_mask(working_surface_location, stack_mask, out=beams_masked)
+
+            if not self.keep_mask:
+                self.buffer_pool.release(stack_mask)
+                stack_mask = None
         else:
-            stack_mask, stack_mask_vector = self.default_mask()
+            if self.keep_mask:
+                stack_mask, stack_mask_vector = self.default_mask()
+            else:
+                stack_mask, stack_mask_vector = None, self.default_mask_vector()
             self.beams_masked = working_surface_location.beams_range_compr
 
         self.stack_mask_vector = stack_mask_vector
@@ -35,128 +58,143 @@ class StackMaskingAlgorithm(BaseAlgorithm):
 
     def default_mask(self) -> Tuple[np.ndarray, np.ndarray]:
         """
-        returns an empty (all 1s) mask and corresponding mask vector
+        returns an empty (all True) mask and corresponding mask vector
         """
         beam_size = self.chd.n_samples_sar * self.zp_fact_range
-        mask = np.ones(
+        mask = self.buffer_pool.empty(
             (self.n_looks_stack, beam_size),
-            dtype=np.float64
+            dtype=np.bool_
         )
+        mask.fill(True)
+
+        return mask, self.default_mask_vector()
+
+    def default_mask_vector(self) -> np.ndarray:
+        """
+        returns the mask vector of an empty (all True) mask
+        """
+        beam_size = self.chd.n_samples_sar * self.zp_fact_range
         mask_vector = np.ones(
             (self.n_looks_stack,),
             dtype=np.float64
         ) * (beam_size - 1)
 
-        return mask, mask_vector
+        return mask_vector
 
     def compute_geometry_mask(self, working_surface_location: SurfaceData) -> np.ndarray:
         """
-        create the geometry mask
+        create the geometry mask: each beam is valid between a start
+        and an end sample
 
         :param working_surface_location: current surface
-        :return: geometry mask
+        :return: geometry mask, as a boolean (beams x samples) array
         """
-        geom_mask = np.zeros(
+        geom_mask = self.buffer_pool.empty(
             (self.n_looks_stack, self.chd.n_samples_sar * self.zp_fact_range),
-            dtype=np.float64
+            dtype=np.bool_
         )
         max_stack = min(working_surface_location.data_stack_size, self.n_looks_stack)
-        for beam_index in range(max_stack):
-            shift = working_surface_location.doppler_corrections[beam_index] +\
-                    working_surface_location.slant_range_corrections[beam_index] +\
-                    working_surface_location.win_delay_corrections[beam_index]
-
-            shift_coarse = np.round(shift)
 
-            if shift_coarse > 0:
-                start = shift_coarse * self.zp_fact_range
-                end = self.chd.n_samples_sar * self.zp_fact_range
+        shift = np.asarray(working_surface_location.doppler_corrections[:max_stack]) +\
+            np.asarray(working_surface_location.slant_range_corrections[:max_stack]) +\
+            np.asarray(working_surface_location.win_delay_corrections[:max_stack])
+        shift_coarse = np.round(shift)
+
+        # the range of valid samples of each beam
+        positive = shift_coarse > 0
+        start = np.where(positive, shift_coarse * self.zp_fact_range, 0)
+        end = np.where(
+            positive,
+            self.chd.n_samples_sar * self.zp_fact_range,
+            (self.chd.n_samples_sar - np.abs(shift_coarse)) * self.zp_fact_range
+        )
 
-            else:
-                start = 0
-                end = (self.chd.n_samples_sar - abs(shift_coarse)) * self.zp_fact_range
-            if start < end:
-                geom_mask[beam_index, int(start):int(end)] = 1
+        samples = np.arange(geom_mask.shape[1])
+        np.logical_and(
+            samples >= start[:, np.newaxis],
+            samples < end[:, np.newaxis],
+            out=geom_mask[:max_stack, :]
+        )
+        geom_mask[max_stack:, :] = False
 
         return geom_mask
 
-    def compute_ambiguity_mask(self, working_surface_location: SurfaceData) -> np.ndarray:
+    def compute_ambiguity_mask(self, working_surface_location: SurfaceData) -> Optional[np.ndarray]:
         """
         create the ambiguity mask (TODO: not yet implemented)
 
         :param working_surface_location: current surface
-        :return: ambiguity mask
+        :return: ambiguity mask, or None while it is all ones
         """
-        ambi_mask = np.zeros(
-            (self.n_looks_stack, self.chd.n_samples_sar * self.zp_fact_range),
-            dtype=np.float64
-        )
         # TODO: to be defined
-        ambi_mask[:, :] = 1
-
-        return ambi_mask
+        return None
 
     def compute_angle_mask(self, working_surface_location: SurfaceData) -> np.ndarray:
         """
-        create the look angle mask
+        create the look angle mask. A beam is either valid or not
+        for all samples, so the mask has one column, which
+        broadcasts against the samples
+
+        :param working_surface_location: current surface
+        :return: look angle mask, as a boolean (beams x 1) array
         """
-        angle_mask = np.ones(
-            (self.n_looks_stack, self.chd.n_samples_sar * self.zp_fact_range),
-            dtype=np.float64
-        )
+        angle_mask = self.buffer_pool.empty((self.n_looks_stack, 1), dtype=np.bool_)
+        angle_mask.fill(True)
         if self.chd.look_angle_mask_min is None or\
            self.chd.look_angle_mask_max is None:
             return angle_mask
 
         max_stack = min(working_surface_location.data_stack_size, self.n_looks_stack)
-        for beam_index in range(max_stack):
+        look_angles = np.asarray(working_surface_location.look_angles_surf[:max_stack])
 
-            look_angle = working_surface_location.look_angles_surf[beam_index]
-            angle_mask[beam_index, :] = (self.chd.look_angle_mask_min < look_angle < self.chd.look_angle_mask_max)
+        in_range = (self.chd.look_angle_mask_min < look_angles) & (look_angles < self.chd.look_angle_mask_max)
+        angle_mask[:max_stack, 0] = in_range
 
         return angle_mask
 
     @staticmethod
-    def combine_masks(geom_mask: np.ndarray, ambig_mask: np.ndarray, angle_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        stack_size, beam_size = geom_mask.shape
-        stack_mask = np.zeros((stack_size, beam_size), dtype=np.float64)
-        stack_mask_vector = np.zeros((stack_size,), dtype=np.float64)
-
-        for beam_index in range(stack_size):
-            stack_mask[beam_index, :] = geom_mask[beam_index, :] * ambig_mask[beam_index, :] *\
-                                        angle_mask[beam_index, :]
+    def combine_masks(geom_mask: np.ndarray, ambig_mask: Optional[np.ndarray], angle_mask: np.ndarray,
+                      out: np.ndarray=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        combine the masks, and find the start of the trailing zeros of
+        each row of the combined mask (or the last index of the row if it
+        ends with a 1, or 0 if it has no 1s)
+
+        :param geom_mask: the geometry mask
+        :param ambig_mask: the ambiguity mask, or None if it is all ones
+        :param angle_mask: the look angle mask (which may have one column)
+        :param out: the boolean array for the combined mask
+        :return: the combined (boolean) mask, and the stack mask vector
+        """
+        stack_mask = np.logical_and(geom_mask, angle_mask, out=out)
+        if ambig_mask is not None:
+            np.logical_and(stack_mask, ambig_mask, out=stack_mask)
 
-            # now we must find the start position of any trailing
-            # zeros in this row of the mask. This index will be
-            # stored in the stack_mask_vector
+        beam_size = stack_mask.shape[1]
 
-            if stack_mask[beam_index, -1] == 1.:
-                # check if the right-most value of the mask is a 1.
-                # if so, then we don't need to search backwards, and
-                # instead we store the largest index of the row.
+        # the index of the last one of each row
+        last_one = beam_size - 1 - np.argmax(stack_mask[:, ::-1], axis=1)
 
-                stack_mask_vector[beam_index] = beam_size - 1
-            else:
-                # if there's at least one trailing zero, we need
-                # to search backwards until we find the first '1'.
-                # This gives us the starting index of the trailing
-                # zeros
-
-                # get a reversed view of the row of the mask
-                backwards = np.flipud(stack_mask[beam_index, :])
-                # search forwards through the reversed view
-                for i, value in enumerate(backwards):
-                    # if we've found a one, then the store the previous
-                    # index.
-                    if value == 1.:
-                        stack_mask_vector[beam_index] = beam_size - i
-                        break
+        stack_mask_vector = np.where(last_one == beam_size - 1, last_one, last_one + 1).astype(np.float64)
+        stack_mask_vector[~stack_mask.any(axis=1)] = 0.
 
         return stack_mask, stack_mask_vector
 
     @staticmethod
-    def apply_mask(working_surface_location: SurfaceData, stack_mask: np.ndarray) -> np.ndarray:
-        output = working_surface_location.beams_range_compr *\
-                 stack_mask[:working_surface_location.data_stack_size, :]
+    def apply_mask(working_surface_location: SurfaceData, stack_mask: np.ndarray,
+                   out: np.ndarray=None) -> np.ndarray:
+        """
+        apply the (boolean) stack mask to the range compressed beams
+
+        :param working_surface_location: current surface
+        :param stack_mask: the stack mask
+        :param out: the array for the masked beams
+        :return: the masked beams
+        """
+        output = np.multiply(
+            working_surface_location.beams_range_compr,
+            stack_mask[:working_surface_location.data_stack_size, :],
+            out=out
+        )
 
         return output
@@ -1,9 +1,13 @@
+from ...util.buffer_pool import BufferPool
 from ...util.parameter import Parameter
 from ...conf import ConstantsFile, CharacterisationFile, ConfigurationFile
+from ...conf.enums import FFTBackend
+from ..fft import get_fft
 
 
 @Parameter('n_looks_stack', data_type=int)
 @Parameter('zp_fact_range', data_type=int)
+@Parameter('fft_backend', default_value=FFTBackend.numpy)
 class BaseAlgorithm:
     """
     The base class from which all other algorithm classes
@@ -24,8 +28,14 @@ class BaseAlgorithm:
         self.cst = cst
         self.cnf = cnf
 
+        # the pool from which the large per-surface arrays are taken
+        self.buffer_pool = BufferPool.NULL
+
         self.collect_parameter_values()
 
+        # the FFTs, shared by all algorithms using the same library
+        self.fft = get_fft(self.fft_backend)
+
     def collect_parameter_values(self) -> None:
         """
         set CNF parameter values
@@ -0,0 +1,137 @@
+"""
+
+This module records the checkpoints of long L1B processing runs, from which an interrupted run can be resumed.
+
+A checkpoint is a small JSON file written next to the L1B output each time a given number of L1B records have been
+written (see the ``--checkpoint-interval`` option of ``dedop run``), once the records are on disk. It holds the
+number of records of the output files, and where to restart the processing so that the following surfaces are
+output as if the run had not been interrupted: like a segment (see dedop.proc.sar.segments), the processing is
+restarted with the surface found 'margin' surfaces before the next output surface (or with the first surface of
+its stretch), at the L1A record which found it, so that the queues of surfaces & bursts are rebuilt by replaying
+a bounded window of bursts.
+
+A resumed run (``dedop run --resume``) re-opens the outputs in append mode, and overwrites the records written after
+the checkpoint. The checkpoint is removed once the run has completed.
+
+"""
+import hashlib
+import json
+import os
+from collections import deque, namedtuple
+from typing import Any, Dict, Optional
+
+#: A checkpoint of an L1B processing run.
+#:
+#: * *l1a_file*: the path of the L1A file
+#: * *config_digest*: the digest of the CNF, CST & CHD files (see get_config_digest)
+#: * *start*: the index of the L1A record which restarts the processing
+#: * *surface_start*: the counter of the surface found by that record
+#: * *output_start*: the counter of the next surface to output
+#: * *seed*: a tuple of the (key, value) pairs of the location of that surface
+#: * *l1b_records*, *l1bs_records*: the number of records of the outputs (None if there is no L1B-S output)
+Checkpoint = namedtuple('Checkpoint', ['l1a_file', 'config_digest', 'start', 'surface_start', 'output_start',
+                                       'seed', 'l1b_records', 'l1bs_records'])
+
+# a surface found by the processor
+_SurfaceInfo = namedtuple('_SurfaceInfo', ['record', 'surface_counter', 'data'])
+
+
+class SurfaceHistory:
+    """
+    the last surfaces found in the current stretch of the L1A
+    file, from which the processing can be restarted
+    """
+
+    def __init__(self, margin: int):
+        """
+        :param margin: the number of surfaces processed before the output surfaces of a restarted run
+        """
+        self.margin = margin
+        # the processor holds about 'margin' surfaces ahead of the one it outputs
+        self._surfaces = deque(maxlen=2 * margin + 1)
+        self._starts_stretch = False
+
+    def add(self, record: int, surface_counter: int, data: Dict[str, Any], starts_stretch: bool) -> None:
+        """
+        record a new surface
+
+        :param record: the index of the L1A record which found the surface
+        :param surface_counter: the counter of the surface
+        :param data: the location of the surface
+        :param starts_stretch: whether the surface is the first one of a gap-free stretch
+        """
+        if starts_stretch or not self._surfaces:
+            self._surfaces.clear()
+            self._starts_stretch = starts_stretch
+        elif len(self._surfaces) == self._surfaces.maxlen:
+            # the first surface of the stretch is dropped
+            self._starts_stretch = False
+        self._surfaces.append(_SurfaceInfo(record, surface_counter, tuple(data.items())))
+
+    def get_restart(self, output_start: int) -> Optional[_SurfaceInfo]:
+        """
+        get the surface which restarts the processing before a surface
+        is output, if it is known
+
+        :param output_start: the counter of the next surface to output
+        :return: the surface, or None
+        """
+        if not self._surfaces:
+            return None
+        first = self._surfaces[0]
+        restart_counter = output_start - self.margin
+        if restart_counter < first.surface_counter:
+            return first if self._starts_stretch else None
+        if restart_counter - first.surface_counter >= len(self._surfaces):
+            return None
+        return self._surfaces[restart_counter - first.surface_counter]
+
+
+def get_config_digest(*config_files: str) -> str:
+    """
+    get a digest of the contents of the configuration files
+    """
+    digest = hashlib.sha1()
+    for config_file in config_files:
+        with open(config_file, 'rb') as fp:
+            digest.update(fp.read())
+    return digest.hexdigest()
+
+
+def write_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """
+    write a checkpoint, replacing the previous one at once
+
+    :param path: the path of the JSON file
+    :param checkpoint: the checkpoint
+    """
+    values = checkpoint._asdict()
+    values['seed'] = [[key, _to_json(value)] for key, value in checkpoint.seed]
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as fp:
+        json.dump(values, fp, indent=2)
+    os.replace(temp_path, path)
+
+
+def read_checkpoint(path: str) -> Optional[Checkpoint]:
+    """
+    read a checkpoint
+
+    :param path: the path of the JSON file
+    :return: the checkpoint, or None if there is no such file
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as fp:
+        values = json.load(fp)
+    values['seed'] = tuple((key, value) for key, value in values['seed'])
+    return Checkpoint(**values)
+
+
+def _to_json(value: Any) -> Any:
+    # the numpy scalars of the surface locations are converted to the
+    # Python int & float values, which are written without loss
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
@@ -1,21 +1,33 @@
 import datetime
 import os
+import tempfile
 import time
-from typing import Optional, Sequence, Dict, Any, List
+from collections import deque
+from typing import Optional, Sequence, Dict, Any, Deque, Tuple
+import numpy as np
 from netCDF4 import getlibversion
 
 from dedop.conf import CharacterisationFile, ConstantsFile, ConfigurationFile
-from dedop.conf.enums import OutputFormat
+from dedop.conf.enums import OutputFormat, OutputStorage
 from dedop.data.input.l1a import L1ADataset
 from dedop.data.output import L1BSWriter, L1BWriter, L1BWriterExtended
+from dedop.data.output.storage import get_storage_profile
 from dedop.model import SurfaceData, L1AProcessingData
+from dedop.model.exception import ProcessorException
 from dedop.model.processor import BaseProcessor
+from dedop.proc.batch import ProcessorJob, process_batch
+from dedop.proc.fft import get_fft, get_job_fft_threads
+from dedop.util.buffer_pool import BufferPool
 from dedop.util.monitor import Monitor
+from dedop.util.profiler import Profiler
 from dedop.util.time import iso_format
 from dedop.version import __version__
 
 from .algorithms import *
+from .algorithms.beam_angles import SurfacePositions
 from .cal import *
+from .checkpoint import Checkpoint, SurfaceHistory, get_config_digest, read_checkpoint, write_checkpoint
+from .segments import Segment, plan_segments
 
 
 class L1BProcessor(BaseProcessor):
@@ -24,23 +36,58 @@ class L1BProcessor(BaseProcessor):
     """
 
     @property
-    def surf_locs(self) -> List[SurfaceData]:
+    def surf_locs(self) -> Deque[SurfaceData]:
         """
         the queue of currently working Surface Locations
         """
         return self._surfaces
 
     @property
-    def source_isps(self) -> List[L1AProcessingData]:
+    def source_isps(self) -> Deque[L1AProcessingData]:
         """
         the queue of processing L1A Packets
         """
         return self._packets
 
     def __init__(self, name: str, cnf_file: str, cst_file: str, chd_file: str, out_path: str,
-                 skip_l1bs: bool = True):
+                 skip_l1bs: bool = True, prefetch: bool = True, profile: bool = False,
+                 profile_memory: bool = False, segment_jobs: int = 1, segment: Segment = None,
+                 storage: OutputStorage = None, async_output: bool = False, checkpoint_interval: int = 0,
+                 resume: bool = False, fft_threads: int = None):
         """
         initialise the processor
+
+        if 'prefetch' is True, the next chunk of L1A records is read
+        in the background while the current one is being processed
+
+        if 'profile' is True, the time & number of calls of each stage
+        of the processing chain are recorded, and written to a JSON file
+        next to the L1B output. If 'profile_memory' is True, the memory
+        allocated by each stage is also recorded (this is much slower)
+
+        if 'segment_jobs' is greater than 1, the L1A file is split into
+        segments (see dedop.proc.sar.segments) which are processed on
+        that many processes, and the outputs are merged. 'segment' is
+        the segment processed by such a process.
+
+        'storage' selects the compression & chunking of both output
+        files (see dedop.data.output.storage), instead of the
+        l1b_storage_cnf & l1bs_storage_cnf parameters of the CNF
+
+        if 'async_output' is True, the records are written to the output
+        files by background threads, while the next surfaces are processed
+
+        if 'checkpoint_interval' is greater than 0, a checkpoint is written
+        next to the L1B output every that many L1B records (see
+        dedop.proc.sar.checkpoint). If 'resume' is True, the processing
+        of an L1A file restarts from its checkpoint, if there is one, and
+        the records are appended to the outputs of the interrupted run.
+        Runs which are split into segments, or which use surface focusing,
+        don't write checkpoints.
+
+        'fft_threads' is the number of threads of the FFTs of the libraries
+        which can use several (see dedop.proc.fft), by default the number
+        of CPUs. The processes of the segments share these threads.
         """
 
         if not name:
@@ -58,17 +105,40 @@ class L1BProcessor(BaseProcessor):
         self.cst = ConstantsFile(cst_file)
         self.chd = CharacterisationFile(self.cst, chd_file)
         self.cnf = ConfigurationFile(cnf_file)
+        self._config_files = dict(cnf_file=cnf_file, cst_file=cst_file, chd_file=chd_file)
+        self._config_digest = get_config_digest(cnf_file, cst_file, chd_file)
 
         self.skip_l1bs = skip_l1bs
+        self.prefetch = prefetch
+        self.storage = OutputStorage(storage) if storage is not None else None
+        self.async_output = async_output
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        self.fft_threads = fft_threads
+        if profile or profile_memory:
+            self.profiler = Profiler(trace_memory=profile_memory)
+        else:
+            self.profiler = Profiler.NULL
+        self.segment_jobs = segment_jobs
+        self.segment = segment
         self.out_path = out_path
         self.name = name
         self.l1a_file = None
-
-        # init. surface & packets arrays
-        self._surfaces = []
-        self._packets = []
+        self.l1b_file = None
+        self.l1bs_file = None
+
+        # init. surface & packets queues
+        self._surfaces = deque()
+        # the ECEF positions of the queued surfaces, for the beam angles
+        self._surfaces_ecef = SurfacePositions()
+        self._packets = deque()
         self.surfaces_count = 0
         self.min_surfs = 64 + 16  # 16 elem. margin
+        self._seed = None
+
+        # the last surfaces found, from which a checkpoint restarts the processing
+        self._surface_history = None
+        self._checkpoint = None
 
         # set defaults for beam angles
         self.beam_angles_list_size_prev = -1
@@ -100,6 +170,18 @@ class L1BProcessor(BaseProcessor):
         self.cal2_algorithm =\
             CAL2Algorithm(self.chd, self.cst, self.cnf)
 
+        # the large per-burst & per-surface arrays are recycled once
+        # the bursts & surfaces have been written
+        self.buffer_pool = BufferPool()
+        for algorithm in (self.azimuth_processing_algorithm, self.stack_gathering_algorithm,
+                          self.geometry_corrections_algorithm, self.range_compression_algorithm,
+                          self.stack_masking_algorithm):
+            algorithm.buffer_pool = self.buffer_pool
+
+        for algorithm in (self.azimuth_processing_algorithm, self.range_compression_algorithm,
+                          self.cal2_algorithm):
+            algorithm.fft = get_fft(algorithm.fft_backend, threads=fft_threads)
+
         # set threshold for gaps
         self.gap_threshold = self.chd.bri_sar * 1.5
 
@@ -107,14 +189,50 @@ class L1BProcessor(BaseProcessor):
         """
         runs the L1B Processing Chain
         """
-        self.l1a_file = L1ADataset(l1a_file, chd=self.chd, cst=self.cst, cnf=self.cnf)
+        # the checkpoint of an interrupted run, from which the processing is resumed
+        if self.resume and self.segment is None:
+            self._checkpoint = self.read_resume_checkpoint(l1a_file)
+        else:
+            self._checkpoint = None
+
+        # the surface locations of a focused surface depend on the following ones
+        split = self.segment is None and self.segment_jobs > 1 and not self.cnf.flag_surface_focusing and \
+            self._checkpoint is None
 
-        print('processing %s using "%s"' % (self.l1a_file.file_path, self.name))
+        # the L1A file is only scanned before it is split
+        self.l1a_file = L1ADataset(l1a_file, chd=self.chd, cst=self.cst, cnf=self.cnf,
+                                   prefetch=self.prefetch and not split)
+
+        if self.segment is not None:
+            self.l1a_file.select(self.segment.start, self.segment.stop)
+        else:
+            print('processing %s using "%s"' % (self.l1a_file.file_path, self.name))
+            if self._checkpoint is not None:
+                print('resuming after %s L1B records' % self._checkpoint.l1b_records)
 
         t0 = time.time()
 
-        with monitor.starting('processing', total_work=len(self.l1a_file)):
-            status = self._process(l1a_file, monitor)
+        self.profiler.start()
+        try:
+            if split:
+                status = self._process_segments(l1a_file, monitor)
+            else:
+                with monitor.starting('processing', total_work=len(self.l1a_file)):
+                    status = self._process(l1a_file, monitor)
+        except BaseException:
+            self._abort_outputs()
+            raise
+        finally:
+            self.profiler.stop()
+            self.l1a_file.close()
+
+        if self.segment is not None:
+            # the outputs of a segment are merged by the processor which split the file
+            return status
+
+        if status is None:
+            # the run has completed, so it can't be resumed
+            self._remove_checkpoint()
 
         dt = time.time() - t0
 
@@ -122,51 +240,98 @@ class L1BProcessor(BaseProcessor):
         if self.l1bs_file is not None:
             print('produced %s' % self.l1bs_file.file_path)
 
+        if self.profiler is not Profiler.NULL:
+            profile_path = self.get_profile_path(self.l1b_file.file_path)
+            self.profiler.write(profile_path)
+            print('produced %s' % profile_path)
+
         print('processing took %s' % str(datetime.timedelta(seconds=dt)))
 
         return status
 
-    def _process(self, l1a_file, monitor):
-        running = True
-        surface_processing = False
-        status = -1
-        self.beam_angles_list_size_prev = -1
-        self.beam_angles_trend_prev = -1
-        self.surfaces_count = 0
+    def _process_segments(self, l1a_file: str, monitor: Monitor) -> int:
+        """
+        split the L1A file into segments, process them on a pool of
+        processes, and merge their outputs
+        """
+        with monitor.starting('processing', total_work=3):
+            with self.profiler.stage('plan_segments'):
+                segments = plan_segments(self.l1a_file, self.cst, self.chd, self.cnf, self.segment_jobs,
+                                         self.gap_threshold, self.min_surfs, monitor=monitor.child(1))
+
+            # the HDF5 library can't be used by forked processes while files are open
+            self.l1a_file.close()
+
+            os.makedirs(self.out_path, exist_ok=True)
+
+            # the outputs of the segments are written next to the final ones
+            with tempfile.TemporaryDirectory(prefix='segments_', dir=self.out_path) as segments_path:
+                jobs = []
+                for index, segment in enumerate(segments):
+                    processor_kwargs = dict(
+                        self._config_files, out_path=os.path.join(segments_path, str(index)),
+                        skip_l1bs=self.skip_l1bs, prefetch=self.prefetch, segment=segment,
+                        async_output=self.async_output,
+                        fft_threads=get_job_fft_threads(self.segment_jobs, self.fft_threads),
+                        # the outputs of the segments are only read back once
+                        storage=OutputStorage.none
+                    )
+                    jobs.append(ProcessorJob(self.name, processor_kwargs, l1a_file))
 
-        # find base name of input file
-        l1a_base, _ = os.path.splitext(os.path.basename(l1a_file))
-        if l1a_base.startswith('L1A'):
-            l1a_base = l1a_base[len('L1A'):]
+                with self.profiler.stage('process_segments'):
+                    process_batch(jobs, L1BProcessor, max_workers=self.segment_jobs, monitor=monitor.child(1),
+                                  label='processing %s segments' % len(jobs))
 
-        l1a_base_part = ''
-        if l1a_base:
-            l1a_base_part = '_%s' % l1a_base
+                self.l1a_file = L1ADataset(l1a_file, chd=self.chd, cst=self.cst, cnf=self.cnf)
+                self._open_outputs(l1a_file)
 
-        name_part = ''
-        if self.name:
-            name_part = '_%s' % self.name
+                if monitor.is_cancelled():
+                    status = -1
+                else:
+                    merge_monitor = monitor.child(1)
+                    with self.profiler.stage('merge_segments'), \
+                            merge_monitor.starting('merging segments', total_work=len(jobs)):
+                        for job in jobs:
+                            l1b_path, l1bs_path = self.get_output_paths(job.processor_kwargs['out_path'], l1a_file)
+                            self.l1b_file.append_records(l1b_path)
+                            if self.l1bs_file is not None:
+                                self.l1bs_file.append_records(l1bs_path)
+                            merge_monitor.progress(1)
+                    status = None
 
-        # create l1b-s output path
-        l1bs_name = 'L1BS%s%s.nc' % (l1a_base_part, name_part)
-        l1bs_path = os.path.join(self.out_path, l1bs_name)
+                # the last buffered records are written & compressed here
+                with self.profiler.stage('close_outputs'):
+                    self._close_outputs()
 
-        # create l1b output path
-        l1b_name = 'L1B%s%s.nc' % (l1a_base_part, name_part)
-        l1b_path = os.path.join(self.out_path, l1b_name)
+        return status
 
-        # create output file objects
-        writerCls = L1BWriter if self.cnf.output_format == OutputFormat.s3 else L1BWriterExtended
-        self.l1b_file = writerCls(filename=l1b_path, chd=self.chd, cnf=self.cnf, cst=self.cst)
-        if not self.skip_l1bs:
-            self.l1bs_file = L1BSWriter(filename=l1bs_path, chd=self.chd, cnf=self.cnf, cst=self.cst)
+    def _process(self, l1a_file, monitor):
+        running = True
+        surface_processing = False
+        status = -1
+        self.beam_angles_list_size_prev = -1
+        self.beam_angles_trend_prev = -1
+        self._surface_history = SurfaceHistory(self.min_surfs)
+
+        if self.segment is not None:
+            self.surfaces_count = self.segment.surface_start
+            self._seed = self.segment.seed
+        elif self._checkpoint is not None:
+            # the bursts & surfaces before the next output surface are processed again
+            self.surfaces_count = self._checkpoint.surface_start
+            self._seed = self._checkpoint.seed
+            self.l1a_file.seek(self._checkpoint.start)
         else:
-            self.l1bs_file = None
+            self.surfaces_count = 0
+            self._seed = None
 
-        # open output files
-        self.l1b_file.open()
-        if self.l1bs_file is not None:
-            self.l1bs_file.open()
+        self._open_outputs(l1a_file, self._checkpoint)
+        self.select_intermediates()
+        if self.segment is None and self._checkpoint is None:
+            # the checkpoint of a previous run doesn't match the new outputs
+            self._remove_checkpoint()
+        checkpoints = self.checkpoint_interval > 0 and self.segment is None and \
+            not self.cnf.flag_surface_focusing
 
         prev_time = None
         gap_processing = False
@@ -192,18 +357,27 @@ class L1BProcessor(BaseProcessor):
                 if not gap_resume:
                     # input_packet = next(self.l1a_file)
                     try:
-                        input_packet = next(self.l1a_file)
+                        with self.profiler.stage('ingest'):
+                            input_packet = next(self.l1a_file)
                     except StopIteration:
                         input_packet = None
                         if not surface_processing:
-                            raise Exception("insufficient input records")
+                            if self.segment is not None and self.segment.ends_at_gap and self.surf_locs:
+                                # the end of the segment is processed like a gap
+                                surface_processing = True
+                            else:
+                                raise Exception("insufficient input records")
                     else:
                         monitor.progress(1)
 
                 if input_packet is not None:
-                    # apply calibrations
-                    self.cal1_algorithm(input_packet)
-                    self.cal2_algorithm(input_packet)
+                    # apply calibrations (the packet after a gap has been calibrated
+                    #  already, when the gap was found)
+                    if not gap_resume:
+                        with self.profiler.stage('cal1'):
+                            self.cal1_algorithm(input_packet)
+                        with self.profiler.stage('cal2'):
+                            self.cal2_algorithm(input_packet)
 
                     # check if there is a gap (or if this is the first packet & prev_time has not been set)
                     if prev_time is None or input_packet.time_sar_ku - prev_time < self.gap_threshold:
@@ -230,6 +404,12 @@ class L1BProcessor(BaseProcessor):
 
                 working_loc = self.surf_locs[0]
 
+                if self.segment is not None and working_loc.surface_counter >= self.segment.output_stop:
+                    # the remaining surfaces are output by the next segment
+                    running = False
+                    status = None
+                    continue
+
                 for processed_packet in self.source_isps:
                     if not processed_packet.burst_processed:
 
@@ -244,11 +424,13 @@ class L1BProcessor(BaseProcessor):
 
                 self.stack_gathering(working_loc)
 
-                # if the current surface doesn't have enough contributing bursts, then
-                #  it should not be written to the outputs - and so the rest of the processing
-                #  is not needed
-                if working_loc.data_stack_size < (self.cnf.n_looks_stack // 2):
-                    del self.surf_locs[0]  # remove this surface from the queue
+                # if the current surface doesn't have enough contributing bursts, or is
+                #  before the output of the segment, then it should not be written to the
+                #  outputs - and so the rest of the processing is not needed
+                if working_loc.data_stack_size < (self.cnf.n_looks_stack // 2) or \
+                        not self.is_output_surface(working_loc):
+                    old_surface = self.remove_surface()  # remove this surface from the queue
+                    self.release_surface_buffers(old_surface)
                 else:
                     self.geometry_corrections(working_loc)
                     self.range_compression(working_loc)
@@ -257,12 +439,18 @@ class L1BProcessor(BaseProcessor):
                     self.sigma_zero_scaling(working_loc)
 
                     if self.l1b_file is not None:
-                        self.l1b_file.write_record(working_loc)
+                        with self.profiler.stage('write_l1b'):
+                            self.l1b_file.write_record(working_loc)
                     if self.l1bs_file is not None:
-                        self.l1bs_file.write_record(working_loc)
+                        with self.profiler.stage('write_l1bs'):
+                            self.l1bs_file.write_record(working_loc)
 
                     self.clear_old_records(working_loc)
 
+                    if checkpoints and self.l1b_file.output_index % self.checkpoint_interval == 0:
+                        with self.profiler.stage('checkpoint'):
+                            self.write_checkpoint(working_loc.surface_counter + 1)
+
             if not self.surf_locs:
                 if gap_processing:
                     # all the remaining surfaces & bursts before the gap have been processed
@@ -275,12 +463,105 @@ class L1BProcessor(BaseProcessor):
                     running = False
                     status = None
 
+        # the last buffered records are written & compressed here
+        with self.profiler.stage('close_outputs'):
+            self._close_outputs()
+
+        return status
+
+    def get_output_paths(self, out_path: str, l1a_file: str) -> Tuple[str, str]:
+        """
+        get the paths of the L1B & L1B-S files output for an L1A file
+
+        :param out_path: the output directory
+        :param l1a_file: the path of the L1A file
+        :return: the L1B path and the L1B-S path
+        """
+        # find base name of input file
+        l1a_base, _ = os.path.splitext(os.path.basename(l1a_file))
+        if l1a_base.startswith('L1A'):
+            l1a_base = l1a_base[len('L1A'):]
+
+        l1a_base_part = ''
+        if l1a_base:
+            l1a_base_part = '_%s' % l1a_base
+
+        name_part = ''
+        if self.name:
+            name_part = '_%s' % self.name
+
+        # create l1b-s output path
+        l1bs_name = 'L1BS%s%s.nc' % (l1a_base_part, name_part)
+        l1bs_path = os.path.join(out_path, l1bs_name)
+
+        # create l1b output path
+        l1b_name = 'L1B%s%s.nc' % (l1a_base_part, name_part)
+        l1b_path = os.path.join(out_path, l1b_name)
+
+        return l1b_path, l1bs_path
+
+    def _open_outputs(self, l1a_file: str, checkpoint: Checkpoint = None) -> None:
+        """
+        create & open the output files, or re-open the outputs of an
+        interrupted run to append the records after its checkpoint
+        """
+        append = checkpoint is not None
+        l1b_path, l1bs_path = self.get_output_paths(self.out_path, l1a_file)
+
+        # the storage of the output files, given by the CNF unless it is overridden
+        l1b_storage = get_storage_profile(self.storage or self.cnf.l1b_storage, self.cnf.least_significant_digit)
+        l1bs_storage = get_storage_profile(self.storage or self.cnf.l1bs_storage, self.cnf.least_significant_digit)
+
+        # create output file objects
+        writerCls = L1BWriter if self.cnf.output_format == OutputFormat.s3 else L1BWriterExtended
+        self.l1b_file = writerCls(filename=l1b_path, chd=self.chd, cnf=self.cnf, cst=self.cst,
+                                  storage=l1b_storage, background=self.async_output, append=append)
+        if not self.skip_l1bs:
+            self.l1bs_file = L1BSWriter(filename=l1bs_path, chd=self.chd, cnf=self.cnf, cst=self.cst,
+                                        storage=l1bs_storage, background=self.async_output, append=append)
+        else:
+            self.l1bs_file = None
+
+        # open output files
+        self.l1b_file.open()
+        if self.l1bs_file is not None:
+            self.l1bs_file.open()
+
+        if checkpoint is not None:
+            for writer, records in ((self.l1b_file, checkpoint.l1b_records),
+                                    (self.l1bs_file, checkpoint.l1bs_records)):
+                if writer is None:
+                    continue
+                if writer.output_index < records:
+                    raise ProcessorException('%s has fewer records than its checkpoint' % writer.file_path)
+                # the records written after the checkpoint are written again
+                writer.output_index = records
+
+    def select_intermediates(self) -> None:
+        """
+        only compute the optional intermediate results which are needed
+        by the open output files (e.g. the complex beams, which are only
+        written to the L1B-S file)
+        """
+        needed = set()
+        for writer in (self.l1b_file, self.l1bs_file):
+            if writer is not None:
+                needed.update(writer.SURFACE_INTERMEDIATES)
+
+        self.range_compression_algorithm.compute_iq = 'beams_range_compr_iq' in needed
+        self.stack_masking_algorithm.keep_mask = self.multilooking_algorithm.flag_avoid_zeros_in_multilooking
+        self.multilooking_algorithm.start_stop_outputs = \
+            MultilookingAlgorithm.START_STOP_OUTPUTS.intersection(needed)
+
+    def _close_outputs(self) -> None:
+        """
+        write the global attributes of the output files, and close them
+        """
         l1a_globals = self.l1a_file.read_globals()
 
         ctime = iso_format()
         ftime = iso_format(self.l1a_file.first_time())
         ltime = iso_format(self.l1a_file.last_time())
-        # close output files
         self.l1b_file.write_globals(
             title='DeDop SRAL Level 1 Measurement',
             mission_name=l1a_globals.mission_name,
@@ -346,7 +627,107 @@ class L1BProcessor(BaseProcessor):
             )
             self.l1bs_file.close()
 
-        return status
+    def _abort_outputs(self) -> None:
+        """
+        close the output files after an error, with the records written
+        so far. The errors of the writers are not raised, so that they
+        don't hide the first error.
+        """
+        for writer in (self.l1b_file, self.l1bs_file):
+            if writer is not None and writer.is_open:
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+
+    def is_output_surface(self, surface: SurfaceData) -> bool:
+        """
+        check if a surface is output by this processor (and not by the
+        processor of another segment of the L1A file)
+        """
+        if self.segment is None:
+            # the surfaces before the checkpoint have been output already
+            return self._checkpoint is None or surface.surface_counter >= self._checkpoint.output_start
+        return self.segment.output_start <= surface.surface_counter < self.segment.output_stop
+
+    @staticmethod
+    def get_profile_path(l1b_path: str) -> str:
+        """
+        get the path of the profiling report written next to an L1B file
+        """
+        base, _ = os.path.splitext(l1b_path)
+        return base + '_profile.json'
+
+    @staticmethod
+    def get_checkpoint_path(l1b_path: str) -> str:
+        """
+        get the path of the checkpoint written next to an L1B file
+        """
+        base, _ = os.path.splitext(l1b_path)
+        return base + '_checkpoint.json'
+
+    def read_resume_checkpoint(self, l1a_file: str) -> Optional[Checkpoint]:
+        """
+        read the checkpoint of an interrupted run on an L1A file, and
+        check that the run can be resumed from it
+
+        :param l1a_file: the path of the L1A file
+        :return: the checkpoint, or None if there is none
+        """
+        l1b_path, l1bs_path = self.get_output_paths(self.out_path, l1a_file)
+        checkpoint_path = self.get_checkpoint_path(l1b_path)
+
+        checkpoint = read_checkpoint(checkpoint_path)
+        if checkpoint is None:
+            print('no checkpoint %s, processing from the start' % checkpoint_path)
+            return None
+
+        if os.path.abspath(checkpoint.l1a_file) != os.path.abspath(l1a_file):
+            raise ProcessorException('checkpoint %s was written for another L1A file: %s'
+                                     % (checkpoint_path, checkpoint.l1a_file))
+        if checkpoint.config_digest != self._config_digest:
+            raise ProcessorException('the configuration has changed since checkpoint %s was written'
+                                     % checkpoint_path)
+        if (checkpoint.l1bs_records is None) != self.skip_l1bs:
+            raise ProcessorException('checkpoint %s was written by a run %s L1B-S output'
+                                     % (checkpoint_path, 'without' if self.skip_l1bs else 'with'))
+        for path in (l1b_path, l1bs_path) if not self.skip_l1bs else (l1b_path,):
+            if not os.path.exists(path):
+                raise ProcessorException('missing output %s of checkpoint %s' % (path, checkpoint_path))
+        return checkpoint
+
+    def _remove_checkpoint(self) -> None:
+        checkpoint_path = self.get_checkpoint_path(self.l1b_file.file_path)
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    def write_checkpoint(self, output_start: int) -> None:
+        """
+        write the records of the outputs to disk, and a checkpoint from
+        which the processing restarts before the given surface. There is
+        no checkpoint if the surfaces found before it are not known.
+
+        :param output_start: the counter of the next surface to output
+        """
+        restart = self._surface_history.get_restart(output_start)
+        if restart is None:
+            return
+
+        self.l1b_file.sync()
+        if self.l1bs_file is not None:
+            self.l1bs_file.sync()
+
+        checkpoint = Checkpoint(
+            l1a_file=os.path.abspath(self.l1a_file.file_path),
+            config_digest=self._config_digest,
+            start=restart.record,
+            surface_start=restart.surface_counter,
+            output_start=output_start,
+            seed=restart.data,
+            l1b_records=self.l1b_file.output_index,
+            l1bs_records=self.l1bs_file.output_index if self.l1bs_file is not None else None
+        )
+        write_checkpoint(self.get_checkpoint_path(self.l1b_file.file_path), checkpoint)
 
     def clear_old_records(self, current_surface: SurfaceData) -> None:
         """
@@ -356,9 +737,25 @@ class L1BProcessor(BaseProcessor):
             if self.source_isps[0].counter == current_surface.stack_all_bursts[0].counter:
                 break
             else:
-                self.source_isps.pop(0)
+                old_packet = self.source_isps.popleft()
+                self.buffer_pool.release(old_packet.beams_focused)
 
-        self.surf_locs.pop(0)
+        old_surface = self.remove_surface()
+        self.release_surface_buffers(old_surface)
+
+    def release_surface_buffers(self, surface: SurfaceData) -> None:
+        """
+        give the stack arrays of a surface which has been written back to
+        the buffer pool
+        """
+        self.buffer_pool.release(
+            getattr(surface, 'beams_surf', None),
+            getattr(surface, 'beams_geo_corr', None),
+            getattr(surface, 'beams_range_compr', None),
+            getattr(surface, 'beams_range_compr_iq', None),
+            getattr(surface, 'beams_masked', None),
+            getattr(surface, 'stack_mask', None),
+        )
 
     def surface_locations(self, packet: L1AProcessingData, force_new: bool=False) -> Optional[SurfaceData]:
         """
@@ -367,9 +764,30 @@ class L1BProcessor(BaseProcessor):
         """
         self.source_isps.append(packet)
 
-        if self.surface_locations_algorithm(self.surf_locs, self.source_isps, force_new=force_new):
+        if self._seed is not None:
+            # the first surface of a segment, found when the file was split
+            # (or of a run resumed from a checkpoint)
+            loc = dict(self._seed)
+            self._seed = None
+            surface = self.new_surface(loc)
+            self._surface_history.add(packet.counter, surface.surface_counter, loc, starts_stretch=False)
+            return surface
+
+        # the first surface of the file, or the first one after a gap
+        starts_stretch = force_new or not self.surf_locs
+
+        with self.profiler.stage('surface_locations'):
+            found = self.surface_locations_algorithm(self.surf_locs, self.source_isps, force_new=force_new)
+
+        if found:
+            if self.cnf.flag_surface_focusing and self.surf_locs:
+                # the last surface may have been moved onto the focusing target
+                self._surfaces_ecef.update(-1, self.surf_locs[-1])
+
             loc = self.surface_locations_algorithm.get_surface()
-            return self.new_surface(loc)
+            surface = self.new_surface(loc)
+            self._surface_history.add(packet.counter, surface.surface_counter, loc, starts_stretch)
+            return surface
         return None
 
     def beam_angles(self, surfaces: Sequence[SurfaceData], packet: L1AProcessingData,
@@ -377,7 +795,9 @@ class L1BProcessor(BaseProcessor):
         """
         call the beam angles algorithm and store the results
         """
-        self.beam_angles_algorithm(surfaces, packet, working_surface_location)
+        with self.profiler.stage('beam_angles'):
+            self.beam_angles_algorithm(surfaces, packet, working_surface_location,
+                                       surfaces_ecef=self.get_surfaces_ecef(surfaces))
 
         packet.beam_angles_list = self.beam_angles_algorithm.beam_angles
         packet.surfaces_seen_list = self.beam_angles_algorithm.surfaces_seen
@@ -391,35 +811,60 @@ class L1BProcessor(BaseProcessor):
         self.beam_angles_trend_prev = \
             packet.beam_angles_trend
 
-        last_index = 0
-
         for seen_surface_index, seen_surface_counter in enumerate(packet.surfaces_seen_list):
-            for curr_surface in surfaces[last_index:]:
-                last_index += 1
-
-                if curr_surface.surface_counter == seen_surface_counter:
-                    curr_surface.add_stack_beam_index(
-                        seen_surface_index,
-                        packet.beam_angles_trend,
-                        len(packet.beam_angles_list)
-                    )
+            curr_surface = self.get_surface(surfaces, seen_surface_counter)
+
+            if curr_surface is not None:
+                curr_surface.add_stack_beam_index(
+                    seen_surface_index,
+                    packet.beam_angles_trend,
+                    len(packet.beam_angles_list)
+                )
 
-                    curr_surface.add_stack_burst(packet)
+                curr_surface.add_stack_burst(packet)
 
-                    break
+    @staticmethod
+    def get_surface(surfaces: Deque[SurfaceData], surface_counter: int) -> Optional[SurfaceData]:
+        """
+        find a queued surface from its counter
+
+        the surfaces are queued in order of their (consecutive) counters,
+        so the position of a surface in the queue is found directly
+
+        :param surfaces: the queue of surfaces
+        :param surface_counter: the counter of the surface
+        :return: the surface, or None if it isn't in the queue
+        """
+        if not surfaces:
+            return None
+
+        index = surface_counter - surfaces[0].surface_counter
+
+        if 0 <= index < len(surfaces):
+            surface = surfaces[index]
+            if surface.surface_counter == surface_counter:
+                return surface
+
+        # the counters aren't consecutive, so search the queue
+        for surface in surfaces:
+            if surface.surface_counter == surface_counter:
+                return surface
+        return None
 
     def azimuth_processing(self, packet: L1AProcessingData) -> None:
         """
         call the azimuth processing algorithm and store the results
         """
-        self.azimuth_processing_algorithm(packet, self.chd.wv_length_ku)
+        with self.profiler.stage('azimuth_processing'):
+            self.azimuth_processing_algorithm(packet, self.chd.wv_length_ku)
         packet.beams_focused = self.azimuth_processing_algorithm.beams_focused
 
     def geometry_corrections(self, working_surface_location: SurfaceData) -> None:
         """
         call the geometry correction algorithm and store the results
         """
-        self.geometry_corrections_algorithm(working_surface_location, self.chd.wv_length_ku)
+        with self.profiler.stage('geometry_corrections'):
+            self.geometry_corrections_algorithm(working_surface_location, self.chd.wv_length_ku)
 
         working_surface_location.slant_range_corrections = \
             self.geometry_corrections_algorithm.slant_range_corrections
@@ -436,7 +881,8 @@ class L1BProcessor(BaseProcessor):
         """
         call the range compression algorithm and store the results
         """
-        self.range_compression_algorithm(working_surface_location)
+        with self.profiler.stage('range_compression'):
+            self.range_compression_algorithm(working_surface_location)
 
         working_surface_location.beams_range_compr = \
             self.range_compression_algorithm.beam_range_compr
@@ -448,7 +894,8 @@ class L1BProcessor(BaseProcessor):
         call the stack_gathering algorithm and store the results in the
         working surface location object
         """
-        self.stack_gathering_algorithm(working_surface_location)
+        with self.profiler.stage('stack_gathering'):
+            self.stack_gathering_algorithm(working_surface_location)
 
         working_surface_location.data_stack_size = \
             self.stack_gathering_algorithm.data_stack_size
@@ -478,7 +925,8 @@ class L1BProcessor(BaseProcessor):
         """
         call the stack masking algorithm and store the results
         """
-        self.stack_masking_algorithm(working_surface_location)
+        with self.profiler.stage('stack_masking'):
+            self.stack_masking_algorithm(working_surface_location)
 
         # store results in working surface location
         working_surface_location.beams_masked = \
@@ -493,7 +941,8 @@ class L1BProcessor(BaseProcessor):
         call the multilooking algorithm and store the results in the
         surface location object
         """
-        self.multilooking_algorithm(working_surface_location)
+        with self.profiler.stage('multilooking'):
+            self.multilooking_algorithm(working_surface_location)
 
         working_surface_location.stack_max = \
             self.multilooking_algorithm.stack_max
@@ -542,9 +991,10 @@ class L1BProcessor(BaseProcessor):
         call the sigma0 scaling algorithm and store the results in the
         surface location object
         """
-        working_surface_location.sigma0_scaling_factor = self.sigma_zero_algorithm(
-            working_surface_location, self.chd.wv_length_ku, self.chd.chirp_slope_ku
-        )
+        with self.profiler.stage('sigma_zero_scaling'):
+            working_surface_location.sigma0_scaling_factor = self.sigma_zero_algorithm(
+                working_surface_location, self.chd.wv_length_ku, self.chd.chirp_slope_ku
+            )
         working_surface_location.sigma0_scaling_factor_beam =\
             self.sigma_zero_algorithm.sigma0_scaling_factor_beam
 
@@ -571,3 +1021,24 @@ class L1BProcessor(BaseProcessor):
         :param surface: the surface
         """
         self.surf_locs.append(surface)
+        self._surfaces_ecef.append(surface)
+
+    def remove_surface(self) -> SurfaceData:
+        """
+        remove the first surface from the list
+
+        :return: the surface
+        """
+        self._surfaces_ecef.popleft()
+        return self.surf_locs.popleft()
+
+    def get_surfaces_ecef(self, surfaces: Sequence[SurfaceData]) -> Optional[np.ndarray]:
+        """
+        get the ECEF positions of the surfaces, if they are the queued surfaces
+
+        :param surfaces: the surfaces
+        :return: an (N, 3) array, or None
+        """
+        if surfaces is self.surf_locs and len(self._surfaces_ecef) == len(surfaces):
+            return self._surfaces_ecef.array
+        return None
@@ -0,0 +1,175 @@
+"""
+
+This module splits an L1A file into segments which can be processed independently, and so in parallel.
+
+The file is first split at the data gaps, where the processor starts over with a new surface anyway.
+Long gap-free stretches are split further. As the location of each surface depends on the previous one,
+the surface locations of the whole file are found first (which is cheap compared to the rest of the
+processing). A segment which starts within a stretch is then seeded with the surface found 'margin'
+surfaces before its first output surface, and ends 'margin' surfaces after its last one, so that its
+output surfaces are processed with the same bursts & surfaces as in a single pass over the file.
+
+With surface focusing, a surface is moved once the next one has been found, and only one surface of
+the whole file is focused, so files processed with surface focusing are not split.
+
+"""
+from collections import deque, namedtuple
+from math import ceil
+from typing import List
+
+from dedop.conf import CharacterisationFile, ConstantsFile, ConfigurationFile
+from dedop.data.input.l1a import L1ADataset
+from dedop.model import SurfaceData
+from dedop.util.monitor import Monitor
+
+from .algorithms import SurfaceLocationAlgorithm
+
+#: A segment of an L1A file.
+#:
+#: * *start*, *stop*: the range of the indices of the L1A records to process
+#: * *surface_start*: the counter of the first surface found in the segment
+#: * *output_start*, *output_stop*: the range of the counters of the surfaces to output
+#: * *seed*: None if the segment starts at the beginning of a stretch, otherwise a tuple of the
+#:   (key, value) pairs of the location of the first surface, which is found by the first record
+#: * *ends_at_gap*: if False, the segment ends at the end of the file
+Segment = namedtuple('Segment', ['start', 'stop', 'surface_start', 'output_start', 'output_stop',
+                                 'seed', 'ends_at_gap'])
+
+# a surface found by the scan of the surface locations
+_SurfaceInfo = namedtuple('_SurfaceInfo', ['record', 'data'])
+
+
+class _Stretch:
+    """
+    a gap-free range of L1A records, and the surfaces found in it
+    """
+
+    def __init__(self, start: int, surface_start: int):
+        self.start = start
+        self.stop = start + 1
+        self.surface_start = surface_start
+        self.surfaces = []  # type: List[_SurfaceInfo]
+
+    @property
+    def surface_stop(self) -> int:
+        return self.surface_start + len(self.surfaces)
+
+
+def plan_segments(l1a_file: L1ADataset, cst: ConstantsFile, chd: CharacterisationFile, cnf: ConfigurationFile,
+                  n_segments: int, gap_threshold: float, margin: int,
+                  monitor: Monitor = Monitor.NULL) -> List[Segment]:
+    """
+    find the surface locations of an L1A file, and split the file into segments
+
+    :param l1a_file: the L1A file
+    :param cst: the constants
+    :param chd: the characterisation
+    :param cnf: the configuration
+    :param n_segments: the number of segments wanted (long gap-free stretches are split to get these)
+    :param gap_threshold: the min. time between two records which is a gap
+    :param margin: the number of surfaces processed before & after the output surfaces of a segment
+    :param monitor: a progress monitor
+    :return: the segments, in order of time
+    """
+    stretches = _find_stretches(l1a_file, cst, chd, cnf, gap_threshold, monitor)
+    if not stretches:
+        raise Exception("insufficient input records")
+
+    return _split_stretches(stretches, n_segments, margin)
+
+
+def _split_stretches(stretches: List[_Stretch], n_segments: int, margin: int) -> List[Segment]:
+    """
+    split the stretches into (about) the given number of segments
+    """
+    n_surfaces = sum(len(stretch.surfaces) for stretch in stretches)
+
+    # don't split into pieces much smaller than the margins around them
+    piece_size = max(ceil(n_surfaces / n_segments), 2 * margin)
+
+    segments = []
+    for stretch_index, stretch in enumerate(stretches):
+        is_last_stretch = stretch_index == len(stretches) - 1
+
+        n_pieces = max(1, round(len(stretch.surfaces) / piece_size))
+        bounds = [
+            stretch.surface_start + (len(stretch.surfaces) * piece) // n_pieces for piece in range(n_pieces + 1)
+        ]
+        for output_start, output_stop in zip(bounds[:-1], bounds[1:]):
+            segments.append(
+                _make_segment(stretch, output_start, output_stop, margin, is_last_stretch)
+            )
+    return segments
+
+
+def _make_segment(stretch: _Stretch, output_start: int, output_stop: int, margin: int,
+                  is_last_stretch: bool) -> Segment:
+    # the first surface of the segment
+    seed_counter = max(output_start - margin, stretch.surface_start)
+    seed_surface = stretch.surfaces[seed_counter - stretch.surface_start]
+
+    # the last surface of the segment: a surface is processed once
+    # 'margin' surfaces have been found after it
+    last_counter = output_stop - 1 + margin
+
+    if last_counter >= stretch.surface_stop:
+        stop = stretch.stop
+        ends_at_gap = not is_last_stretch
+    else:
+        stop = stretch.surfaces[last_counter - stretch.surface_start].record + 1
+        ends_at_gap = True
+
+    return Segment(seed_surface.record, stop, seed_counter, output_start, output_stop, seed_surface.data, ends_at_gap)
+
+
+def _find_stretches(l1a_file: L1ADataset, cst: ConstantsFile, chd: CharacterisationFile, cnf: ConfigurationFile,
+                    gap_threshold: float, monitor: Monitor) -> List[_Stretch]:
+    """
+    find the gap-free stretches of the L1A file, and the surface
+    locations in them, in the same way as the L1BProcessor
+    """
+    surface_locations_algorithm = SurfaceLocationAlgorithm(chd, cst, cnf)
+
+    # the algorithm only needs the last two surfaces & bursts
+    surfaces = deque(maxlen=2)
+    bursts = deque(maxlen=2)
+
+    stretches = []
+    stretch = None
+    prev_time = None
+    surfaces_count = 0
+
+    with monitor.starting('finding surface locations', total_work=len(l1a_file)):
+        # the waveforms aren't needed to find the surfaces
+        for packet in l1a_file.iter_locations():
+            monitor.progress(1)
+
+            if packet is None:
+                continue
+
+            if prev_time is None or packet.time_sar_ku - prev_time >= gap_threshold:
+                # start a new stretch
+                stretch = _Stretch(packet.counter, surfaces_count)
+                stretches.append(stretch)
+                surfaces.clear()
+                force_new = True
+            else:
+                force_new = False
+
+            prev_time = packet.time_sar_ku
+            stretch.stop = packet.counter + 1
+            bursts.append(packet)
+
+            if surface_locations_algorithm(surfaces, bursts, force_new=force_new):
+                data = surface_locations_algorithm.get_surface()
+
+                surface = SurfaceData(cst, chd, surfaces_count, **data)
+                surface.compute_surf_sat_vector()
+                surface.compute_angular_azimuth_beam_resolution(chd.pri_sar)
+                surfaces.append(surface)
+                surfaces_count += 1
+
+                stretch.surfaces.append(_SurfaceInfo(packet.counter, tuple(data.items())))
+
+    return stretches
+
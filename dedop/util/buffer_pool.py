@@ -0,0 +1,130 @@
+"""
+
+This module defines the :py:class:`BufferPool`, which recycles the large arrays that are created
+for each surface by the processing chain.
+
+Example usage:::
+
+    pool = BufferPool()
+
+    stack = pool.zeros((240, 128), dtype=np.complex128)
+    # ... use the stack
+    pool.release(stack)
+
+    # the next request for the same shape & type re-uses the released array
+    stack = pool.zeros((240, 128), dtype=np.complex128)
+
+Use ``BufferPool.NULL`` where no recycling is wanted: it allocates new arrays, and ignores released ones.
+
+"""
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class BufferPool:
+    """
+    A pool of numpy arrays, grouped by shape and type.
+
+    Arrays are taken from the pool with :py:meth:`empty` or :py:meth:`zeros`, and given back
+    with :py:meth:`release` once they are no longer referenced. Views (e.g. slices) of an array
+    release the array they were taken from.
+    """
+
+    #: A pool which doesn't recycle anything. Use ``BufferPool.NULL`` instead of ``None``.
+    NULL = None
+
+    def __init__(self):
+        self._free = defaultdict(list)  # type: Dict[Tuple[Tuple[int, ...], np.dtype], List[np.ndarray]]
+        self._free_ids = set()
+
+        self.allocated = 0
+        self.reused = 0
+
+    def empty(self, shape, dtype=np.float64) -> np.ndarray:
+        """
+        get an array with the given shape & type, with undefined content
+
+        :param shape: the shape of the array
+        :param dtype: the type of the array
+        """
+        key = self._get_key(shape, dtype)
+        free = self._free[key]
+
+        if free:
+            buffer = free.pop()
+            self._free_ids.discard(id(buffer))
+            self.reused += 1
+            return buffer
+
+        self.allocated += 1
+        return np.empty(key[0], dtype=key[1])
+
+    def zeros(self, shape, dtype=np.float64) -> np.ndarray:
+        """
+        get an array with the given shape & type, filled with zeros
+
+        :param shape: the shape of the array
+        :param dtype: the type of the array
+        """
+        buffer = self.empty(shape, dtype)
+        buffer.fill(0)
+        return buffer
+
+    def release(self, *arrays: np.ndarray) -> None:
+        """
+        give arrays back to the pool. The caller must make sure that
+        nothing references the arrays (or views of them) any more.
+
+        :param arrays: the arrays to release, None values are ignored
+        """
+        for array in arrays:
+            if array is None:
+                continue
+
+            # find the array which owns the memory
+            while isinstance(array.base, np.ndarray):
+                array = array.base
+
+            if array.base is not None or not array.flags.c_contiguous:
+                # the memory isn't owned by numpy (e.g. it is netCDF data)
+                continue
+            if id(array) in self._free_ids:
+                # already released (e.g. via another view)
+                continue
+
+            self._free[self._get_key(array.shape, array.dtype)].append(array)
+            self._free_ids.add(id(array))
+
+    def clear(self) -> None:
+        """
+        drop all of the free arrays
+        """
+        self._free.clear()
+        self._free_ids.clear()
+
+    @staticmethod
+    def _get_key(shape, dtype) -> Tuple[Tuple[int, ...], np.dtype]:
+        if isinstance(shape, int):
+            shape = (shape,)
+        return tuple(shape), np.dtype(dtype)
+
+
+class _NullBufferPool(BufferPool):
+    def __repr__(self):
+        # Overridden to make Sphinx use a readable name.
+        return 'BufferPool.NULL'
+
+    def empty(self, shape, dtype=np.float64) -> np.ndarray:
+        return np.empty(shape, dtype=dtype)
+
+    def zeros(self, shape, dtype=np.float64) -> np.ndarray:
+        return np.zeros(shape, dtype=dtype)
+
+    def release(self, *arrays: np.ndarray) -> None:
+        pass
+
+
+#: Use ``BufferPool.NULL`` where no recycling of arrays is wanted.
+BufferPool.NULL = _NullBufferPool()
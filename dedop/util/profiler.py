@@ -0,0 +1,243 @@
+"""
+
+This module defines the :py:class:`Profiler`, which records the time spent, the number of calls and the memory
+allocated by each stage of a processing chain.
+
+Example usage:::
+
+    profiler = Profiler()
+
+    with profiler.stage('range_compression'):
+        # ... run the stage
+
+    report = profiler.report()
+    profiler.write('L1B_profile.json')
+
+The memory allocated by a stage is only recorded if the profiler traces memory allocations (see
+:py:mod:`tracemalloc`), which slows down the processing. Use ``Profiler.NULL`` where no profiling is wanted.
+
+"""
+import json
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Dict
+
+
+class StageStats:
+    """
+    The statistics of one stage.
+
+    :param name: the name of the stage
+    """
+
+    __slots__ = ("name", "calls", "time", "bytes_allocated", "bytes_retained")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.time = 0.
+        self.bytes_allocated = 0
+        self.bytes_retained = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return OrderedDict([
+            ("calls", self.calls),
+            ("time", self.time),
+            ("mean_time", self.time / self.calls if self.calls else 0.),
+            ("bytes_allocated", self.bytes_allocated),
+            ("bytes_retained", self.bytes_retained),
+        ])
+
+
+class _Stage:
+    """
+    context manager which times one call of a stage
+    """
+
+    __slots__ = ("_profiler", "_stats", "_start_time", "_start_memory")
+
+    def __init__(self, profiler: 'Profiler', stats: StageStats):
+        self._profiler = profiler
+        self._stats = stats
+
+    def __enter__(self):
+        if self._profiler.trace_memory:
+            self._start_memory = self._profiler._enter_memory()
+        self._start_time = time.perf_counter()
+        return self._stats
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stats.time += time.perf_counter() - self._start_time
+        self._stats.calls += 1
+
+        if self._profiler.trace_memory:
+            allocated, retained = self._profiler._exit_memory(self._start_memory)
+            self._stats.bytes_allocated += allocated
+            self._stats.bytes_retained += retained
+
+
+class Profiler:
+    """
+    Records the statistics of the stages of a processing chain, in the
+    order in which the stages are first run.
+
+    For each stage, the number of calls & the total time are recorded. If
+    'trace_memory' is True, then the memory allocated by each stage is
+    also recorded: 'bytes_allocated' is the sum of the peak memory used
+    by each call, and 'bytes_retained' the memory still in use at the
+    end of the calls.
+
+    :param trace_memory: if True, trace the memory allocations of the stages
+    """
+
+    #: A profiler which doesn't record anything. Use ``Profiler.NULL`` instead of ``None``.
+    NULL = None
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self._stats = OrderedDict()  # type: Dict[str, StageStats]
+        self._stages = {}  # type: Dict[str, _Stage]
+        self._peaks = []
+        self._started_tracing = False
+        self._start_time = time.perf_counter()
+        self._stop_time = None
+
+    def stage(self, name: str) -> _Stage:
+        """
+        get a context manager which records one call of the named stage.
+        A stage must not be run within itself.
+
+        :param name: the name of the stage
+        """
+        stage = self._stages.get(name)
+        if stage is None:
+            stats = StageStats(name)
+            self._stats[name] = stats
+            stage = self._stages[name] = _Stage(self, stats)
+        return stage
+
+    def start(self) -> None:
+        """
+        clear the recorded statistics, and start tracing the memory
+        allocations (if enabled)
+        """
+        self._stats.clear()
+        self._stages.clear()
+        self._peaks.clear()
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start_time = time.perf_counter()
+        self._stop_time = None
+
+    def stop(self) -> None:
+        """
+        stop recording the total time, and stop tracing the memory
+        allocations (if the profiler started it)
+        """
+        self._stop_time = time.perf_counter()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @property
+    def stats(self) -> Dict[str, StageStats]:
+        """
+        the statistics of each stage, by name
+        """
+        return self._stats
+
+    def report(self) -> Dict[str, Any]:
+        """
+        get the recorded statistics as a JSON-serialisable dictionary
+        """
+        stop_time = self._stop_time if self._stop_time is not None else time.perf_counter()
+
+        return OrderedDict([
+            ("total_time", stop_time - self._start_time),
+            ("trace_memory", self.trace_memory),
+            ("stages", OrderedDict(
+                (name, stats.to_dict()) for name, stats in self._stats.items()
+            )),
+        ])
+
+    def to_json(self, indent: int = 2) -> str:
+        """
+        get the report as a JSON string
+        """
+        return json.dumps(self.report(), indent=indent)
+
+    def write(self, path: str) -> None:
+        """
+        write the report to a JSON file
+
+        :param path: the path of the file
+        """
+        with open(path, 'w') as fp:
+            fp.write(self.to_json())
+
+    def _enter_memory(self):
+        if not tracemalloc.is_tracing():
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+
+        # the peak of an enclosing stage must survive the reset of the
+        # peak for this one
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        self._reset_peak()
+        self._peaks.append(current)
+        return current
+
+    def _exit_memory(self, start_memory):
+        if start_memory is None or not tracemalloc.is_tracing():
+            return 0, 0
+        current, peak = tracemalloc.get_traced_memory()
+        if not self._can_reset_peak:
+            # without resetting, the peak is that of the whole run
+            peak = current
+        peak = max(self._peaks.pop(), peak)
+
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        return peak - start_memory, current - start_memory
+
+    # tracemalloc.reset_peak is only available from Python 3.9
+    _can_reset_peak = hasattr(tracemalloc, 'reset_peak')
+
+    def _reset_peak(self):
+        if self._can_reset_peak:
+            tracemalloc.reset_peak()
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class _NullProfiler(Profiler):
+    _NULL_STAGE = _NullStage()
+
+    def __repr__(self):
+        # Overridden to make Sphinx use a readable name.
+        return 'Profiler.NULL'
+
+    def stage(self, name: str) -> _NullStage:
+        return self._NULL_STAGE
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+#: Use ``Profiler.NULL`` where no profiling is wanted.
+Profiler.NULL = _NullProfiler()
@@ -1,8 +1,16 @@
+import os
+import shutil
+import tempfile
 import unittest
+from unittest.mock import patch
+
+import netCDF4 as nc
+import numpy as np
 from tests.testing import TestDataLoader
 from math import radians
 
-from dedop.data.input.l1a import L1ADataset
+from dedop.data.input.l1a import L1ABlock, L1ADataset, L1AVariables
+from dedop.data.input.netcdf_reader import NetCDFReader
 from dedop.conf import *
 
 class L1ATests(unittest.TestCase):
@@ -195,4 +203,165 @@ class L1ATests(unittest.TestCase):
             self.assertAlmostEqual(
                 isp.sig0_cal_ku,
                 expected["sig0_cal_ku"][i]
-            )
\ No newline at end of file
+            )
+
+    def test_read_block(self):
+        dset = L1ADataset(
+            self._input_file,
+            cst=self.cst,
+            chd=self.chd,
+            cnf=self.cnf)
+
+        expected = TestDataLoader(
+            self._expected_file, delim=' '
+        )
+
+        block = dset.read_block(2, 7)
+
+        self.assertEqual(len(block), 5)
+        self.assertEqual(
+            block.waveform.shape,
+            (5, self.chd.n_ku_pulses_burst, self.chd.n_samples_sar)
+        )
+
+        # check the waveforms were constructed from the I & Q values, scaled by the AGC
+        i_meas = block.get_column(L1AVariables.i_meas_ku_l1a_echo_sar_ku)
+        q_meas = block.get_column(L1AVariables.q_meas_ku_l1a_echo_sar_ku)
+        agc = block.get_column(L1AVariables.agc_ku_l1a_echo_sar_ku)
+        waveform = (i_meas + 1j * q_meas) * np.power(10., agc / 20.)[:, np.newaxis, np.newaxis]
+        np.testing.assert_allclose(block.waveform, waveform, rtol=1e-12)
+
+        for index in range(2, 7):
+            isp = block[index]
+
+            self.assertEqual(isp.counter, index)
+            self.assertAlmostEqual(
+                isp.time_sar_ku,
+                expected["time_sar_ku"][index]
+            )
+            self.assertAlmostEqual(
+                isp.lat_sar_sat,
+                radians(expected["lat_sar_sat"][index])
+            )
+            self.assertAlmostEqual(
+                isp.win_delay_sar_ku,
+                expected["win_delay_sar_ku"][index]
+            )
+            np.testing.assert_array_equal(
+                isp.waveform_cor_sar, block.waveform[index - 2]
+            )
+
+        with self.assertRaises(IndexError):
+            block[7]
+
+    def test_read_block_clipped(self):
+        dset = L1ADataset(
+            self._input_file,
+            cst=self.cst,
+            chd=self.chd,
+            cnf=self.cnf)
+
+        block = dset.read_block(8, 20)
+
+        self.assertEqual(block.start, 8)
+        self.assertEqual(block.stop, 10)
+        self.assertEqual(len(list(block)), 2)
+
+    def test_prefetch(self):
+        dset = L1ADataset(
+            self._input_file,
+            cst=self.cst,
+            chd=self.chd,
+            cnf=self.cnf)
+        prefetch_dset = L1ADataset(
+            self._input_file,
+            cst=self.cst,
+            chd=self.chd,
+            cnf=self.cnf,
+            chunk_size=3,
+            prefetch=True)
+
+        for index in range(10):
+            isp = dset[index]
+            prefetch_isp = prefetch_dset[index]
+
+            self.assertEqual(prefetch_isp.time_sar_ku, isp.time_sar_ku)
+            np.testing.assert_array_equal(
+                prefetch_isp.waveform_cor_sar, isp.waveform_cor_sar
+            )
+
+    def test_cal2_disabled(self):
+        cnf = ConfigurationFile(
+            self._cnf_file, flag_cal2_correction_cnf=False
+        )
+        dset = L1ADataset(
+            self._input_file,
+            cst=self.cst,
+            chd=self.chd,
+            cnf=cnf)
+
+        self.assertNotIn(
+            L1AVariables.gprw_meas_ku_l1a_echo_sar_ku, list(dset._dset.variables)
+        )
+        block = dset.read_block(0, 10)
+        self.assertIsNone(block.cal2_array)
+        self.assertIsNone(block[0].cal2_array)
+
+    def test_iter_decodes_once(self):
+        dset = L1ADataset(
+            self._input_file,
+            cst=self.cst,
+            chd=self.chd,
+            cnf=self.cnf)
+
+        with patch.object(L1ABlock, '__getitem__', autospec=True,
+                          side_effect=L1ABlock.__getitem__) as getitem:
+            packets = list(dset)
+
+        self.assertEqual(len(packets), 10)
+        self.assertEqual(getitem.call_count, 10)
+
+    def test_iter_locations(self):
+        dset = L1ADataset(
+            self._input_file,
+            cst=self.cst,
+            chd=self.chd,
+            cnf=self.cnf,
+            chunk_size=3)
+
+        packets = list(dset)
+        locations = list(dset.iter_locations())
+        self.assertEqual(len(locations), len(packets))
+
+        for packet, location in zip(packets, locations):
+            self.assertIsNone(location.waveform_cor_sar)
+            self.assertEqual(location.counter, packet.counter)
+            np.testing.assert_equal(
+                [location.time_sar_ku, location.win_delay_sar_ku, location.doppler_angle_sar_sat,
+                 location.x_sar_surf, location.y_sar_surf, location.z_sar_surf],
+                [packet.time_sar_ku, packet.win_delay_sar_ku, packet.doppler_angle_sar_sat,
+                 packet.x_sar_surf, packet.y_sar_surf, packet.z_sar_surf]
+            )
+
+    def test_aligned_chunk_size(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(temp_dir, 'chunks.nc')
+            with nc.Dataset(file_path, 'w') as doc:
+                doc.createDimension('time_l1a_echo_sar_ku', 1000)
+                doc.createVariable('time_l1a_echo_sar_ku', np.float64, ('time_l1a_echo_sar_ku',),
+                                   chunksizes=(16,))
+                doc.createVariable('lat_l1a_echo_sar_ku', np.float64, ('time_l1a_echo_sar_ku',),
+                                   chunksizes=(1000,))
+
+            # whole on-disk chunks, at least DEFAULT_CHUNK_SIZE records
+            reader = NetCDFReader(file_path, variables=[L1AVariables.time_l1a_echo_sar_ku])
+            self.assertEqual(reader.chunk_size, 48)
+            reader.close()
+
+            # but no more than MAX_CHUNK_SIZE
+            reader = NetCDFReader(file_path, variables=[L1AVariables.lat_l1a_echo_sar_ku])
+            self.assertEqual(reader.chunk_size, NetCDFReader.MAX_CHUNK_SIZE)
+            reader.close()
+        finally:
+            shutil.rmtree(temp_dir)
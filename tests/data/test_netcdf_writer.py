@@ -0,0 +1,170 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import netCDF4 as nc
+import numpy as np
+
+from dedop.conf.enums import OutputStorage
+from dedop.data.output.netcdf_writer import NetCDFWriter, compute_utc_days_seconds
+from dedop.data.output.storage import StorageProfile, get_storage_profile
+
+
+class _RecordWriter(NetCDFWriter):
+    def __init__(self, filename: str, buffer_size: int, storage: StorageProfile = None,
+                 background: bool = False, append: bool = False):
+        super().__init__(filename, buffer_size=buffer_size, storage=storage, background=background, append=append)
+
+        self.define_dimension('time', None)
+        self.define_dimension('sample', 4)
+        self.define_variable('time', np.float64, ('time',), long_name="time",
+                             properties=dict(least_significant_digit=None))
+        self.define_variable('lat', np.int32, ('time',), long_name="latitude",
+                             scale_factor=1e-6, fill_value=2147483647)
+        self.define_variable('count', np.int16, ('time',), long_name="count", fill_value=32767)
+        self.define_variable('waveform', np.float64, ('time', 'sample'), long_name="waveform",
+                             fill_value=-1.)
+
+    def write_record(self, time, lat, count, waveform):
+        super().write_record(time=time, lat_rad=lat, count=count, waveform=waveform)
+
+    def derive_columns(self, columns):
+        if np.isnan(columns['time']).any():
+            raise ValueError('invalid time')
+        return {'lat': np.degrees(columns['lat_rad'])}
+
+
+class NetCDFWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'output.nc')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_buffered_records(self):
+        writer = _RecordWriter(self.file_path, buffer_size=2)
+        writer.open()
+
+        writer.write_record(0., 0.1, 1, np.arange(4.))
+        self.assertEqual(writer.output_index, 1)
+        self.assertEqual(len(writer.dimensions['time']), 0)
+
+        writer.write_record(1., 0.2, None, np.arange(2.))
+        self.assertEqual(len(writer.dimensions['time']), 2)
+
+        writer.write_record(2., -0.3, 3, np.arange(3.))
+        writer.close()
+
+        with nc.Dataset(self.file_path) as output:
+            np.testing.assert_equal(output['time'][:], [0., 1., 2.])
+            np.testing.assert_allclose(output['lat'][:], np.degrees([0.1, 0.2, -0.3]), atol=1e-6)
+            np.testing.assert_equal(output['count'][:].mask, [False, True, False])
+            np.testing.assert_equal(output['count'][:].filled(0), [1, 0, 3])
+
+            waveform = output['waveform'][:]
+            np.testing.assert_equal(waveform[0], [0., 1., 2., 3.])
+            np.testing.assert_equal(waveform.mask[1], [False, False, True, True])
+            np.testing.assert_equal(waveform.mask[2], [False, False, False, True])
+
+    def test_background_writes(self):
+        writer = _RecordWriter(self.file_path, buffer_size=2, background=True)
+        writer.open()
+        for i in range(11):
+            writer.write_record(float(i), 0.1 * i, i, np.full(4, i))
+        self.assertEqual(writer.output_index, 11)
+        writer.close()
+        self.assertFalse(writer.is_open)
+
+        with nc.Dataset(self.file_path) as output:
+            np.testing.assert_equal(output['time'][:], np.arange(11.))
+            np.testing.assert_allclose(output['lat'][:], np.degrees(0.1 * np.arange(11)), atol=1e-6)
+            np.testing.assert_equal(output['waveform'][:], np.repeat(np.arange(11.), 4).reshape(11, 4))
+
+    def test_background_write_error(self):
+        writer = _RecordWriter(self.file_path, buffer_size=2, background=True)
+        writer.open()
+        writer.write_record(0., 0., 0, np.zeros(4))
+        writer.write_record(float('nan'), 0., 0, np.zeros(4))
+
+        # the error of the background write is raised by close, which still closes the file
+        with self.assertRaises(ValueError):
+            writer.close()
+        self.assertFalse(writer.is_open)
+
+    def test_append_records(self):
+        source_path = os.path.join(self.temp_dir, 'source.nc')
+        with _RecordWriter(source_path, buffer_size=4) as source:
+            source.open()
+            source.write_record(1., 0.1, 1, np.ones(4))
+            source.write_record(2., 0.2, 2, np.ones(4))
+
+        writer = _RecordWriter(self.file_path, buffer_size=4)
+        writer.open()
+        writer.write_record(0., 0., 0, np.zeros(4))
+        self.assertEqual(writer.append_records(source_path), 2)
+        writer.write_record(3., 0.3, 3, np.zeros(4))
+        writer.close()
+
+        with nc.Dataset(self.file_path) as output:
+            np.testing.assert_equal(output['time'][:], [0., 1., 2., 3.])
+            np.testing.assert_equal(output['count'][:], [0, 1, 2, 3])
+
+    def test_append_mode(self):
+        writer = _RecordWriter(self.file_path, buffer_size=4)
+        writer.open()
+        for i in range(3):
+            writer.write_record(float(i), 0., i, np.zeros(4))
+        writer.sync()
+        self.assertEqual(len(writer.dimensions['time']), 3)
+        writer.close()
+
+        writer = _RecordWriter(self.file_path, buffer_size=4, append=True)
+        writer.open()
+        self.assertEqual(writer.output_index, 3)
+
+        # the last record is written again
+        writer.output_index = 2
+        writer.write_record(2., 0.2, 2, np.ones(4))
+        writer.write_record(3., 0.3, 3, np.ones(4))
+        writer.close()
+
+        with nc.Dataset(self.file_path) as output:
+            np.testing.assert_equal(output['time'][:], [0., 1., 2., 3.])
+            np.testing.assert_equal(output['count'][:], [0, 1, 2, 3])
+            np.testing.assert_equal(output['waveform'][:, 0], [0., 0., 1., 1.])
+
+    def test_compute_utc_days_seconds(self):
+        utc_days, utc_secs = compute_utc_days_seconds(
+            np.array([10., 90., 150.]), np.zeros(3), np.full(3, 20.), np.full(3, 5.), np.full(3, 100.)
+        )
+        np.testing.assert_equal(utc_days, [5, 6, 6])
+        np.testing.assert_equal(utc_secs, [30., 10., 70.])
+
+    def test_storage_profile(self):
+        storage = get_storage_profile(OutputStorage.fast, least_significant_digit=2)
+        writer = _RecordWriter(self.file_path, buffer_size=4, storage=storage)
+        writer.open()
+        for i in range(6):
+            writer.write_record(i + 0.123456, 0.1, i, np.full(4, 0.123456))
+        writer.close()
+
+        with nc.Dataset(self.file_path) as output:
+            waveform = output['waveform']
+            self.assertTrue(waveform.filters()['zlib'])
+            self.assertEqual(waveform.filters()['complevel'], 1)
+            # 16 KiB chunks of whole flushes of 4 records of 4 float64
+            self.assertEqual(waveform.chunking(), [512, 4])
+
+            # the waveforms are quantized, the times are not
+            self.assertNotEqual(waveform[0, 0], 0.123456)
+            self.assertAlmostEqual(waveform[0, 0], 0.123456, places=2)
+            np.testing.assert_equal(output['time'][:], np.arange(6) + 0.123456)
+
+    def test_default_storage_profile(self):
+        self.assertIs(get_storage_profile(), StorageProfile.DEFAULT)
+        self.assertEqual(StorageProfile.DEFAULT.get_properties(np.float64, (None, 4), 32), {})
+
+        properties = get_storage_profile(OutputStorage.compact).get_properties(np.int8, (None, 240, 256), 32)
+        self.assertEqual(properties, dict(zlib=True, complevel=6, shuffle=True, chunksizes=(32, 240, 256)))
@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from dedop.conf import ConstantsFile, CharacterisationFile
+from dedop.model import L1AProcessingData, PacketPid
+
+
+class L1AProcessingDataTest(TestCase):
+    _chd_file = "test_data/common/CHD.json"
+    _cst_file = "test_data/common/CST.json"
+
+    def setUp(self):
+        self.cst = ConstantsFile(self._cst_file)
+        self.chd = CharacterisationFile(self.cst, self._chd_file)
+
+    def test_values(self):
+        packet = L1AProcessingData(
+            self.cst, self.chd, 3,
+            {"days": 12},
+            time_sar_ku=1.5, x_vel_sat_sar=3., y_vel_sat_sar=4.
+        )
+        self.assertEqual(packet.isp_pid, PacketPid.null)
+        self.assertEqual(packet.counter, 3)
+        self.assertEqual(packet.days, 12)
+        self.assertEqual(packet.time_sar_ku, 1.5)
+        self.assertEqual(packet["time_sar_ku"], 1.5)
+        self.assertEqual(packet.vel_sat_sar_norm, 5.)
+
+        packet["lat_sar_sat"] = 0.25
+        self.assertEqual(packet.lat_sar_sat, 0.25)
+
+        del packet["lat_sar_sat"]
+        with self.assertRaises(KeyError):
+            packet["lat_sar_sat"]
+
+    def test_unknown_value(self):
+        packet = L1AProcessingData(self.cst, self.chd, 0)
+
+        with self.assertRaises(KeyError):
+            packet["not_a_value"] = 1
+        with self.assertRaises(AttributeError):
+            packet.not_a_value = 1
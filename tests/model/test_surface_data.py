@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+from dedop.conf import ConstantsFile, CharacterisationFile
+from dedop.model import SurfaceData, SurfaceType
+
+
+class SurfaceDataTest(TestCase):
+    _chd_file = "test_data/common/CHD.json"
+    _cst_file = "test_data/common/CST.json"
+
+    def setUp(self):
+        self.cst = ConstantsFile(self._cst_file)
+        self.chd = CharacterisationFile(self.cst, self._chd_file)
+
+    def test_values(self):
+        surface = SurfaceData(
+            self.cst, self.chd, 7,
+            {"x_surf": 1., "y_surf": 2., "z_surf": 3.},
+            time_surf=10., gps_time_surf=0.
+        )
+        self.assertEqual(surface.surface_counter, 7)
+        self.assertEqual(surface.surface_type, SurfaceType.surface_null)
+        self.assertFalse(surface.target_focused)
+        self.assertEqual(surface.stack_all_bursts, [])
+        self.assertEqual(surface.ecef_surf, (1., 2., 3.))
+        self.assertEqual(surface["time_surf"], 10.)
+        # the GPS time is derived from the surface time
+        self.assertEqual(surface.gps_time_surf, 10. + 20 * 365 * 86400 - 19)
+
+        with self.assertRaises(KeyError):
+            surface["stack_max"]
+        with self.assertRaises(KeyError):
+            surface["not_a_value"] = 1
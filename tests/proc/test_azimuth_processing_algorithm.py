@@ -195,4 +195,90 @@ class AzimuthProcessingAlgorithmTests(unittest.TestCase):
                     )
                 else:
                     rel_err = abs((expected_val - actual_val) / expected_val)
-                    self.assertLess(rel_err, 1e-10, msg=pos)
\ No newline at end of file
+                    self.assertLess(rel_err, 1e-10, msg=pos)
+
+
+class AzimuthProcessingSyntheticTests(unittest.TestCase):
+    def setUp(self):
+        self.cst = ConstantsFile(pi_cst=np.pi)
+        self.chd = CharacterisationFile(self.cst, N_ku_pulses_burst_chd=64, N_samples_sar_chd=16)
+        self.cnf = ConfigurationFile(
+            flag_azimuth_windowing_method_cnf=AzimuthWindowingMethod.hamming,
+            flag_azimuth_processing_method_cnf=AzimuthProcessingMethod.exact,
+            azimuth_window_width_cnf=32
+        )
+        self.wv_len = 0.022084
+
+        random = np.random.RandomState(42)
+        shape = (self.chd.n_ku_pulses_burst, self.chd.n_samples_sar)
+        self.packet = L1AProcessingData(
+            self.cst, self.chd,
+            time_sar_ku=1.,
+            x_vel_sat_sar=-2500.,
+            y_vel_sat_sar=6000.,
+            z_vel_sat_sar=3400.,
+            pri_sar_pre_dat=5.6e-5,
+            beam_angles_list=list(np.linspace(1.55, 1.59, 50)),
+            waveform_cor_sar=random.normal(size=shape) + 1j * random.normal(size=shape)
+        )
+
+    def test_exact_method_matches_per_beam_fft(self):
+        algorithm = AzimuthProcessingAlgorithm(self.chd, self.cst, self.cnf)
+        algorithm(self.packet, self.wv_len)
+
+        # the central beam of the FFT of the shifted waveform, one beam angle at a time
+        window = algorithm.construct_azimuth_window(AzimuthWindowingMethod.hamming, width=32)
+        windowed_wfm = self.packet.waveform_cor_sar * window[:, np.newaxis]
+        for beam_index, beam_angle in enumerate(self.packet.beam_angles_list):
+            wfm_phase_shift = algorithm.compute_phase_shift(self.packet, windowed_wfm, beam_angle, self.wv_len)
+            wfm_fft_azimuth = algorithm.compute_fft_azimuth_dimension(wfm_phase_shift)
+
+            np.testing.assert_allclose(algorithm.beams_focused[beam_index],
+                                       wfm_fft_azimuth[self.chd.n_ku_pulses_burst // 2],
+                                       rtol=1e-10, atol=1e-12)
+
+    def test_beam_angle_phase(self):
+        algorithm = AzimuthProcessingAlgorithm(self.chd, self.cst, self.cnf)
+        beam_angles = np.asarray(self.packet.beam_angles_list)
+
+        phase = algorithm.compute_beam_angle_phase(self.packet, beam_angles, self.wv_len)
+        self.assertEqual(phase.shape, (50, self.chd.n_ku_pulses_burst))
+
+        # the phase of each pulse, one beam angle at a time
+        for beam_index, beam_angle in enumerate(beam_angles):
+            expected = [np.exp(-2j * 2. * np.pi / self.wv_len * self.packet.vel_sat_sar_norm *
+                               np.cos(beam_angle) * self.packet.pri_sar_pre_dat * pulse_index)
+                        for pulse_index in range(self.chd.n_ku_pulses_burst)]
+            np.testing.assert_allclose(phase[beam_index], expected, rtol=1e-12)
+            np.testing.assert_array_equal(
+                algorithm.compute_beam_angle_phase(self.packet, beam_angle, self.wv_len), phase[beam_index]
+            )
+
+    def test_azimuth_window_cached(self):
+        algorithm = AzimuthProcessingAlgorithm(self.chd, self.cst, self.cnf)
+        algorithm(self.packet, self.wv_len)
+
+        window = algorithm._azimuth_window
+        np.testing.assert_array_equal(
+            window, algorithm.construct_azimuth_window(AzimuthWindowingMethod.hamming, width=32)
+        )
+        algorithm(self.packet, self.wv_len)
+        self.assertIs(algorithm._azimuth_window, window)
+
+    def test_azimuth_window_disabled(self):
+        cnf = ConfigurationFile(
+            flag_azimuth_windowing_method_cnf=AzimuthWindowingMethod.disabled,
+            flag_azimuth_processing_method_cnf=AzimuthProcessingMethod.exact,
+            azimuth_window_width_cnf=32
+        )
+        algorithm = AzimuthProcessingAlgorithm(self.chd, self.cst, cnf)
+        algorithm(self.packet, self.wv_len)
+        self.assertIsNone(algorithm._azimuth_window)
+
+        # the shortcut gives the result of an all-ones window
+        window = algorithm.construct_azimuth_window(AzimuthWindowingMethod.disabled)
+        np.testing.assert_array_equal(window, np.ones(self.chd.n_ku_pulses_burst))
+
+        beams_focused = algorithm.beams_focused.copy()
+        algorithm.compute_exact_method(self.packet, self.packet.waveform_cor_sar * window[:, np.newaxis], self.wv_len)
+        np.testing.assert_array_equal(algorithm.beams_focused, beams_focused)
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+from dedop.model.exception import ProcessorException
+from dedop.model.processor import DummyProcessor
+from dedop.proc import batch
+from dedop.proc.batch import ProcessorJob, process_batch
+from dedop.util.monitor import Monitor
+
+
+def dummy_processor_factory(name, output_dir=None, skip_l1bs=False):
+    return DummyProcessor(name, output_dir=output_dir, skip_l1bs=skip_l1bs)
+
+
+class RecordingMonitor(Monitor):
+    def __init__(self):
+        self.labels = []
+        self.total_work = None
+        self.worked = 0.
+        self.done_count = 0
+
+    def start(self, label: str, total_work: float = None):
+        self.labels.append(label)
+        self.total_work = total_work
+
+    def progress(self, work: float = None, msg: str = None):
+        if work is not None:
+            self.worked += work
+        if msg is not None:
+            self.labels.append(msg)
+
+    def done(self):
+        self.done_count += 1
+
+
+class ProcessBatchTest(unittest.TestCase):
+    def test_process_batch(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            kwargs = dict(output_dir=output_dir, skip_l1bs=True)
+            jobs = [
+                ProcessorJob('conf_a', kwargs, 'L1A_1.nc'),
+                ProcessorJob('conf_a', kwargs, 'L1A_2.nc'),
+                ProcessorJob('conf_b', kwargs, 'L1A_1.nc'),
+            ]
+            monitor = RecordingMonitor()
+
+            process_batch(jobs, dummy_processor_factory, max_workers=2, monitor=monitor)
+
+            self.assertEqual(sorted(os.listdir(output_dir)),
+                             ['L1B__1_conf_a.nc', 'L1B__1_conf_b.nc', 'L1B__2_conf_a.nc'])
+
+        self.assertEqual(monitor.total_work, 3)
+        self.assertAlmostEqual(monitor.worked, 3.)
+        self.assertEqual(monitor.done_count, 1)
+        self.assertIn('conf_b L1A_1.nc: processing "conf_b"', monitor.labels)
+
+    def test_process_batch_error(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            kwargs = dict(output_dir=output_dir, skip_l1bs=True)
+            jobs = [
+                ProcessorJob('conf_a', kwargs, 'L1A_ERR.nc'),
+                ProcessorJob('conf_a', kwargs, 'L1A_2.nc'),
+            ]
+            with self.assertRaises(ProcessorException):
+                process_batch(jobs, dummy_processor_factory, max_workers=1)
+
+    def test_worker_processor(self):
+        kwargs = dict(skip_l1bs=True)
+        try:
+            processor = batch._get_worker_processor(dummy_processor_factory, ProcessorJob('conf_a', kwargs, 'L1A_1.nc'))
+            self.assertIs(batch._get_worker_processor(dummy_processor_factory,
+                                                      ProcessorJob('conf_a', kwargs, 'L1A_2.nc')), processor)
+
+            # a worker keeps a single processor
+            other = batch._get_worker_processor(dummy_processor_factory, ProcessorJob('conf_b', kwargs, 'L1A_1.nc'))
+            self.assertIsNot(other, processor)
+            self.assertIs(batch._WORKER_PROCESSOR[1], other)
+            self.assertIsNot(batch._get_worker_processor(dummy_processor_factory,
+                                                         ProcessorJob('conf_a', kwargs, 'L1A_1.nc')), processor)
+        finally:
+            batch._WORKER_PROCESSOR = None
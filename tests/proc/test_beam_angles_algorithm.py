@@ -1,11 +1,13 @@
 import unittest
+from collections import deque
 
 import numpy as np
 
 from dedop.conf import CharacterisationFile, ConstantsFile, ConfigurationFile
 from dedop.model import SurfaceData
 from dedop.model.l1a_processing_data import L1AProcessingData
-from dedop.proc.sar.algorithms.beam_angles import BeamAnglesAlgorithm
+from dedop.proc.sar.algorithms.beam_angles import BeamAnglesAlgorithm, SurfacePositions
+from dedop.proc.sar.processor import L1BProcessor
 from tests.testing import TestDataLoader
 
 
@@ -173,3 +175,123 @@ class BeamAnglesAlgorithmTests(unittest.TestCase):
                            expected["surf_loc_index"]),
             msg="Surface Indicies are not correct"
         )
+
+    def test_compute_beam_angles(self):
+        """
+        the vectorized beam angles match the per-surface computation
+        """
+        input_data = TestDataLoader(self.input_01, delim=' ')
+
+        self.initialise_algorithm(input_data)
+
+        surfs = [
+            SurfaceData(
+                self.cst, self.chd, surf_num,
+                x_surf=input_data["x_surf"][i],
+                y_surf=input_data["y_surf"][i],
+                z_surf=input_data["z_surf"][i],
+            ) for i, surf_num in enumerate(input_data["surface_counter"])
+        ]
+        packet = L1AProcessingData(
+            self.cst, self.chd,
+            x_sar_sat=input_data["x_sar_sat"],
+            y_sar_sat=input_data["y_sar_sat"],
+            z_sar_sat=input_data["z_sar_sat"],
+            x_vel_sat_sar=input_data["x_vel_sat_sar"],
+            y_vel_sat_sar=input_data["y_vel_sat_sar"],
+            z_vel_sat_sar=input_data["z_vel_sat_sar"],
+            doppler_angle_sar_sat=input_data["doppler_angle_sar_sat"]
+        )
+        surfs_ecef = BeamAnglesAlgorithm.get_surfaces_ecef(surfs)
+
+        # use a view range which only covers part of the surfaces
+        beam_angles, _ = BeamAnglesAlgorithm.compute_beam_angles(
+            surfs_ecef, packet, 0., np.pi
+        )
+        beam_angles_tangent = beam_angles - packet.doppler_angle_sar_sat
+        q_min, q_max = np.percentile(beam_angles_tangent, [25, 75])
+
+        beam_angles, locations_seen = BeamAnglesAlgorithm.compute_beam_angles(
+            surfs_ecef, packet, q_min, q_max
+        )
+        self.assertTrue(np.any(locations_seen))
+        self.assertFalse(np.all(locations_seen))
+
+        for i, surf in enumerate(surfs):
+            beam_angle, location_seen = BeamAnglesAlgorithm.compute_beam_angle(
+                surf, packet, q_min, q_max
+            )
+            self.assertAlmostEqual(beam_angles[i], beam_angle, places=12)
+            self.assertEqual(locations_seen[i], location_seen)
+
+    def test_surface_queue(self):
+        """
+        the surfaces can be given as a queue, and found from their counters
+        """
+        input_data = TestDataLoader(self.input_01, delim=' ')
+        expected = TestDataLoader(self.expected_01, delim=' ')
+
+        self.initialise_algorithm(input_data)
+
+        surfs = deque(
+            SurfaceData(
+                self.cst, self.chd, surf_num,
+                x_surf=input_data["x_surf"][i],
+                y_surf=input_data["y_surf"][i],
+                z_surf=input_data["z_surf"][i],
+            ) for i, surf_num in enumerate(input_data["surface_counter"])
+        )
+        packet = L1AProcessingData(
+            self.cst, self.chd,
+            x_sar_sat=input_data["x_sar_sat"],
+            y_sar_sat=input_data["y_sar_sat"],
+            z_sar_sat=input_data["z_sar_sat"],
+            x_vel_sat_sar=input_data["x_vel_sat_sar"],
+            y_vel_sat_sar=input_data["y_vel_sat_sar"],
+            z_vel_sat_sar=input_data["z_vel_sat_sar"],
+            pri_sar_pre_dat=input_data["pri_sar_pre_dat"],
+            doppler_angle_sar_sat=input_data["doppler_angle_sar_sat"]
+        )
+        work_loc = surfs[input_data["working_surface_location_counter"]]
+
+        self.beam_angles_algorithm(surfs, packet, work_loc)
+
+        self.assertTrue(self.beam_angles_algorithm.work_location_seen)
+        self.assertTrue(
+            np.array_equal(self.beam_angles_algorithm.surfaces_seen,
+                           expected["surf_loc_index"])
+        )
+
+        for counter in self.beam_angles_algorithm.surfaces_seen:
+            surf = L1BProcessor.get_surface(surfs, counter)
+            self.assertEqual(surf.surface_counter, counter)
+
+        # removing surfaces from the head of the queue shifts the lookup
+        first = surfs.popleft()
+        self.assertIsNone(L1BProcessor.get_surface(surfs, first.surface_counter))
+        self.assertIs(L1BProcessor.get_surface(surfs, surfs[-1].surface_counter), surfs[-1])
+        self.assertIsNone(L1BProcessor.get_surface(deque(), first.surface_counter))
+
+    def test_surface_positions(self):
+        """
+        the positions follow the surfaces appended to & removed from the queue
+        """
+        cst = ConstantsFile()
+        chd = CharacterisationFile(cst)
+        surfs = deque()
+        positions = SurfacePositions(capacity=4)
+
+        for counter in range(20):
+            surf = SurfaceData(cst, chd, counter, x_surf=counter, y_surf=2. * counter, z_surf=-counter)
+            surfs.append(surf)
+            positions.append(surf)
+            if counter % 3 == 2:
+                surfs.popleft()
+                positions.popleft()
+
+            self.assertEqual(len(positions), len(surfs))
+            np.testing.assert_array_equal(positions.array, BeamAnglesAlgorithm.get_surfaces_ecef(surfs))
+
+        surfs[-1].x_surf = 100.
+        positions.update(-1, surfs[-1])
+        np.testing.assert_array_equal(positions.array, BeamAnglesAlgorithm.get_surfaces_ecef(surfs))
@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from dedop.proc.sar.checkpoint import Checkpoint, SurfaceHistory, read_checkpoint, write_checkpoint
+
+
+class SurfaceHistoryTest(unittest.TestCase):
+    def test_restart_within_stretch(self):
+        history = SurfaceHistory(margin=10)
+        for counter in range(5, 26):
+            history.add(counter * 3, counter, dict(time_surf=counter * 0.5), starts_stretch=counter == 5)
+
+        restart = history.get_restart(30)
+        self.assertEqual(restart.surface_counter, 20)
+        self.assertEqual(restart.record, 60)
+        self.assertEqual(restart.data, (('time_surf', 10.),))
+
+        # close to the start of the stretch, the restart is its first surface
+        self.assertEqual(history.get_restart(12).surface_counter, 5)
+
+    def test_restart_unknown(self):
+        history = SurfaceHistory(margin=10)
+        self.assertIsNone(history.get_restart(10))
+
+        # the first surface of a resumed run doesn't start a stretch
+        for counter in range(20, 40):
+            history.add(counter, counter, dict(time_surf=0.), starts_stretch=False)
+        self.assertIsNone(history.get_restart(25))
+        self.assertEqual(history.get_restart(30).surface_counter, 20)
+
+        # the surfaces found more than twice the margin before are dropped
+        for counter in range(40, 100):
+            history.add(counter, counter, dict(time_surf=0.), starts_stretch=False)
+        self.assertIsNone(history.get_restart(80))
+        self.assertEqual(history.get_restart(89).surface_counter, 79)
+
+    def test_new_stretch(self):
+        history = SurfaceHistory(margin=10)
+        for counter in range(0, 30):
+            history.add(counter, counter, dict(time_surf=0.), starts_stretch=counter == 0)
+        history.add(50, 30, dict(time_surf=1.), starts_stretch=True)
+
+        self.assertEqual(history.get_restart(35).surface_counter, 30)
+
+
+class CheckpointFileTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_write_read(self):
+        path = os.path.join(self.temp_dir, 'L1B_checkpoint.json')
+        self.assertIsNone(read_checkpoint(path))
+
+        checkpoint = Checkpoint('L1A.nc', 'abc', 120, 40, 120,
+                                (('time_surf', np.float64(0.1) + np.float64(0.2)), ('prev_utc_days', np.int64(5))),
+                                100, None)
+        write_checkpoint(path, checkpoint)
+
+        self.assertEqual(read_checkpoint(path), checkpoint)
+        self.assertEqual(os.listdir(self.temp_dir), ['L1B_checkpoint.json'])
@@ -0,0 +1,85 @@
+import os
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from dedop.conf.enums import FFTBackend
+from dedop.proc.fft import FFT, FFT_BACKEND_ENV_VAR, get_fft, get_job_fft_threads
+
+
+def has_module(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+class FFTTest(unittest.TestCase):
+    def setUp(self):
+        self.data = np.arange(24).reshape((3, 8)) * (1. + 0.5j)
+
+    def assert_backend(self, backend):
+        fft = get_fft(backend)
+        self.assertEqual(fft.backend, backend)
+
+        expected = np.fft.fft(self.data, n=16, axis=1, norm="ortho")
+        actual = fft.fft(self.data, n=16, axis=1, norm="ortho")
+        np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+        # a second transform of the same shape must not change the first result
+        fft.fft(self.data * 2., n=16, axis=1, norm="ortho")
+        np.testing.assert_allclose(actual, expected, atol=1e-12)
+
+        np.testing.assert_allclose(fft.ifft(fft.fft(self.data, axis=0), axis=0), self.data, atol=1e-12)
+
+    def test_numpy(self):
+        self.assertIs(type(get_fft(FFTBackend.numpy)), FFT)
+        self.assert_backend(FFTBackend.numpy)
+
+    def test_plans_are_cached(self):
+        fft = FFT()
+
+        fft.fft(self.data, n=16, axis=1)
+        fft.fft(self.data + 1., n=16, axis=1)
+        self.assertEqual(fft.plan_count, 1)
+
+        fft.fft(self.data[:2], n=16, axis=1)
+        fft.ifft(self.data, n=16, axis=1)
+        fft.fft(self.data.real, n=16, axis=1)
+        self.assertEqual(fft.plan_count, 4)
+
+    def test_fft_is_shared(self):
+        self.assertIs(get_fft(FFTBackend.numpy), get_fft(FFTBackend.numpy))
+
+    def test_fft_threads(self):
+        # numpy.fft only uses one thread, whatever the number given
+        self.assertIs(get_fft(FFTBackend.numpy, threads=2), get_fft(FFTBackend.numpy))
+
+        self.assertEqual(get_job_fft_threads(4, threads=8), 2)
+        self.assertEqual(get_job_fft_threads(3, threads=8), 2)
+        self.assertEqual(get_job_fft_threads(16, threads=8), 1)
+        self.assertEqual(get_job_fft_threads(0), 1)
+        self.assertEqual(get_job_fft_threads(1), os.cpu_count())
+
+    def test_environment_variable(self):
+        with patch.dict(os.environ, {FFT_BACKEND_ENV_VAR: 'numpy'}):
+            self.assertEqual(get_fft(FFTBackend.pyfftw).backend, FFTBackend.numpy)
+
+        with patch.dict(os.environ, {FFT_BACKEND_ENV_VAR: 'mkl'}):
+            with self.assertRaises(ValueError):
+                get_fft()
+
+    @unittest.skipUnless(has_module('scipy.fft'), 'requires scipy >= 1.4')
+    def test_scipy(self):
+        self.assert_backend(FFTBackend.scipy)
+
+        fft = get_fft(FFTBackend.scipy, threads=1)
+        self.assertEqual(fft.threads, 1)
+        self.assertIsNot(fft, get_fft(FFTBackend.scipy))
+        np.testing.assert_allclose(fft.fft(self.data, axis=1), np.fft.fft(self.data, axis=1), atol=1e-12)
+
+    @unittest.skipUnless(has_module('pyfftw'), 'requires pyfftw')
+    def test_pyfftw(self):
+        self.assert_backend(FFTBackend.pyfftw)
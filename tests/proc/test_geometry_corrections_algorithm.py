@@ -186,4 +186,63 @@ class GeometryCorrectionsAlgorithmTests(unittest.TestCase):
                 )
             else:
                 rel_err = abs((expected_q - q) / expected_q)
-                self.assertLess(rel_err, 2e-4)
\ No newline at end of file
+                self.assertLess(rel_err, 2e-4)
+
+    def test_geometry_corrections_stack(self):
+        """
+        geometry corrections algorithm test
+        -----------------------------------
+        the corrections of the whole stack are those of each beam,
+        and the beams after the stack size are not corrected
+        """
+        self.cnf = ConfigurationFile(N_looks_stack_cnf=4)
+        self.cst = ConstantsFile(c_cst=299792458., pi_cst=np.pi)
+        self.chd = CharacterisationFile(
+            self.cst, N_samples_sar_chd=8, pulse_length_chd=5.0e-5, bw_ku_chd=320e6
+        )
+        self.geometry_corrections_algorithm = \
+            GeometryCorrectionsAlgorithm(self.chd, self.cst, self.cnf)
+
+        stack_size = 3
+        isps = [
+            L1AProcessingData(
+                self.cst, self.chd,
+                x_vel_sat_sar=7000. + i, y_vel_sat_sar=100. * i, z_vel_sat_sar=10.,
+                x_sar_sat=1000. * i, y_sar_sat=0., z_sar_sat=7.e5,
+                win_delay_sar_ku=4.6e-3 + 1e-9 * i
+            ) for i in range(stack_size)
+        ]
+        beams_surf = np.ones((4, 8), dtype=complex)
+        working_loc = SurfaceData(
+            self.cst, self.chd,
+            stack_bursts=isps,
+            data_stack_size=stack_size,
+            win_delay_surf=4.6e-3,
+            x_surf=1000., y_surf=0., z_surf=0.,
+            beam_angles_surf=[1.5, 1.55, 1.6],
+            t0_surf=[3e-9, 3e-9, 3.1e-9],
+            beams_surf=beams_surf
+        )
+        wv_length_ku = 0.022
+
+        self.geometry_corrections_algorithm(working_loc, wv_length_ku)
+
+        for beam_index, isp in enumerate(isps):
+            t0 = working_loc.t0_surf[beam_index]
+            doppler = 2 / self.cst.c * (
+                -self.cst.c / wv_length_ku * np.linalg.norm(isp.vel_sat_sar) *
+                np.cos(working_loc.beam_angles_surf[beam_index]) * self.chd.pulse_length / self.chd.bw_ku
+            ) / t0
+            range_sat_surf = np.sqrt((isp.x_sar_sat - 1000.) ** 2 + isp.y_sar_sat ** 2 + isp.z_sar_sat ** 2)
+            slant = (working_loc.win_delay_surf - range_sat_surf * 2. / self.cst.c) / t0
+            win_delay = -(working_loc.win_delay_surf - isp.win_delay_sar_ku) / t0
+            shift = doppler + slant + win_delay
+            beam = np.exp(2j * self.cst.pi / 8 * shift * np.arange(8))
+
+            self.assertAlmostEqual(self.geometry_corrections_algorithm.doppler_corrections[beam_index], doppler)
+            self.assertAlmostEqual(self.geometry_corrections_algorithm.range_sat_surf[beam_index], range_sat_surf)
+            self.assertAlmostEqual(self.geometry_corrections_algorithm.slant_range_corrections[beam_index], slant)
+            self.assertAlmostEqual(self.geometry_corrections_algorithm.win_delay_corrections[beam_index], win_delay)
+            np.testing.assert_allclose(self.geometry_corrections_algorithm.beams_geo_corr[beam_index], beam)
+
+        np.testing.assert_array_equal(self.geometry_corrections_algorithm.beams_geo_corr[stack_size], 0)
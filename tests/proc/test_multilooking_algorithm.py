@@ -5,6 +5,7 @@ import numpy as np
 from dedop.conf import CharacterisationFile, ConstantsFile, ConfigurationFile
 from dedop.model import SurfaceData
 from dedop.proc.sar.algorithms import MultilookingAlgorithm
+from dedop.proc.sar.algorithms.multilooking import gauss, gauss_fit
 from tests.testing import TestDataLoader
 
 class FakeBurst:
@@ -181,4 +182,86 @@ class MultilookingAlgorithmTests(unittest.TestCase):
         self.assertEqual(
             len(expected['stack_mask_vector_start_stop']),
             len(self.multilooking_algorithm.stack_mask_vector_start_stop)
-        )
\ No newline at end of file
+        )
+
+
+class StackCharacterizationTests(unittest.TestCase):
+    def setUp(self):
+        self.cnf = ConfigurationFile(zp_fact_range_cnf=1, N_looks_stack_cnf=40)
+        self.cst = ConstantsFile(pi_cst=np.pi)
+        self.chd = CharacterisationFile(self.cst, N_samples_sar_chd=4)
+        self.multilooking_algorithm = MultilookingAlgorithm(self.chd, self.cst, self.cnf)
+
+        angles = np.linspace(-0.02, 0.02, 40)
+        power = gauss(np.arange(40), 2., 18., 9.) + np.random.RandomState(0).normal(0., 0.05, 40)
+        self.surface = SurfaceData(
+            self.cst, self.chd,
+            data_stack_size=40,
+            beam_angles_surf=np.pi / 2. + angles,
+            look_angles_surf=angles,
+            pointing_angles_surf=angles + 0.001,
+            beams_masked=np.repeat(power[:, np.newaxis], 4, axis=1) / 2.
+        )
+
+    def test_stack_characterization(self):
+        self.multilooking_algorithm.compute_stack_characterization_params(self.surface)
+
+        # the beam powers are the sums of the first half of the beams, normalized by their maximum
+        beam_power = self.surface.beams_masked[:, :2].sum(axis=1)
+        beam_power /= beam_power.max()
+
+        fit_params_l = gauss_fit(self.surface.look_angles_surf, beam_power)
+        self.assertEqual(self.multilooking_algorithm.stack_max, fit_params_l[0])
+        self.assertEqual(self.multilooking_algorithm.stack_std, fit_params_l[2] / 2)
+
+        # the moments of the gaussian fitted to the beam indices
+        power_fitted = gauss(np.arange(40), *gauss_fit(np.arange(40), beam_power))
+        skewness = 0
+        kurtosis = 0
+        for value in power_fitted:
+            skewness += ((value - power_fitted.mean()) / power_fitted.std()) ** 3
+            kurtosis += ((value - power_fitted.mean()) / power_fitted.std()) ** 4
+
+        self.assertAlmostEqual(self.multilooking_algorithm.stack_skewness, skewness / 40, places=12)
+        self.assertAlmostEqual(self.multilooking_algorithm.stack_kurtosis, kurtosis / 40 - 3, places=12)
+
+
+class AntennaWeightingTests(unittest.TestCase):
+    def setUp(self):
+        self.cnf = ConfigurationFile(zp_fact_range_cnf=1, N_looks_stack_cnf=4, flag_antenna_weighting_cnf=True)
+        self.cst = ConstantsFile(pi_cst=np.pi)
+        angles = np.linspace(-0.05, 0.05, 250)
+        self.chd = CharacterisationFile(
+            self.cst,
+            N_samples_sar_chd=2,
+            antenna_angles_chd=angles,
+            antenna_weights_chd=1. - angles ** 2 * 100.,
+            antenna_angles_spacing_chd=angles[1] - angles[0]
+        )
+        self.multilooking_algorithm = MultilookingAlgorithm(self.chd, self.cst, self.cnf)
+
+    def test_antenna_weights(self):
+        angles = self.chd.antenna_angles
+        weights = self.multilooking_algorithm.get_antenna_weights(
+            np.array([-1., angles[3], (angles[10] + angles[11]) / 2, 1.])
+        )
+        expected_middle = (self.chd.antenna_weights[10] + self.chd.antenna_weights[11]) / 2
+
+        np.testing.assert_allclose(
+            weights, [self.chd.antenna_weights[0], self.chd.antenna_weights[3], expected_middle,
+                      self.chd.antenna_weights[-1]]
+        )
+
+    def test_apply_antenna_weighting(self):
+        beams_masked = np.arange(8.).reshape((4, 2))
+        surface = SurfaceData(
+            cst=self.cst, chd=self.chd,
+            data_stack_size=3,
+            pointing_angles_surf=np.array([0., 0.01, -0.02]),
+            beams_masked=beams_masked
+        )
+        beams_masked_aw = self.multilooking_algorithm.apply_antenna_weighting(surface)
+
+        # the pattern is interpolated linearly between its angles
+        expected = beams_masked[:3] * (1. - np.array([0., 0.01, -0.02]) ** 2 * 100.)[:, np.newaxis]
+        np.testing.assert_allclose(beams_masked_aw[:3], expected, rtol=1e-4)
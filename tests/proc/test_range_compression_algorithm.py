@@ -131,3 +131,48 @@ class RangeCompressionAlgorithmTests(unittest.TestCase):
         #         else:
         #             rel_err = abs((expected_val - actual_val) / expected_val)
         #             self.assertLess(rel_err, 1e-9, msg=pos)
+
+
+class RangeCompressionStackTests(unittest.TestCase):
+    def test_range_compression_stack(self):
+        """
+        the stack is transformed like each beam on its own, and only
+        the beams of the stack are output
+        """
+        cnf = ConfigurationFile(zp_fact_range_cnf=2, N_looks_stack_cnf=4)
+        cst = ConstantsFile()
+        chd = CharacterisationFile(cst, N_samples_sar_chd=8)
+        range_compression_algorithm = RangeCompressionAlgorithm(chd, cst, cnf)
+
+        beams_geo_corr = np.arange(32).reshape((4, 8)) * (1. - 2.j)
+        working_loc = SurfaceData(cst, chd, data_stack_size=3, beams_geo_corr=beams_geo_corr)
+
+        range_compression_algorithm(working_loc)
+
+        self.assertEqual(range_compression_algorithm.beam_range_compr_iq.shape, (3, 16))
+        for beam_index in range(3):
+            expected = np.fft.fftshift(np.fft.fft(beams_geo_corr[beam_index], n=16, norm="ortho"))
+            np.testing.assert_allclose(range_compression_algorithm.beam_range_compr_iq[beam_index], expected)
+            np.testing.assert_allclose(range_compression_algorithm.beam_range_compr[beam_index],
+                                       np.abs(expected) ** 2)
+
+    def test_range_compression_without_iq(self):
+        """
+        the power of the beams is the same when the complex beams are not kept
+        """
+        cnf = ConfigurationFile(zp_fact_range_cnf=2, N_looks_stack_cnf=4)
+        cst = ConstantsFile()
+        chd = CharacterisationFile(cst, N_samples_sar_chd=8)
+        range_compression_algorithm = RangeCompressionAlgorithm(chd, cst, cnf)
+
+        beams_geo_corr = np.arange(32).reshape((4, 8)) * (1. - 2.j)
+        working_loc = SurfaceData(cst, chd, data_stack_size=3, beams_geo_corr=beams_geo_corr)
+
+        range_compression_algorithm(working_loc)
+        expected = range_compression_algorithm.beam_range_compr.copy()
+
+        range_compression_algorithm.compute_iq = False
+        range_compression_algorithm(working_loc)
+
+        self.assertIsNone(range_compression_algorithm.beam_range_compr_iq)
+        np.testing.assert_array_equal(range_compression_algorithm.beam_range_compr, expected)
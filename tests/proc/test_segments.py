@@ -0,0 +1,53 @@
+import unittest
+
+from dedop.proc.sar.segments import Segment, _Stretch, _SurfaceInfo, _split_stretches
+
+
+def new_stretch(start, surface_start, surface_records, stop):
+    stretch = _Stretch(start, surface_start)
+    stretch.stop = stop
+    stretch.surfaces = [_SurfaceInfo(record, (('time_surf', float(record)),)) for record in surface_records]
+    return stretch
+
+
+class SplitStretchesTest(unittest.TestCase):
+    def test_split_long_stretch(self):
+        # one surface every 2 records
+        stretch = new_stretch(0, 0, range(0, 200, 2), 200)
+
+        segments = _split_stretches([stretch], 2, margin=10)
+
+        self.assertEqual(segments, [
+            Segment(0, 2 * 59 + 1, 0, 0, 50, (('time_surf', 0.),), True),
+            Segment(2 * 40, 200, 40, 50, 100, (('time_surf', 80.),), False),
+        ])
+
+    def test_split_at_gaps(self):
+        stretches = [
+            new_stretch(0, 0, range(0, 60, 2), 60),
+            new_stretch(70, 30, range(70, 130, 2), 130),
+        ]
+
+        segments = _split_stretches(stretches, 4, margin=20)
+
+        # the stretches are too short to be split further
+        self.assertEqual(segments, [
+            Segment(0, 60, 0, 0, 30, (('time_surf', 0.),), True),
+            Segment(70, 130, 30, 30, 60, (('time_surf', 70.),), False),
+        ])
+
+    def test_output_covers_all_surfaces(self):
+        stretches = [
+            new_stretch(0, 0, range(0, 1000), 1000),
+            new_stretch(1010, 1000, range(1010, 1500), 1500),
+        ]
+
+        segments = _split_stretches(stretches, 7, margin=80)
+
+        self.assertEqual(len(segments), 7)
+        self.assertEqual(segments[0].output_start, 0)
+        self.assertEqual(segments[-1].output_stop, 1490)
+        for segment, next_segment in zip(segments[:-1], segments[1:]):
+            self.assertEqual(segment.output_stop, next_segment.output_start)
+            self.assertTrue(segment.ends_at_gap)
+        self.assertFalse(segments[-1].ends_at_gap)
@@ -1,4 +1,5 @@
 import unittest
+from math import log10, pi, sqrt
 
 import numpy as np
 
@@ -76,4 +77,52 @@ class Sigma0ScalingFactorAlgorithmTests(unittest.TestCase):
         )
         self.assertAlmostEqual(
             expected['sigma0_scaling_factor'], sig0_scale_factor,
-        )
\ No newline at end of file
+        )
+
+
+class Sigma0ScalingFactorStackTests(unittest.TestCase):
+    def setUp(self):
+        self.cnf = ConfigurationFile(N_looks_stack_cnf=4)
+        self.cst = ConstantsFile(pi_cst=np.pi, earth_radius_cst=6378137., c_cst=299792458.)
+        self.chd = CharacterisationFile(
+            self.cst,
+            N_ku_pulses_burst_chd=64,
+            power_tx_ant_ku_chd=20.,
+            antenna_gain_ku_chd=42.,
+            ratio_trc_ku_chd=1.5,
+            ptr_width_chd=3e-9
+        )
+        self.sigma0_algorithm = Sigma0ScalingFactorAlgorithm(self.chd, self.cst, self.cnf)
+
+    def test_sigma0_scaling_factor(self):
+        wavelength_ku = 0.0221
+        ranges = np.array([814000., 814100., 814300.])
+        bursts = [
+            L1AProcessingData(
+                self.cst, self.chd,
+                x_vel_sat_sar=7000. + i, y_vel_sat_sar=100., z_vel_sat_sar=-50.,
+                pri_sar_pre_dat=5.5e-5, agc_ku=30.
+            ) for i in range(3)
+        ]
+        working_loc = SurfaceData(
+            self.cst, self.chd,
+            data_stack_size=3,
+            range_sat_surf=ranges,
+            stack_bursts=np.asarray(bursts),
+            closest_burst_index=1
+        )
+        sig0_scale_factor = self.sigma0_algorithm(working_loc, wavelength_ku, 0.)
+
+        offset = 10 * log10(64) + 30 * log10(pi) - 10 * log10(20.) - 2 * 42. - 20 * log10(wavelength_ku) + \
+            1.5 + 10 * log10(64)
+        expected = []
+        for range_sat_surf, burst in zip(ranges, bursts):
+            azimuth_distance = (1 + range_sat_surf / 6378137.) * wavelength_ku * range_sat_surf / 5.5e-5 / \
+                (2 * burst.vel_sat_sar_norm * 64)
+            range_distance = 2 * sqrt(299792458. * range_sat_surf * 3e-9 * 6378137. / (6378137. + range_sat_surf))
+            surface_area = azimuth_distance * range_distance * 0.886
+            expected.append(-(offset + 40 * log10(range_sat_surf) - 10 * log10(surface_area) - 30.))
+
+        np.testing.assert_allclose(self.sigma0_algorithm.sigma0_scaling_factor_beam, expected, rtol=1e-12)
+        self.assertAlmostEqual(sig0_scale_factor, np.mean(expected), places=10)
+        self.assertAlmostEqual(self.sigma0_algorithm.get_sigma0_offset(wavelength_ku), offset, places=10)
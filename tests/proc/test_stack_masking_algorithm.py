@@ -5,6 +5,7 @@ import numpy as np
 from dedop.conf import CharacterisationFile, ConstantsFile, ConfigurationFile
 from dedop.model import SurfaceData, SurfaceType
 from dedop.proc.sar.algorithms import StackMaskingAlgorithm
+from dedop.util.buffer_pool import BufferPool
 from tests.testing import TestDataLoader
 
 
@@ -125,3 +126,105 @@ class StackMaskingAlgorithmTests(unittest.TestCase):
                     stack_index, stack_size
                 )
             )
+
+    def test_combine_masks(self):
+        geom_mask = np.array([
+            [1., 1., 1., 1.],
+            [0., 1., 1., 0.],
+            [1., 0., 0., 0.],
+            [0., 0., 0., 0.],
+        ])
+        angle_mask = np.ones_like(geom_mask)
+        angle_mask[0, :] = 0.
+
+        stack_mask, stack_mask_vector = StackMaskingAlgorithm.combine_masks(geom_mask, None, angle_mask)
+
+        self.assertEqual(stack_mask.dtype, np.bool_)
+        np.testing.assert_array_equal(stack_mask[1:], geom_mask[1:])
+        np.testing.assert_array_equal(stack_mask[0], 0.)
+        # start of the trailing zeros, or the last index if there are none
+        np.testing.assert_array_equal(stack_mask_vector, [0., 3., 1., 0.])
+
+        # a look angle mask with one column applies to all samples of a beam
+        _, stack_mask_vector = StackMaskingAlgorithm.combine_masks(geom_mask, None, np.ones((4, 1), dtype=bool))
+        np.testing.assert_array_equal(stack_mask_vector, [3., 3., 1., 0.])
+
+    def test_geometry_mask(self):
+        self.cnf = ConfigurationFile(zp_fact_range_cnf=2, N_looks_stack_cnf=4, flag_stack_masking_cnf=True)
+        self.cst = ConstantsFile()
+        self.chd = CharacterisationFile(self.cst, N_samples_sar_chd=4)
+        algorithm = StackMaskingAlgorithm(self.chd, self.cst, self.cnf)
+
+        working_loc = SurfaceData(
+            cst=self.cst, chd=self.chd,
+            data_stack_size=3,
+            doppler_corrections=np.array([1.2, -0.6, 5.]),
+            slant_range_corrections=np.zeros(3),
+            win_delay_corrections=np.zeros(3)
+        )
+        geom_mask = algorithm.compute_geometry_mask(working_loc)
+
+        self.assertEqual(geom_mask.dtype, np.bool_)
+
+        np.testing.assert_array_equal(geom_mask, [
+            [0., 0., 1., 1., 1., 1., 1., 1.],
+            [1., 1., 1., 1., 1., 1., 0., 0.],
+            [0., 0., 0., 0., 0., 0., 0., 0.],
+            [0., 0., 0., 0., 0., 0., 0., 0.],
+        ])
+
+    def test_mask_not_kept(self):
+        self.cnf = ConfigurationFile(zp_fact_range_cnf=2, N_looks_stack_cnf=4, flag_stack_masking_cnf=True)
+        self.cst = ConstantsFile()
+        self.chd = CharacterisationFile(self.cst, N_samples_sar_chd=4)
+        algorithm = StackMaskingAlgorithm(self.chd, self.cst, self.cnf)
+        algorithm.keep_mask = False
+
+        working_loc = SurfaceData(
+            cst=self.cst, chd=self.chd,
+            data_stack_size=3,
+            doppler_corrections=np.array([1.2, -0.6, 5.]),
+            slant_range_corrections=np.zeros(3),
+            win_delay_corrections=np.zeros(3),
+            look_angles_surf=np.zeros(3),
+            beams_range_compr=np.ones((3, 8))
+        )
+        algorithm(working_loc)
+
+        self.assertIsNone(algorithm.stack_mask)
+        np.testing.assert_array_equal(algorithm.stack_mask_vector, [7., 6., 0., 0.])
+        np.testing.assert_array_equal(algorithm.beams_masked.sum(axis=1), [6., 6., 0.])
+
+        # without masking, there is only the mask vector
+        algorithm.flag_stack_masking = False
+        algorithm(working_loc)
+
+        self.assertIsNone(algorithm.stack_mask)
+        np.testing.assert_array_equal(algorithm.stack_mask_vector, [7., 7., 7., 7.])
+        self.assertIs(algorithm.beams_masked, working_loc.beams_range_compr)
+
+    def test_buffer_pool_bounded(self):
+        self.cnf = ConfigurationFile(zp_fact_range_cnf=2, N_looks_stack_cnf=4, flag_stack_masking_cnf=True)
+        self.cst = ConstantsFile()
+        self.chd = CharacterisationFile(self.cst, N_samples_sar_chd=4)
+        algorithm = StackMaskingAlgorithm(self.chd, self.cst, self.cnf)
+        algorithm.buffer_pool = BufferPool()
+
+        working_loc = SurfaceData(
+            cst=self.cst, chd=self.chd,
+            data_stack_size=3,
+            doppler_corrections=np.array([1.2, -0.6, 5.]),
+            slant_range_corrections=np.zeros(3),
+            win_delay_corrections=np.zeros(3),
+            look_angles_surf=np.zeros(3),
+            beams_range_compr=np.ones((3, 8))
+        )
+
+        # the arrays of each surface are released once it has been processed
+        for _ in range(10):
+            algorithm(working_loc)
+            algorithm.buffer_pool.release(algorithm.beams_masked, algorithm.stack_mask)
+
+        free_arrays = sum(len(free) for free in algorithm.buffer_pool._free.values())
+        self.assertEqual(algorithm.buffer_pool.allocated, 4)
+        self.assertEqual(free_arrays, 4)
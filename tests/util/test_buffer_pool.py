@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+import numpy as np
+
+from dedop.util.buffer_pool import BufferPool
+
+
+class NullBufferPoolTest(TestCase):
+    def test_NULL(self):
+        self.assertIsNotNone(BufferPool.NULL)
+        self.assertEqual(repr(BufferPool.NULL), 'BufferPool.NULL')
+
+    def test_no_reuse(self):
+        pool = BufferPool.NULL
+        a = pool.zeros((4, 8), dtype=np.complex128)
+        pool.release(a)
+        b = pool.zeros((4, 8), dtype=np.complex128)
+        self.assertIsNot(a, b)
+        np.testing.assert_array_equal(b, 0)
+
+
+class BufferPoolTest(TestCase):
+    def test_reuse(self):
+        pool = BufferPool()
+        a = pool.empty((4, 8), dtype=np.complex128)
+        a[:] = 1
+        pool.release(a)
+
+        b = pool.zeros((4, 8), dtype=np.complex128)
+        self.assertIs(a, b)
+        np.testing.assert_array_equal(b, 0)
+        self.assertEqual(pool.allocated, 1)
+        self.assertEqual(pool.reused, 1)
+
+    def test_shape_and_type(self):
+        pool = BufferPool()
+        a = pool.empty((4, 8), dtype=np.float64)
+        pool.release(a)
+
+        self.assertIsNot(pool.empty((4, 8), dtype=np.complex128), a)
+        self.assertIsNot(pool.empty((4, 9), dtype=np.float64), a)
+        self.assertIs(pool.empty((4, 8), dtype=np.float64), a)
+
+    def test_release_view(self):
+        pool = BufferPool()
+        a = pool.empty((4, 8))
+        pool.release(a[:2], a)
+
+        self.assertIs(pool.empty((4, 8)), a)
+        # the array must only have been released once
+        self.assertIsNot(pool.empty((4, 8)), a)
+
+    def test_release_none(self):
+        pool = BufferPool()
+        pool.release(None)
+        pool.clear()
+        self.assertEqual(pool.allocated, 0)
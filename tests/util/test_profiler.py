@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+import tracemalloc
+from unittest import TestCase
+
+import numpy as np
+
+from dedop.util.profiler import Profiler
+
+
+class NullProfilerTest(TestCase):
+    def test_NULL(self):
+        self.assertIsNotNone(Profiler.NULL)
+        self.assertEqual(repr(Profiler.NULL), 'Profiler.NULL')
+
+    def test_nothing_recorded(self):
+        profiler = Profiler.NULL
+        profiler.start()
+        with profiler.stage('a'):
+            pass
+        profiler.stop()
+        self.assertEqual(len(profiler.report()['stages']), 0)
+
+
+class ProfilerTest(TestCase):
+    def test_calls_and_time(self):
+        profiler = Profiler()
+        profiler.start()
+        for _ in range(3):
+            with profiler.stage('a'):
+                pass
+        with profiler.stage('b'):
+            pass
+        profiler.stop()
+
+        report = profiler.report()
+        self.assertEqual(list(report['stages']), ['a', 'b'])
+        self.assertEqual(report['stages']['a']['calls'], 3)
+        self.assertEqual(report['stages']['b']['calls'], 1)
+        self.assertGreaterEqual(report['stages']['a']['time'], 0.)
+        self.assertGreaterEqual(report['total_time'], report['stages']['a']['time'])
+        self.assertEqual(report['stages']['a']['bytes_allocated'], 0)
+
+    def test_exception(self):
+        profiler = Profiler()
+        with self.assertRaises(ValueError):
+            with profiler.stage('a'):
+                raise ValueError()
+        self.assertEqual(profiler.stats['a'].calls, 1)
+
+    def test_trace_memory(self):
+        profiler = Profiler(trace_memory=True)
+        was_tracing = tracemalloc.is_tracing()
+        profiler.start()
+        try:
+            with profiler.stage('outer'):
+                with profiler.stage('alloc'):
+                    kept = np.ones(100000)
+                    np.ones(200000)
+        finally:
+            profiler.stop()
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+
+        stats = profiler.stats
+        self.assertGreaterEqual(stats['alloc'].bytes_allocated, kept.nbytes)
+        self.assertGreaterEqual(stats['alloc'].bytes_retained, kept.nbytes)
+        self.assertLess(stats['alloc'].bytes_retained, 2 * kept.nbytes)
+        self.assertGreaterEqual(stats['outer'].bytes_allocated, stats['alloc'].bytes_allocated)
+
+    def test_write(self):
+        profiler = Profiler()
+        profiler.start()
+        with profiler.stage('a'):
+            pass
+        profiler.stop()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'profile.json')
+            profiler.write(path)
+            with open(path) as fp:
+                report = json.load(fp)
+        self.assertEqual(report['stages']['a']['calls'], 1)